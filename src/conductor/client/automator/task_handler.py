@@ -78,9 +78,11 @@ class TaskHandler:
         if metrics_settings == None:
             self.metrics_provider_process = None
             return
+        # Filled with the pids of the task runners when they start, before the metrics provider
+        self.task_runner_pids = []
         self.metrics_provider_process = Process(
             target=MetricsCollector.provide_metrics,
-            args=(metrics_settings,)
+            args=(metrics_settings, self.task_runner_pids)
         )
         logger.info('Created MetricsProvider process')
 
@@ -91,6 +93,7 @@ class TaskHandler:
         metrics_settings: MetricsSettings
     ) -> None:
         self.task_runner_processes = []
+        self.task_runner_task_types = []
         for worker in workers:
             self.__create_task_runner_process(
                 worker, configuration, metrics_settings
@@ -108,6 +111,7 @@ class TaskHandler:
             target=task_runner.run
         )
         self.task_runner_processes.append(process)
+        self.task_runner_task_types.append(worker.get_task_definition_name())
 
     def __start_metrics_provider_process(self):
         if self.metrics_provider_process == None:
@@ -116,8 +120,10 @@ class TaskHandler:
         logger.info('Started MetricsProvider process')
 
     def __start_task_runner_processes(self):
-        for task_runner_process in self.task_runner_processes:
+        for task_type, task_runner_process in zip(self.task_runner_task_types, self.task_runner_processes):
             task_runner_process.start()
+            if self.metrics_provider_process != None:
+                self.task_runner_pids.append((task_type, task_runner_process.pid))
         logger.info('Started TaskRunner processes')
 
     def __join_metrics_provider_process(self):
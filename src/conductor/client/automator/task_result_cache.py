@@ -0,0 +1,168 @@
+from conductor.client.cache.ttl_lru_cache import TtlLruCache
+from conductor.client.configuration.configuration import Configuration
+from conductor.client.http import raw_json
+from conductor.client.http.api_client import ApiClient
+from conductor.client.http.models.task import Task
+from conductor.client.http.models.task_result import TaskResult
+from conductor.client.http.models.task_result_status import TaskResultStatus
+from conductor.client.telemetry.metrics_collector import MetricsCollector
+from typing import Any, Dict, Tuple
+import hashlib
+import json
+import logging
+import os
+import time
+import traceback
+
+logger = logging.getLogger(
+    Configuration.get_logging_formatted_name(
+        __name__
+    )
+)
+
+CACHE_NAME = 'task_result'
+
+CACHEABLE_STATUSES = [
+    TaskResultStatus.COMPLETED,
+    TaskResultStatus.FAILED,
+    TaskResultStatus.FAILED_WITH_TERMINAL_ERROR,
+]
+
+TaskKey = Tuple[str, int]
+
+
+class TaskResultCache:
+    """Results of executed tasks, to skip executing redelivered tasks again.
+
+    The server may deliver a task again, e.g. after it timed out or was
+    requeued, while its first execution is still being reported. `TaskRunner`
+    looks every polled task up by task id and retry count, and sends the
+    cached result again instead of executing the task again. Only final
+    results are cached: a task `IN_PROGRESS` is meant to be polled again.
+
+    Up to `max_size` results are kept for `ttl_seconds`. With `directory`,
+    results are also written there, one file each, so they are shared by
+    the worker processes and survive restarts. Files of evicted results are
+    removed, and expired files are removed at startup.
+
+    Set an instance as `Configuration.task_result_cache` to use it in task
+    runners.
+    """
+
+    def __init__(self, max_size: int = 1000, ttl_seconds: float = 3600, directory: str = None):
+        self.ttl_seconds = ttl_seconds
+        self.directory = directory
+        self.cache = TtlLruCache(max_size, ttl_seconds, on_eviction=self.__on_eviction)
+        self._api_client = ApiClient(Configuration())
+        if directory is not None:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            self.__remove_stale_files(max_size)
+
+    def get(self, task: Task, metrics_collector: MetricsCollector = None) -> TaskResult:
+        key = _get_key(task)
+        found, task_result = self.cache.lookup(key)
+        if not found and self.directory is not None:
+            task_result = self.__read_file(key)
+            if task_result is not None:
+                self.cache.put(key, task_result)
+                found = True
+        if metrics_collector is not None:
+            if found:
+                metrics_collector.increment_cache_hit(CACHE_NAME)
+            else:
+                metrics_collector.increment_cache_miss(CACHE_NAME)
+        return task_result
+
+    def put(self, task: Task, task_result: TaskResult, metrics_collector: MetricsCollector = None) -> None:
+        if task_result is None or task_result.status not in CACHEABLE_STATUSES:
+            return
+        key = _get_key(task)
+        evictions = self.cache.evictions
+        self.cache.put(key, task_result)
+        if metrics_collector is not None:
+            for _ in range(self.cache.evictions - evictions):
+                metrics_collector.increment_cache_eviction(CACHE_NAME)
+        if self.directory is not None:
+            self.__write_file(key, task_result)
+
+    def __read_file(self, key: TaskKey) -> TaskResult:
+        file_path = self.__get_file_path(key)
+        try:
+            with open(file_path, 'r') as file:
+                cached_result = json.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            logger.warning(f'Failed to read cached task result {file_path}, reason: {traceback.format_exc()}')
+            return None
+        if cached_result['key'] != list(key) or _is_expired(cached_result):
+            return None
+        return self._api_client.deserialize_data(cached_result['taskResult'], 'TaskResult')
+
+    def __write_file(self, key: TaskKey, task_result: TaskResult) -> None:
+        file_path = self.__get_file_path(key)
+        cached_result = {
+            'key': list(key),
+            'expiresAt': None if self.ttl_seconds is None else time.time() + self.ttl_seconds,
+            'taskResult': self._api_client.sanitize_for_serialization(task_result),
+        }
+        data = raw_json.dumps(cached_result)
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        try:
+            temporary_file_path = f'{file_path}.{os.getpid()}.tmp'
+            with open(temporary_file_path, 'wb') as file:
+                file.write(data)
+            os.replace(temporary_file_path, file_path)
+        except Exception:
+            logger.warning(f'Failed to write cached task result {file_path}, reason: {traceback.format_exc()}')
+
+    def __on_eviction(self, key: TaskKey, task_result: TaskResult) -> None:
+        if self.directory is not None:
+            _remove_file(self.__get_file_path(key))
+
+    def __remove_stale_files(self, max_size: int) -> None:
+        file_paths = []
+        for file_name in os.listdir(self.directory):
+            if not file_name.endswith('.json'):
+                continue
+            file_path = os.path.join(self.directory, file_name)
+            try:
+                with open(file_path, 'r') as file:
+                    expired = _is_expired(json.load(file))
+            except Exception:
+                expired = True
+            if expired:
+                _remove_file(file_path)
+            else:
+                file_paths.append(file_path)
+        file_paths.sort(key=_get_modification_time, reverse=True)
+        for file_path in file_paths[max_size:]:
+            _remove_file(file_path)
+
+    def __get_file_path(self, key: TaskKey) -> str:
+        file_name = hashlib.sha256(f'{key[0]}:{key[1]}'.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f'{file_name}.json')
+
+
+def _get_key(task: Task) -> TaskKey:
+    return task.task_id, task.retry_count or 0
+
+
+def _is_expired(cached_result: Dict[str, Any]) -> bool:
+    expires_at = cached_result.get('expiresAt')
+    return expires_at is not None and time.time() >= expires_at
+
+
+def _get_modification_time(file_path: str) -> float:
+    try:
+        return os.path.getmtime(file_path)
+    except OSError:
+        return 0
+
+
+def _remove_file(file_path: str) -> None:
+    try:
+        os.remove(file_path)
+    except FileNotFoundError:
+        pass
@@ -1,12 +1,20 @@
 from conductor.client.configuration.configuration import Configuration
 from conductor.client.configuration.settings.metrics_settings import MetricsSettings
+from conductor.client.external_storage.external_payload_storage import Operation, PayloadType
+from conductor.client.helpers.context import nullcontext
 from conductor.client.http.api_client import ApiClient
 from conductor.client.http.api.task_resource_api import TaskResourceApi
+from conductor.client.http import raw_json
 from conductor.client.http.models.task import Task
 from conductor.client.http.models.task_result import TaskResult
 from conductor.client.http.models.task_exec_log import TaskExecLog
+from conductor.client.http.models.task_result_status import TaskResultStatus
 from conductor.client.telemetry.metrics_collector import MetricsCollector
+from conductor.client.worker.batch_worker_interface import BatchWorkerInterface
+from conductor.client.worker.result_cache import CACHE_NAME_PREFIX, ResultCache, get_result_cache_key
 from conductor.client.worker.worker_interface import WorkerInterface
+from typing import ContextManager, List, Union
+import json
 import logging
 import sys
 import time
@@ -53,10 +61,21 @@ class TaskRunner:
                 pass
 
     def run_once(self) -> None:
+        if isinstance(self.worker, BatchWorkerInterface):
+            self.__run_batch_once()
+            return
         task = self.__poll_task()
         if task != None and task.task_id != None:
-            task_result = self.__execute_task(task)
-            self.__update_task(task_result)
+            with self.__start_span('task', task) as span:
+                if span is not None and task.queue_wait_time != None:
+                    span.set_attribute('queue_wait_time_ms', task.queue_wait_time)
+                task_result = self.__get_cached_task_result(task)
+                if task_result is None:
+                    task_result = self.__execute_task(task)
+                    self.__cache_task_result(task, task_result)
+                response = self.__update_task(task_result)
+            if response != None:
+                self.__record_queue_to_completion_time(task)
         self.__wait_for_polling_interval()
 
     def __poll_task(self) -> Task:
@@ -75,10 +94,14 @@ class TaskRunner:
             params = {'workerid': self.worker.get_identity()}
             if domain != None:
                 params['domain'] = domain
-            task = self.task_client.poll(
-                tasktype=task_definition_name,
-                **params
-            )
+            with self.__start_span('poll') as span:
+                task = self.task_client.poll(
+                    tasktype=task_definition_name,
+                    **params
+                )
+                if span is not None and task != None:
+                    span.set_attribute('task_id', task.task_id)
+                    span.set_attribute('workflow_instance_id', task.workflow_instance_id)
             finish_time = time.time()
             time_spent = finish_time - start_time
             if self.metrics_collector is not None:
@@ -98,6 +121,10 @@ class TaskRunner:
             logger.debug(
                 f'Polled task: {task_definition_name}, worker_id: {self.worker.get_identity()}'
             )
+            if self.metrics_collector is not None and task.queue_wait_time != None:
+                self.metrics_collector.record_task_queue_wait_time(
+                    task_definition_name, task.queue_wait_time / 1000
+                )
         return task
 
     def __execute_task(self, task: Task) -> TaskResult:
@@ -112,8 +139,20 @@ class TaskRunner:
             )
         )
         try:
+            self.__download_external_input(task)
+            result_cache = self.worker.get_result_cache()
+            cache_key = None
+            if result_cache is not None:
+                cache_key = get_result_cache_key(task_definition_name, task.input_data)
+            if cache_key is not None:
+                task_result = self.__get_memoized_task_result(task, result_cache, cache_key)
+                if task_result is not None:
+                    return task_result
             start_time = time.time()
-            task_result = self.worker.execute(task)
+            with self.__start_span('execute', task), self.__profile(), self.__watch(task):
+                task_result = self.worker.execute(task)
+            if cache_key is not None:
+                self.__memoize_task_result(result_cache, cache_key, task_result)
             finish_time = time.time()
             time_spent = finish_time - start_time
             if self.metrics_collector is not None:
@@ -137,15 +176,7 @@ class TaskRunner:
                 self.metrics_collector.increment_task_execution_error(
                     task_definition_name, type(e)
                 )
-            task_result = TaskResult(
-                task_id=task.task_id,
-                workflow_instance_id=task.workflow_instance_id,
-                worker_id=self.worker.get_identity()
-            )
-            task_result.status = 'FAILED'
-            task_result.reason_for_incompletion = str(e)
-            task_result.logs = [TaskExecLog(
-                traceback.format_exc(), task_result.task_id, int(time.time()))]
+            task_result = self.__get_failed_task_result(task, e)
             logger.error(
                 'Failed to execute task, id: {task_id}, workflow_instance_id: {workflow_instance_id}, task_definition_name: {task_definition_name}, reason: {reason}'.format(
                     task_id=task.task_id,
@@ -156,6 +187,167 @@ class TaskRunner:
             )
         return task_result
 
+    def __get_failed_task_result(self, task: Task, exception: Exception) -> TaskResult:
+        task_result = TaskResult(
+            task_id=task.task_id,
+            workflow_instance_id=task.workflow_instance_id,
+            worker_id=self.worker.get_identity()
+        )
+        task_result.status = 'FAILED'
+        task_result.reason_for_incompletion = str(exception)
+        task_result.logs = [TaskExecLog(
+            traceback.format_exc(), task_result.task_id, int(time.time()))]
+        return task_result
+
+    def __run_batch_once(self) -> None:
+        tasks = self.__poll_batch()
+        if len(tasks) > 0:
+            task_results = self.__execute_batch(tasks)
+            for task, task_result in zip(tasks, task_results):
+                with self.__start_span('task', task):
+                    response = self.__update_task(task_result)
+                if response != None:
+                    self.__record_queue_to_completion_time(task)
+        self.__wait_for_polling_interval()
+
+    def __poll_batch(self) -> List[Task]:
+        """Polls tasks until the batch is full, no task is left, or the batch wait time elapsed"""
+        batch_size = self.worker.get_batch_size()
+        deadline = time.monotonic() + self.worker.get_batch_wait_seconds()
+        tasks = []
+        while len(tasks) < batch_size:
+            remaining_seconds = max(deadline - time.monotonic(), 0)
+            polled_tasks = self.__batch_poll_tasks(batch_size - len(tasks), remaining_seconds)
+            polled_tasks = [task for task in polled_tasks if task.task_id != None]
+            if len(polled_tasks) == 0:
+                # the server already waited for tasks up to the deadline
+                break
+            tasks.extend(polled_tasks)
+            if remaining_seconds == 0:
+                break
+        return tasks
+
+    def __batch_poll_tasks(self, count: int, timeout_seconds: float) -> List[Task]:
+        task_definition_name = self.worker.get_task_definition_name()
+        if self.worker.paused():
+            logger.warning(f'Stop polling task for: {task_definition_name}')
+            return []
+        if self.metrics_collector is not None:
+            self.metrics_collector.increment_task_poll(
+                task_definition_name
+            )
+        logger.debug(f'Polling {count} tasks for: {task_definition_name}')
+        try:
+            start_time = time.time()
+            domain = self.worker.get_domain()
+            params = {
+                'workerid': self.worker.get_identity(),
+                'count': count,
+                'timeout': int(timeout_seconds * 1000),
+            }
+            if domain != None:
+                params['domain'] = domain
+            with self.__start_span('poll') as span:
+                tasks = self.task_client.batch_poll(
+                    tasktype=task_definition_name,
+                    **params
+                ) or []
+                if span is not None:
+                    span.set_attribute('count', len(tasks))
+            if self.metrics_collector is not None:
+                self.metrics_collector.record_task_poll_time(
+                    task_definition_name, time.time() - start_time
+                )
+        except Exception as e:
+            if self.metrics_collector is not None:
+                self.metrics_collector.increment_task_poll_error(
+                    task_definition_name, type(e)
+                )
+            logger.error(
+                f'Failed to poll tasks for: {task_definition_name}, reason: {traceback.format_exc()}'
+            )
+            return []
+        if self.metrics_collector is not None:
+            for task in tasks:
+                if task.queue_wait_time != None:
+                    self.metrics_collector.record_task_queue_wait_time(
+                        task_definition_name, task.queue_wait_time / 1000
+                    )
+        return tasks
+
+    def __execute_batch(self, tasks: List[Task]) -> List[TaskResult]:
+        """Results of the tasks, executing together those not cached"""
+        task_definition_name = self.worker.get_task_definition_name()
+        result_cache = self.worker.get_result_cache()
+        task_results = [None] * len(tasks)
+        cache_keys = [None] * len(tasks)
+        pending_indexes = []
+        for index, task in enumerate(tasks):
+            task_result = self.__get_cached_task_result(task)
+            if task_result is None:
+                try:
+                    self.__download_external_input(task)
+                except Exception as e:
+                    logger.error(
+                        f'Failed to download input of task, id: {task.task_id}, reason: {traceback.format_exc()}'
+                    )
+                    task_result = self.__get_failed_task_result(task, e)
+            if task_result is None and result_cache is not None:
+                cache_keys[index] = get_result_cache_key(task_definition_name, task.input_data)
+                if cache_keys[index] is not None:
+                    task_result = self.__get_memoized_task_result(task, result_cache, cache_keys[index])
+            if task_result is None:
+                pending_indexes.append(index)
+            task_results[index] = task_result
+        if len(pending_indexes) == 0:
+            return task_results
+        pending_tasks = [tasks[index] for index in pending_indexes]
+        for index, task_result in zip(pending_indexes, self.__execute_pending_batch(pending_tasks)):
+            if cache_keys[index] is not None:
+                self.__memoize_task_result(result_cache, cache_keys[index], task_result)
+            task_results[index] = task_result
+            self.__cache_task_result(tasks[index], task_result)
+        return task_results
+
+    def __execute_pending_batch(self, tasks: List[Task]) -> List[TaskResult]:
+        task_definition_name = self.worker.get_task_definition_name()
+        logger.debug(f'Executing batch of {len(tasks)} tasks, task_definition_name: {task_definition_name}')
+        try:
+            start_time = time.time()
+            with self.__start_span('execute_batch') as span, self.__profile():
+                if span is not None:
+                    span.set_attribute('batch_size', len(tasks))
+                task_results = self.worker.execute_batch(tasks)
+            time_spent = time.time() - start_time
+            if not isinstance(task_results, list) or len(task_results) != len(tasks):
+                raise Exception(f'invalid batch results, expected {len(tasks)} task results')
+            for task, task_result in zip(tasks, task_results):
+                if not isinstance(task_result, TaskResult):
+                    raise Exception(f'invalid batch results, expected task results, got {type(task_result).__name__}')
+                task_result.task_id = task.task_id
+                task_result.workflow_instance_id = task.workflow_instance_id
+            if self.metrics_collector is not None:
+                # one sample per batch, of the time spent executing the whole batch
+                self.metrics_collector.record_task_execute_time(
+                    task_definition_name, time_spent
+                )
+                for task_result in task_results:
+                    self.metrics_collector.record_task_result_payload_size(
+                        task_definition_name, sys.getsizeof(task_result)
+                    )
+            logger.debug(f'Executed batch of {len(tasks)} tasks, task_definition_name: {task_definition_name}')
+            return task_results
+        except Exception as e:
+            if self.metrics_collector is not None:
+                self.metrics_collector.increment_task_execution_error(
+                    task_definition_name, type(e)
+                )
+            logger.error(
+                f'Failed to execute batch of {len(tasks)} tasks, task_definition_name: {task_definition_name}, '
+                f'reason: {traceback.format_exc()}'
+            )
+            return [self.__get_failed_task_result(task, e) for task in tasks]
+
     def __update_task(self, task_result: TaskResult):
         if not isinstance(task_result, TaskResult):
             return None
@@ -172,7 +364,16 @@ class TaskRunner:
                 # Wait for [10s, 20s, 30s] before next attempt
                 time.sleep(attempt * 10)
             try:
-                response = self.task_client.update_task(body=task_result)
+                self.__upload_external_output(task_result)
+                start_time = time.time()
+                with self.__start_span('update', task_result) as span:
+                    if span is not None:
+                        span.set_attribute('attempt', attempt)
+                    response = self.task_client.update_task(body=task_result)
+                if self.metrics_collector is not None:
+                    self.metrics_collector.record_task_update_time(
+                        task_definition_name, time.time() - start_time
+                    )
                 logger.debug(
                     'Updated task, id: {task_id}, workflow_instance_id: {workflow_instance_id}, task_definition_name: {task_definition_name}, response: {response}'.format(
                         task_id=task_result.task_id,
@@ -197,6 +398,146 @@ class TaskRunner:
                 )
         return None
 
+    def __get_memoized_task_result(self, task: Task, result_cache: ResultCache, cache_key: str) -> TaskResult:
+        """Result made of the output cached for the input of the task, if any"""
+        output = result_cache.get(cache_key)
+        if self.metrics_collector is not None:
+            cache_name = CACHE_NAME_PREFIX + self.worker.get_task_definition_name()
+            if output is None:
+                self.metrics_collector.increment_cache_miss(cache_name)
+            else:
+                self.metrics_collector.increment_cache_hit(cache_name)
+        if output is None:
+            return None
+        task_result = self.worker.get_task_result_from_task(task)
+        task_result.status = TaskResultStatus.COMPLETED
+        task_result.output_data = raw_json.RawJson(output)
+        return task_result
+
+    def __memoize_task_result(self, result_cache: ResultCache, cache_key: str, task_result: TaskResult) -> None:
+        """Caches the output of a completed task, failing to do so only loses the cache entry, never the result"""
+        if not isinstance(task_result, TaskResult) or task_result.status != TaskResultStatus.COMPLETED:
+            return
+        try:
+            output = raw_json.dumps(
+                self.task_client.api_client.sanitize_for_serialization(task_result.output_data)
+            )
+            if isinstance(output, str):
+                output = output.encode('utf-8')
+            evictions = result_cache.put(cache_key, output)
+        except Exception:
+            logger.error(
+                f'Failed to memoize output of task, id: {task_result.task_id}, reason: {traceback.format_exc()}'
+            )
+            return
+        if self.metrics_collector is not None:
+            cache_name = CACHE_NAME_PREFIX + self.worker.get_task_definition_name()
+            for _ in range(evictions):
+                self.metrics_collector.increment_cache_eviction(cache_name)
+
+    def __get_cached_task_result(self, task: Task) -> TaskResult:
+        """Result of a previous execution of the task, if it was delivered again"""
+        task_result_cache = self.configuration.task_result_cache
+        if task_result_cache is None:
+            return None
+        task_result = task_result_cache.get(task, self.metrics_collector)
+        if task_result is not None:
+            logger.info(
+                f'Skipping execution of redelivered task, sending its cached result, id: {task.task_id}, '
+                f'workflow_instance_id: {task.workflow_instance_id}, task_definition_name: {self.worker.get_task_definition_name()}'
+            )
+        return task_result
+
+    def __cache_task_result(self, task: Task, task_result: TaskResult) -> None:
+        task_result_cache = self.configuration.task_result_cache
+        if task_result_cache is not None:
+            task_result_cache.put(task, task_result, self.metrics_collector)
+
+    def __download_external_input(self, task: Task) -> None:
+        storage = self.configuration.external_payload_storage
+        if storage is None or task.external_input_payload_storage_path == None:
+            return
+        location = storage.get_location(
+            Operation.READ, PayloadType.TASK_INPUT, task.external_input_payload_storage_path
+        )
+        task.input_data = json.loads(storage.download(location.uri))
+        if self.metrics_collector is not None:
+            self.metrics_collector.increment_external_payload_used(
+                self.worker.get_task_definition_name(), Operation.READ.value, PayloadType.TASK_INPUT.value
+            )
+
+    def __upload_external_output(self, task_result: TaskResult) -> None:
+        storage = self.configuration.external_payload_storage
+        if storage is None or not task_result.output_data:
+            return
+        if isinstance(task_result.output_data, raw_json.RawJson):
+            payload = task_result.output_data.data
+        else:
+            payload = raw_json.dumps(
+                self.task_client.api_client.sanitize_for_serialization(task_result.output_data)
+            )
+            if isinstance(payload, str):
+                payload = payload.encode('utf-8')
+            # Send the output measured here as is, instead of serializing it again for the request
+            task_result.output_data = raw_json.RawJson(payload)
+        if len(payload) <= self.configuration.task_output_payload_threshold_kb * 1024:
+            return
+        task_definition_name = self.worker.get_task_definition_name()
+        try:
+            location = storage.get_location(Operation.WRITE, PayloadType.TASK_OUTPUT)
+            storage.upload(location.uri, payload)
+        except Exception:
+            logger.error(
+                f'Failed to upload output of task, id: {task_result.task_id}, sending it inline, reason: {traceback.format_exc()}'
+            )
+            return
+        task_result.output_data = None
+        task_result.external_output_payload_storage_path = location.path
+        if self.metrics_collector is not None:
+            self.metrics_collector.increment_external_payload_used(
+                task_definition_name, Operation.WRITE.value, PayloadType.TASK_OUTPUT.value
+            )
+
+    def __record_queue_to_completion_time(self, task: Task) -> None:
+        if self.metrics_collector is None or task.scheduled_time == None:
+            return
+        # scheduled_time is set by the server clock, skip samples made meaningless by clock skew
+        time_spent = time.time() - task.scheduled_time / 1000
+        if time_spent < 0:
+            return
+        self.metrics_collector.record_task_queue_to_completion_time(
+            self.worker.get_task_definition_name(), time_spent
+        )
+
+    def __start_span(self, name: str, task: Union[Task, TaskResult] = None) -> ContextManager:
+        """Span of the tracer in the configuration, if any, in the trace of the workflow of the task"""
+        tracer = self.configuration.tracer
+        if tracer is None:
+            return nullcontext()
+        # Only imported with a tracer, as tracing requires Python 3.7
+        from conductor.client.telemetry.tracing import get_trace_id
+        attributes = {'task_type': self.worker.get_task_definition_name()}
+        trace_id = None
+        if task is not None:
+            attributes['task_id'] = task.task_id
+            attributes['workflow_instance_id'] = task.workflow_instance_id
+            trace_id = get_trace_id(task.workflow_instance_id)
+        return tracer.start_span(name, attributes, trace_id)
+
+    def __profile(self) -> ContextManager:
+        profiler = self.configuration.profiler
+        if profiler is None:
+            return nullcontext()
+        return profiler.profile(self.worker.get_task_definition_name())
+
+    def __watch(self, task: Task) -> ContextManager:
+        slow_task_watchdog = self.configuration.slow_task_watchdog
+        if slow_task_watchdog is None:
+            return nullcontext()
+        return slow_task_watchdog.watch(
+            self.worker.get_task_definition_name(), task, self.metrics_collector
+        )
+
     def __wait_for_polling_interval(self) -> None:
         polling_interval = self.worker.get_polling_interval_in_seconds()
         logger.debug(f'Sleep for {polling_interval} seconds')
@@ -0,0 +1,124 @@
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Tuple
+import threading
+import time
+
+EvictionCallback = Callable[[Hashable, Any], None]
+
+
+class CacheEntry:
+    def __init__(self, value: Any, expires_at: float = None, tag: str = None):
+        self.value = value
+        self.expires_at = expires_at
+        self.tag = tag
+
+    def is_expired(self, now: float = None) -> bool:
+        if self.expires_at is None:
+            return False
+        if now is None:
+            now = time.monotonic()
+        return now >= self.expires_at
+
+
+class TtlLruCache:
+    """Thread safe LRU cache whose entries optionally expire after `ttl_seconds`.
+
+    Expired entries are kept until they are evicted or replaced, so callers
+    can revalidate them through `get_entry` using the stored `tag`, e.g. an
+    ETag or a content hash.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1000,
+        ttl_seconds: float = None,
+        on_eviction: EvictionCallback = None,
+    ):
+        if not isinstance(max_size, int) or max_size <= 0:
+            raise Exception('invalid cache size')
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.on_eviction = on_eviction
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        found, _ = self.lookup(key, record_stats=False)
+        return found
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        found, value = self.lookup(key)
+        if found:
+            return value
+        return default
+
+    def lookup(self, key: Hashable, record_stats: bool = True) -> Tuple[bool, Any]:
+        """Returns whether a fresh entry exists for `key` and its value"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.is_expired():
+                if record_stats:
+                    self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            if record_stats:
+                self.hits += 1
+            return True, entry.value
+
+    def get_entry(self, key: Hashable) -> CacheEntry:
+        """Returns the entry for `key` even if it has expired, without recording stats"""
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, key: Hashable, value: Any, tag: str = None, ttl_seconds: float = None) -> None:
+        if ttl_seconds is None:
+            ttl_seconds = self.ttl_seconds
+        expires_at = None
+        if ttl_seconds is not None:
+            expires_at = time.monotonic() + ttl_seconds
+        evicted = []
+        with self._lock:
+            self._entries[key] = CacheEntry(value, expires_at, tag)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                evicted.append(self._entries.popitem(last=False))
+                self.evictions += 1
+        self.__notify_eviction(evicted)
+
+    def touch(self, key: Hashable, ttl_seconds: float = None) -> None:
+        """Extends the expiration of an existing entry, e.g. after a successful revalidation"""
+        if ttl_seconds is None:
+            ttl_seconds = self.ttl_seconds
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.expires_at = None
+            if ttl_seconds is not None:
+                entry.expires_at = time.monotonic() + ttl_seconds
+            self._entries.move_to_end(key)
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate_if(self, predicate: Callable[[Hashable], bool]) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __notify_eviction(self, evicted: list) -> None:
+        if self.on_eviction is None:
+            return
+        for key, entry in evicted:
+            self.on_eviction(key, entry.value)
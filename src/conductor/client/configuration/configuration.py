@@ -22,6 +22,9 @@ class Configuration:
         self.temp_folder_path = None
 
         self.authentication_settings = authentication_settings
+        # Directory where processes using the same key share their auth token,
+        # so a single process requests a new one, None to not share it
+        self.auth_token_cache_directory = None
 
         # Debug switch
         self.debug = debug
@@ -48,6 +51,27 @@ class Configuration:
 
         # Provide an alterative to requests.Session() for HTTP connection.
         self.http_connection = None
+        # Set this to gzip, or zstd when zstandard is installed, to compress
+        # request bodies of at least request_compression_threshold_bytes.
+        # The server, or a proxy in front of it, must decode them.
+        self.request_compression = None
+        self.request_compression_threshold_bytes = 16 * 1024
+
+        # Tracer of task runners and API calls, see conductor.client.telemetry.tracing
+        self.tracer = None
+        # Sampling profiler of task executions, see conductor.client.telemetry.profiler
+        self.profiler = None
+        # Watchdog of slow task executions, see conductor.client.telemetry.slow_task_watchdog
+        self.slow_task_watchdog = None
+
+        # Storage of task payloads too large to be sent to the server, see conductor.client.external_storage
+        self.external_payload_storage = None
+        # Task outputs larger than this are written to the external payload storage
+        self.task_output_payload_threshold_kb = 3072
+
+        # Results of executed tasks, to skip executing redelivered tasks again,
+        # see conductor.client.automator.task_result_cache
+        self.task_result_cache = None
 
     @property
     def debug(self):
@@ -1,5 +1,6 @@
 from conductor.client.configuration.configuration import Configuration
 from pathlib import Path
+from typing import List
 import logging
 import os
 
@@ -10,6 +11,12 @@ logger = logging.getLogger(
 )
 
 
+# Upper bounds, in seconds, of the buckets of latency histograms
+DEFAULT_LATENCY_BUCKETS = [
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300, float('inf')
+]
+
+
 def get_default_temporary_folder() -> str:
     return f'{str(Path.home())}/tmp/'
 
@@ -19,12 +26,27 @@ class MetricsSettings:
             self,
             directory: str = None,
             file_name: str = 'metrics.log',
-            update_interval: float = 0.1):
+            update_interval: float = 0.1,
+            latency_buckets: List[float] = None,
+            flush_interval: float = 1,
+            http_port: int = None,
+            http_address: str = '0.0.0.0',
+            max_exception_labels: int = 10):
         if directory == None:
             directory = get_default_temporary_folder()
         self.__set_dir(directory)
         self.file_name = file_name
         self.update_interval = update_interval
+        if latency_buckets == None:
+            latency_buckets = DEFAULT_LATENCY_BUCKETS
+        self.latency_buckets = list(latency_buckets)
+        # Seconds between flushes of in-memory aggregated metrics, None to record every event directly
+        self.flush_interval = flush_interval
+        # Serve metrics over HTTP on this port instead of writing them to `file_name`
+        self.http_port = http_port
+        self.http_address = http_address
+        # Most frequent exception classes labeled per error metric, any other is labeled as other
+        self.max_exception_labels = max_exception_labels
 
     def __set_dir(self, dir: str) -> None:
         if not os.path.isdir(dir):
@@ -0,0 +1,39 @@
+from conductor.client.http.models.external_storage_location import ExternalStorageLocation
+from enum import Enum
+import abc
+
+
+class Operation(str, Enum):
+    READ = "READ"
+    WRITE = "WRITE"
+
+
+class PayloadType(str, Enum):
+    TASK_INPUT = "TASK_INPUT"
+    TASK_OUTPUT = "TASK_OUTPUT"
+    WORKFLOW_INPUT = "WORKFLOW_INPUT"
+    WORKFLOW_OUTPUT = "WORKFLOW_OUTPUT"
+
+
+class ExternalPayloadStorage(abc.ABC):
+    @abc.abstractmethod
+    def get_location(self, operation: Operation, payload_type: PayloadType, path: str = None) -> ExternalStorageLocation:
+        """
+        Retrieve where a payload is read from or written to.
+
+        :param operation: Operation
+        :param payload_type: PayloadType
+        :param path: str
+                     Path of the payload to read, as set by the server. A new one is chosen when writing without it.
+        :return: ExternalStorageLocation
+                 The uri to read from or write to, and the path referencing the payload in the server.
+        """
+        pass
+
+    @abc.abstractmethod
+    def upload(self, uri: str, payload: bytes) -> None:
+        pass
+
+    @abc.abstractmethod
+    def download(self, uri: str) -> bytes:
+        pass
@@ -0,0 +1,35 @@
+from conductor.client.external_storage.external_payload_storage import ExternalPayloadStorage, Operation, PayloadType
+from conductor.client.http.models.external_storage_location import ExternalStorageLocation
+from urllib.parse import unquote, urlparse
+from urllib.request import pathname2url
+import os
+import uuid
+
+
+class LocalFileSystemPayloadStorage(ExternalPayloadStorage):
+    """Stores payloads as files of `directory`, for tests and local setups"""
+
+    def __init__(self, directory: str):
+        self.directory = os.path.abspath(directory)
+        os.makedirs(self.directory, exist_ok=True)
+
+    def get_location(self, operation: Operation, payload_type: PayloadType, path: str = None) -> ExternalStorageLocation:
+        if path is None:
+            path = f'{payload_type.value.lower()}/{uuid.uuid4()}.json'
+        file_path = os.path.join(self.directory, path)
+        if os.path.commonpath([self.directory, os.path.abspath(file_path)]) != self.directory:
+            raise Exception('invalid payload path')
+        return ExternalStorageLocation(uri='file://' + pathname2url(file_path), path=path)
+
+    def upload(self, uri: str, payload: bytes) -> None:
+        file_path = self.__get_file_path(uri)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, 'wb') as file:
+            file.write(payload)
+
+    def download(self, uri: str) -> bytes:
+        with open(self.__get_file_path(uri), 'rb') as file:
+            return file.read()
+
+    def __get_file_path(self, uri: str) -> str:
+        return unquote(urlparse(uri).path)
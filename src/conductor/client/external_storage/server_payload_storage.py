@@ -0,0 +1,26 @@
+from conductor.client.external_storage.external_payload_storage import ExternalPayloadStorage, Operation, PayloadType
+from conductor.client.http.api.task_resource_api import TaskResourceApi
+from conductor.client.http.models.external_storage_location import ExternalStorageLocation
+import requests
+
+
+class ServerPayloadStorage(ExternalPayloadStorage):
+    """Reads and writes payloads at the locations handed out by the server, e.g. presigned urls"""
+
+    def __init__(self, task_client: TaskResourceApi, session: requests.Session = None):
+        self.task_client = task_client
+        self.session = session or requests.Session()
+
+    def get_location(self, operation: Operation, payload_type: PayloadType, path: str = None) -> ExternalStorageLocation:
+        return self.task_client.get_external_storage_location1(
+            path or '', operation.value, payload_type.value
+        )
+
+    def upload(self, uri: str, payload: bytes) -> None:
+        response = self.session.put(uri, data=payload, headers={'Content-Type': 'application/json'})
+        response.raise_for_status()
+
+    def download(self, uri: str) -> bytes:
+        response = self.session.get(uri)
+        response.raise_for_status()
+        return response.content
@@ -0,0 +1,10 @@
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+try:
+    from contextlib import nullcontext
+except ImportError:
+    # Python 3.6
+    @contextmanager
+    def nullcontext(enter_result: Any = None) -> Iterator[Any]:
+        yield enter_result
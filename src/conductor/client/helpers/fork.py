@@ -0,0 +1,30 @@
+from typing import Callable
+import os
+import weakref
+
+# Functions to call in forked children, by the instance they are bound to.
+# Instances are weakly referenced, so an entry is dropped once its instance
+# is collected.
+_after_fork_in_child_methods = weakref.WeakKeyDictionary()
+
+
+def register_after_fork_in_child(method: Callable[[], None]) -> None:
+    """Calls the bound `method` in every child forked from now on, as long as its instance is alive.
+
+    Only a weak reference to the instance is kept, so registering does not
+    keep it alive. Does nothing on platforms without fork.
+    """
+    if not hasattr(os, 'register_at_fork'):
+        return
+    functions = _after_fork_in_child_methods.setdefault(method.__self__, [])
+    functions.append(method.__func__)
+
+
+def _call_after_fork_in_child() -> None:
+    for instance, functions in list(_after_fork_in_child_methods.items()):
+        for function in functions:
+            function(instance)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_call_after_fork_in_child)
@@ -1,5 +1,8 @@
 from conductor.client.configuration.configuration import Configuration
 from conductor.client.http.thread import AwaitableThread
+from conductor.client.http import json_stream
+from conductor.client.http.auth_token_manager import AuthTokenManager, get_token_cache_file_path
+from conductor.client.http import raw_json
 from conductor.client.http import rest
 from six.moves.urllib.parse import quote
 from typing import Dict
@@ -42,6 +45,11 @@ class ApiClient(object):
         to the API
     """
 
+    TOKEN_RESOURCE_PATH = '/token'
+
+    # Bytes read at once from streamed responses, see deserialize_stream
+    STREAM_CHUNK_SIZE = 64 * 1024
+
     PRIMITIVE_TYPES = (float, bool, bytes, six.text_type) + six.integer_types
     NATIVE_TYPES_MAPPING = {
         'int': int,
@@ -65,13 +73,18 @@ class ApiClient(object):
             configuration = Configuration()
         self.configuration = configuration
 
-        self.rest_client = rest.RESTClientObject(connection=configuration.http_connection)
+        self.rest_client = rest.RESTClientObject(
+            connection=configuration.http_connection,
+            compression=configuration.request_compression,
+            compression_threshold_bytes=configuration.request_compression_threshold_bytes,
+        )
 
         self.default_headers = self.__get_default_headers(
             header_name, header_value
         )
 
         self.cookie = cookie
+        self.auth_token_manager = self.__get_auth_token_manager()
         self.__refresh_auth_token()
 
     def __call_api(
@@ -82,6 +95,7 @@ class ApiClient(object):
             _preload_content=True, _request_timeout=None):
 
         config = self.configuration
+        resource_path_template = resource_path
 
         # header parameters
         header_params = header_params or {}
@@ -122,7 +136,7 @@ class ApiClient(object):
         self.update_params_for_auth(
             header_params,
             query_params,
-            self.__get_authentication_headers()
+            self.__get_authentication_headers(resource_path)
         )
 
         # body
@@ -133,11 +147,26 @@ class ApiClient(object):
         url = self.configuration.host + resource_path
 
         # perform request and return response
-        response_data = self.request(
-            method, url, query_params=query_params, headers=header_params,
-            post_params=post_params, body=body,
-            _preload_content=_preload_content,
-            _request_timeout=_request_timeout)
+        try:
+            response_data = self.__perform_request(
+                resource_path_template, method, url, query_params=query_params,
+                headers=header_params, post_params=post_params, body=body,
+                _preload_content=_preload_content,
+                _request_timeout=_request_timeout)
+        except rest.ApiException as e:
+            # retry once with a new token when the server rejected the current one
+            if e.status != 401 or not self.__invalidate_auth_token(resource_path, header_params):
+                raise
+            self.update_params_for_auth(
+                header_params,
+                query_params,
+                self.__get_authentication_headers(resource_path)
+            )
+            response_data = self.__perform_request(
+                resource_path_template, method, url, query_params=query_params,
+                headers=header_params, post_params=post_params, body=body,
+                _preload_content=_preload_content,
+                _request_timeout=_request_timeout)
 
         self.last_response = response_data
 
@@ -155,6 +184,23 @@ class ApiClient(object):
             return (return_data, response_data.status,
                     response_data.getheaders())
 
+    def __perform_request(self, resource_path_template, method, url, **kwargs):
+        if self.configuration.tracer is None:
+            return self.request(method, url, **kwargs)
+        return self.__traced_request(f'{method} {resource_path_template}', method, url, **kwargs)
+
+    def __traced_request(self, span_name, method, url, headers=None, **kwargs):
+        with self.configuration.tracer.start_span(span_name, {'http.method': method, 'http.url': url}) as span:
+            headers = dict(headers or {})
+            headers['traceparent'] = span.get_traceparent()
+            try:
+                response_data = self.request(method, url, headers=headers, **kwargs)
+            except rest.ApiException as e:
+                span.set_attribute('http.status_code', e.status)
+                raise
+            span.set_attribute('http.status_code', response_data.status)
+            return response_data
+
     def sanitize_for_serialization(self, obj):
         """Builds a JSON POST object.
 
@@ -165,6 +211,7 @@ class ApiClient(object):
         If obj is list, sanitize each element in the list.
         If obj is dict, return the dict.
         If obj is swagger model, return the properties dict.
+        If obj is RawJson, return directly, to be spliced into the body.
 
         :param obj: The data to serialize.
         :return: The serialized form of data.
@@ -181,6 +228,8 @@ class ApiClient(object):
                          for sub_obj in obj)
         elif isinstance(obj, (datetime.datetime, datetime.date)):
             return obj.isoformat()
+        elif isinstance(obj, raw_json.RawJson):
+            return obj
 
         if isinstance(obj, dict):
             obj_dict = obj
@@ -224,6 +273,52 @@ class ApiClient(object):
                 f'failed to deserialize data {data} into class {response_type}, reason: {e}')
             return None
 
+    def deserialize_data(self, data, response_type):
+        """Deserializes data already decoded from JSON into an object.
+
+        :param data: dict, list or primitive.
+        :param response_type: class literal for
+            deserialized object, or string of class name.
+
+        :return: deserialized object.
+        """
+        return self.__deserialize(data, response_type)
+
+    def deserialize_stream(self, response, response_type, key=None, fields=None):
+        """Deserializes a list, or dict, response incrementally.
+
+        Meant for large responses, requested with `_preload_content=False`:
+        the body is read in chunks of `STREAM_CHUNK_SIZE` bytes while items
+        are yielded one by one, so memory is bounded by the size of the
+        largest item rather than by the size of the response. The response
+        is closed once consumed.
+
+        :param response: RESTResponse object to be deserialized.
+        :param response_type: `list[...]`, or `dict(str, ...)`, string of
+            the class of the items.
+        :param key: name of the field holding the items, when the response
+            is an object, e.g. `results` for search results.
+        :param fields: dict receiving the other fields of the response
+            object, as decoded JSON, when `key` is given, e.g. `totalHits`.
+
+        :return: iterator of deserialized items, of (key, item) pairs for dicts.
+        """
+        if response_type.startswith('list['):
+            item_type = re.match(r'list\[(.*)\]', response_type).group(1)
+        elif response_type.startswith('dict('):
+            item_type = re.match(r'dict\(([^,]*), (.*)\)', response_type).group(2)
+        else:
+            raise Exception('invalid response type to stream')
+        chunks = response.resp.iter_content(chunk_size=self.STREAM_CHUNK_SIZE)
+        try:
+            for item in json_stream.iter_json_items(chunks, key, fields):
+                if isinstance(item, tuple):
+                    yield item[0], self.__deserialize(item[1], item_type)
+                else:
+                    yield self.__deserialize(item, item_type)
+        finally:
+            response.resp.close()
+
     def __deserialize(self, data, klass):
         """Deserializes dict, list, str into an object.
 
@@ -625,7 +720,13 @@ class ApiClient(object):
                 instance = self.__deserialize(data, klass_name)
         return instance
 
-    def __get_authentication_headers(self):
+    def __get_authentication_headers(self, resource_path=None):
+        if resource_path == self.TOKEN_RESOURCE_PATH:
+            return None
+        if self.auth_token_manager is not None:
+            token = self.auth_token_manager.get_token()
+            if token != self.configuration.AUTH_TOKEN:
+                self.configuration.update_token(token)
         if self.configuration.AUTH_TOKEN is None:
             return None
         return {
@@ -634,18 +735,39 @@ class ApiClient(object):
             }
         }
 
-    def __refresh_auth_token(self) -> None:
+    def __get_auth_token_manager(self) -> AuthTokenManager:
+        authentication_settings = self.configuration.authentication_settings
+        if authentication_settings == None:
+            return None
+        cache_file_path = None
+        if self.configuration.auth_token_cache_directory is not None:
+            cache_file_path = get_token_cache_file_path(
+                self.configuration.auth_token_cache_directory,
+                self.configuration.host,
+                authentication_settings.key_id
+            )
+        # Not name mangled, so that the manager can be pickled along with its bound method
+        auth_token_manager = AuthTokenManager(self._get_new_token, cache_file_path)
         if self.configuration.AUTH_TOKEN != None:
+            # obtained by another client of the configuration
+            auth_token_manager.set_token(self.configuration.AUTH_TOKEN)
+        return auth_token_manager
+
+    def __refresh_auth_token(self) -> None:
+        if self.auth_token_manager is None:
             return
-        if self.configuration.authentication_settings == None:
-            return
-        token = self.__get_new_token()
-        self.configuration.update_token(token)
+        self.configuration.update_token(self.auth_token_manager.get_token())
+
+    def __invalidate_auth_token(self, resource_path, header_params) -> bool:
+        if self.auth_token_manager is None or resource_path == self.TOKEN_RESOURCE_PATH:
+            return False
+        self.auth_token_manager.invalidate(header_params.get('X-Authorization'))
+        return True
 
-    def __get_new_token(self) -> str:
+    def _get_new_token(self) -> str:
         try:
             response = self.call_api(
-                '/token', 'POST',
+                self.TOKEN_RESOURCE_PATH, 'POST',
                 header_params={
                     'Content-Type': self.select_header_content_type(['*/*'])
                 },
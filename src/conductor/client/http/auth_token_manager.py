@@ -0,0 +1,193 @@
+from conductor.client.configuration.configuration import Configuration
+from conductor.client.helpers.context import nullcontext
+from conductor.client.helpers.fork import register_after_fork_in_child
+from contextlib import contextmanager
+from typing import Callable, ContextManager, Dict, Iterator
+import base64
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+import traceback
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(
+    Configuration.get_logging_formatted_name(
+        __name__
+    )
+)
+
+
+class AuthTokenManager:
+    """Keeps an auth token fresh, optionally sharing it between processes.
+
+    The token is refreshed once `refresh_ratio` of its lifetime elapsed,
+    with a random jitter of up to a tenth of its lifetime, so processes
+    started together do not refresh together. The lifetime is read from the
+    `exp` claim of the token, and is `default_ttl_seconds` when it has none.
+    A token rejected by the server is refreshed at once with `invalidate`.
+    After a failed refresh, the current token is kept and the refresh is
+    retried `retry_interval` seconds later.
+
+    With `cache_file_path`, the token is shared through that file: the
+    process refreshing it holds a lock on the file, while the others wait
+    for the lock and then use the new token instead of requesting their own.
+    """
+
+    def __init__(
+        self,
+        fetch_token: Callable[[], str],
+        cache_file_path: str = None,
+        refresh_ratio: float = 0.8,
+        default_ttl_seconds: float = 1800,
+        retry_interval: float = 5,
+    ):
+        self.fetch_token = fetch_token
+        self.cache_file_path = cache_file_path
+        self.refresh_ratio = refresh_ratio
+        self.default_ttl_seconds = default_ttl_seconds
+        self.retry_interval = retry_interval
+        self._cached_token = None
+        self._token = None
+        self._refresh_time = 0
+        self._jitter = random.random()
+        self._lock = threading.Lock()
+        register_after_fork_in_child(self.__reset)
+
+    def set_token(self, token: str) -> None:
+        """Uses a token obtained elsewhere, until it needs to be refreshed"""
+        with self._lock:
+            self.__set_token({'token': token, 'issuedAt': time.time()})
+
+    def get_token(self) -> str:
+        token = self._token
+        if token is not None and time.time() < self._refresh_time:
+            return token
+        with self._lock:
+            if self._token is None or time.time() >= self._refresh_time:
+                self.__refresh()
+            return self._token
+
+    def invalidate(self, token: str) -> None:
+        """Refreshes the token, unless it was already refreshed since the server rejected `token`"""
+        with self._lock:
+            if token == self._token:
+                self.__refresh(rejected_token=token)
+
+    def __refresh(self, rejected_token: str = None) -> None:
+        with self.__lock_cache_file():
+            cached_token = self.__read_cache_file()
+            if cached_token is not None and cached_token['token'] not in (rejected_token, self._token):
+                self.__set_token(cached_token)
+                if time.time() < self._refresh_time:
+                    return
+            token = None
+            try:
+                token = self.fetch_token()
+            except Exception:
+                logger.debug(f'Failed to get new token, reason: {traceback.format_exc()}')
+            if token is None:
+                logger.warning(f'Failed to refresh auth token, retrying in {self.retry_interval}s')
+                self._refresh_time = time.time() + self.retry_interval
+                return
+            cached_token = {'token': token, 'issuedAt': time.time()}
+            self.__set_token(cached_token)
+            self.__write_cache_file(cached_token)
+
+    def __set_token(self, cached_token: Dict) -> None:
+        issued_at = cached_token['issuedAt']
+        expires_at = get_token_expiry(cached_token['token'])
+        if expires_at is None or expires_at <= issued_at:
+            expires_at = issued_at + self.default_ttl_seconds
+        lifetime = expires_at - issued_at
+        self._cached_token = cached_token
+        self._token = cached_token['token']
+        self._refresh_time = issued_at + lifetime * (self.refresh_ratio - self._jitter / 10)
+
+    def __lock_cache_file(self) -> ContextManager:
+        if self.cache_file_path is None or fcntl is None:
+            return nullcontext()
+        return self.__lock_file(f'{self.cache_file_path}.lock')
+
+    @contextmanager
+    def __lock_file(self, lock_file_path: str) -> Iterator[None]:
+        os.makedirs(os.path.dirname(lock_file_path), mode=0o700, exist_ok=True)
+        with open(lock_file_path, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def __read_cache_file(self) -> Dict:
+        if self.cache_file_path is None:
+            return None
+        try:
+            with open(self.cache_file_path, 'r') as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            logger.debug(f'Failed to read cached auth token, reason: {traceback.format_exc()}')
+            return None
+
+    def __write_cache_file(self, cached_token: Dict) -> None:
+        if self.cache_file_path is None:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cache_file_path), mode=0o700, exist_ok=True)
+            temporary_file_path = f'{self.cache_file_path}.{os.getpid()}.tmp'
+            file_descriptor = os.open(temporary_file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(file_descriptor, 'w') as file:
+                json.dump(cached_token, file)
+            os.replace(temporary_file_path, self.cache_file_path)
+        except Exception:
+            logger.warning(f'Failed to cache auth token, reason: {traceback.format_exc()}')
+
+    def __getstate__(self) -> Dict:
+        # Sent to a spawned child without the lock, nor the token state of this process
+        state = self.__dict__.copy()
+        for name in ('_token', '_refresh_time', '_jitter', '_lock'):
+            del state[name]
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__dict__.update(state)
+        self._token = None
+        self._refresh_time = 0
+        self.__reset()
+        register_after_fork_in_child(self.__reset)
+
+    def __reset(self) -> None:
+        # A forked child may inherit the lock held by a thread of its parent, and gets its own
+        # jitter so that children forked together do not all refresh the inherited token at once
+        self._lock = threading.Lock()
+        self._jitter = random.random()
+        if self._cached_token is not None:
+            self.__set_token(self._cached_token)
+
+
+def get_token_cache_file_path(directory: str, host: str, key_id: str) -> str:
+    """File caching the token of a key for a server, in `directory`"""
+    key = hashlib.sha256(f'{host}\n{key_id}'.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(directory, f'token-{key}.json')
+
+
+def get_token_expiry(token: str) -> float:
+    """Expiry time of a JWT, from its `exp` claim, None when it has none"""
+    try:
+        payload = token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        expiry = json.loads(base64.urlsafe_b64decode(payload)).get('exp')
+    except Exception:
+        return None
+    if not isinstance(expiry, (int, float)) or isinstance(expiry, bool):
+        return None
+    return float(expiry)
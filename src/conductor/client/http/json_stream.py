@@ -0,0 +1,161 @@
+from json import JSONDecodeError, JSONDecoder
+from typing import Any, Dict, Iterable, Iterator
+import codecs
+
+WHITESPACE = ' \t\n\r'
+DELIMITERS = WHITESPACE + ',]}'
+
+_decoder = JSONDecoder()
+
+
+class _JsonStreamReader:
+    """Reads JSON values one by one from chunks of a document.
+
+    Only the text of the value being decoded is kept in memory: consumed text
+    is dropped whenever a chunk is read.
+    """
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self.__chunks = iter(chunks)
+        self.__text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self.__buffer = ''
+        self.__position = 0
+        self.__exhausted = False
+
+    def peek(self) -> str:
+        """Next non whitespace character, without consuming it, '' at the end of the document"""
+        while True:
+            while self.__position < len(self.__buffer) and self.__buffer[self.__position] in WHITESPACE:
+                self.__position += 1
+            if self.__position < len(self.__buffer):
+                return self.__buffer[self.__position]
+            if not self.__read():
+                return ''
+
+    def expect(self, character: str) -> None:
+        if self.peek() != character:
+            raise JSONDecodeError(f'expecting {character!r}', self.__buffer, self.__position)
+        self.__position += 1
+
+    def decode_value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.__buffer, self.__position)
+            except JSONDecodeError:
+                if not self.__read_more():
+                    raise
+                continue
+            # A number or literal cut by the end of the buffer, e.g. `1.` or
+            # `1e`, may continue in the next chunk
+            if not self.__is_delimited(value, end) and self.__read_more():
+                continue
+            self.__position = end
+            return value
+
+    def __is_delimited(self, value: Any, end: int) -> bool:
+        if end == len(self.__buffer):
+            return False
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return self.__buffer[end] in DELIMITERS
+        return True
+
+    def __read_more(self) -> bool:
+        # Reads at least as much as is pending, so a value spanning many
+        # chunks is decoded a logarithmic number of times
+        pending_length = len(self.__buffer) - self.__position
+        while self.__read():
+            if len(self.__buffer) - self.__position >= 2 * pending_length:
+                return True
+        return len(self.__buffer) - self.__position > pending_length
+
+    def __read(self) -> bool:
+        if self.__exhausted:
+            return False
+        text = ''
+        while text == '':
+            chunk = next(self.__chunks, None)
+            if chunk is None:
+                self.__exhausted = True
+                text = self.__text_decoder.decode(b'', final=True)
+                break
+            text = self.__text_decoder.decode(chunk)
+        self.__buffer = self.__buffer[self.__position:] + text
+        self.__position = 0
+        return text != ''
+
+
+def iter_json_items(chunks: Iterable[bytes], key: str = None, fields: Dict[str, Any] = None) -> Iterator[Any]:
+    """Decodes a JSON document incrementally, from chunks of its UTF-8 text.
+
+    Yields the items of the array, or the (name, value) pairs of the object,
+    at the top level of the document, or at `key` of the top level object
+    when given. Nothing is yielded for null, or when `key` is missing. Only
+    one item is decoded at a time, so memory is bounded by the size of the
+    largest item rather than by the size of the document.
+
+    With `key`, the other fields of the top level object are decoded into
+    `fields` when given: the ones before `key` before the first item is
+    yielded, the ones after it once every item was yielded.
+    """
+    reader = _JsonStreamReader(chunks)
+    if key is None:
+        yield from _iter_items(reader)
+        return
+    reader.expect('{')
+    while True:
+        if reader.peek() == '}':
+            return
+        name = reader.decode_value()
+        reader.expect(':')
+        if name == key:
+            break
+        value = reader.decode_value()
+        if fields is not None:
+            fields[name] = value
+        if reader.peek() == ',':
+            reader.expect(',')
+    yield from _iter_items(reader)
+    if fields is None:
+        return
+    while reader.peek() == ',':
+        reader.expect(',')
+        name = reader.decode_value()
+        reader.expect(':')
+        fields[name] = reader.decode_value()
+    reader.expect('}')
+
+
+def _iter_items(reader: _JsonStreamReader) -> Iterator[Any]:
+    first_character = reader.peek()
+    if first_character == 'n':
+        reader.decode_value()
+        return
+    if first_character == '{':
+        yield from _iter_object_items(reader)
+        return
+    reader.expect('[')
+    if reader.peek() == ']':
+        reader.expect(']')
+        return
+    while True:
+        yield reader.decode_value()
+        if reader.peek() == ']':
+            reader.expect(']')
+            return
+        reader.expect(',')
+
+
+def _iter_object_items(reader: _JsonStreamReader) -> Iterator[Any]:
+    reader.expect('{')
+    if reader.peek() == '}':
+        reader.expect('}')
+        return
+    while True:
+        name = reader.decode_value()
+        reader.expect(':')
+        yield name, reader.decode_value()
+        if reader.peek() == '}':
+            reader.expect('}')
+            return
+        reader.expect(',')
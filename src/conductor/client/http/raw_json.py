@@ -0,0 +1,67 @@
+from typing import Any, Union
+import json
+import re
+import uuid
+
+
+class RawJson:
+    """JSON text sent as is in request bodies.
+
+    Use it for values that are already serialized, e.g. the response of a
+    downstream service, as `TaskResult.output_data`, or as any value in it:
+    the text is spliced into the request body, without being decoded and
+    encoded again. It is not validated, so it must be valid JSON.
+    """
+
+    __slots__ = ('data',)
+
+    def __init__(self, data: Union[bytes, str]):
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        self.data = data
+
+    def load(self) -> Any:
+        return json.loads(self.data)
+
+    def __eq__(self, other):
+        return isinstance(other, RawJson) and self.data == other.data
+
+    def __repr__(self):
+        return f'RawJson({self.data!r})'
+
+
+def dumps(obj: Any) -> Union[str, bytes]:
+    """`json.dumps`, splicing the `RawJson` values of `obj` into the result.
+
+    Returns a str when `obj` has no `RawJson` value, UTF-8 bytes otherwise.
+    """
+    raw_values = []
+    # Unique per call, so no string of obj can be mistaken for a placeholder
+    placeholder_prefix = uuid.uuid4().hex
+
+    def get_placeholder(value: Any) -> str:
+        if not isinstance(value, RawJson):
+            raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+        raw_values.append(value.data)
+        return f'{placeholder_prefix}:{len(raw_values) - 1}'
+
+    text = json.dumps(obj, default=get_placeholder)
+    if len(raw_values) == 0:
+        return text
+    parts = re.split(f'"{placeholder_prefix}:(\\d+)"', text)
+    for i in range(1, len(parts), 2):
+        parts[i - 1] = parts[i - 1].encode('utf-8')
+        parts[i] = raw_values[int(parts[i])]
+    parts[-1] = parts[-1].encode('utf-8')
+    return b''.join(parts)
+
+
+def load_raw_json(obj: Any) -> Any:
+    """Copy of `obj` with its `RawJson` values decoded"""
+    if isinstance(obj, RawJson):
+        return obj.load()
+    if isinstance(obj, dict):
+        return {key: load_raw_json(value) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [load_raw_json(value) for value in obj]
+    return obj
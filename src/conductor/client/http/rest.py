@@ -1,8 +1,9 @@
 from conductor.client.configuration.configuration import Configuration
+from conductor.client.http import raw_json
 from six.moves.urllib.parse import urlencode
 import certifi
+import gzip
 import io
-import json
 import logging
 import re
 import six
@@ -10,6 +11,18 @@ import ssl
 import requests
 
 
+logger = logging.getLogger(
+    Configuration.get_logging_formatted_name(
+        __name__
+    )
+)
+
+REQUEST_COMPRESSIONS = ['gzip', 'zstd']
+# Fastest levels, most of the size reduction of JSON bodies comes at the first levels
+GZIP_COMPRESSION_LEVEL = 1
+ZSTD_COMPRESSION_LEVEL = 1
+
+
 class RESTResponse(io.IOBase):
 
     def __init__(self, resp):
@@ -23,8 +36,15 @@ class RESTResponse(io.IOBase):
 
 
 class RESTClientObject(object):
-    def __init__(self, connection = None):
+    def __init__(self, connection = None, compression = None, compression_threshold_bytes = 0):
         self.connection = connection or requests.Session()
+        if compression is not None and compression not in REQUEST_COMPRESSIONS:
+            raise Exception('invalid request compression')
+        if compression == 'zstd' and get_zstd_compressor() is None:
+            logger.warning('zstandard is not installed, compressing requests with gzip')
+            compression = 'gzip'
+        self.compression = compression
+        self.compression_threshold_bytes = compression_threshold_bytes
 
 
     def request(self, method, url, query_params=None, headers=None,
@@ -40,9 +60,11 @@ class RESTClientObject(object):
         :param post_params: request post parameters,
                             `application/x-www-form-urlencoded`
                             and `multipart/form-data`
-        :param _preload_content: if False, the urllib3.HTTPResponse object will
-                                 be returned without reading/decoding response
-                                 data. Default is True.
+        :param _preload_content: if False, the response body is not read
+                                 until the underlying `requests` response,
+                                 `RESTResponse.resp`, is read, e.g. by
+                                 `ApiClient.deserialize_stream`.
+                                 Default is True.
         :param _request_timeout: timeout setting for this request. If one
                                  number provided, it will be total request
                                  timeout. It can also be a pair (tuple) of
@@ -73,12 +95,15 @@ class RESTClientObject(object):
                 if re.search('json', headers['Content-Type'], re.IGNORECASE) or isinstance(body, str):
                     request_body = '{}'
                     if body is not None:
-                        request_body = json.dumps(body)
+                        request_body = raw_json.dumps(body)
+                    if self.compression is not None:
+                        request_body = self.__compress(request_body, headers)
                     r = self.connection.request(
                         method, url,
                         data=request_body,
                         timeout=timeout,
-                        headers=headers
+                        headers=headers,
+                        stream=not _preload_content
                     )
                 else:
                     # Cannot generate the request from given parameters
@@ -92,20 +117,32 @@ class RESTClientObject(object):
                     method, url,
                     params=query_params,
                     timeout=timeout,
-                    headers=headers
+                    headers=headers,
+                    stream=not _preload_content
                 )
         except Exception as e:
             msg = "{0}\n{1}".format(type(e).__name__, str(e))
             raise ApiException(status=0, reason=msg)
 
-        if _preload_content:
-            r = RESTResponse(r)
+        r = RESTResponse(r)
 
         if not 200 <= r.status <= 299:
             raise ApiException(http_resp=r)
 
         return r
 
+    def __compress(self, request_body, headers):
+        if isinstance(request_body, str):
+            request_body = request_body.encode('utf-8')
+        if len(request_body) < self.compression_threshold_bytes:
+            return request_body
+        if self.compression == 'zstd':
+            request_body = get_zstd_compressor().compress(request_body)
+        else:
+            request_body = gzip.compress(request_body, compresslevel=GZIP_COMPRESSION_LEVEL)
+        headers['Content-Encoding'] = self.compression
+        return request_body
+
     def GET(self, url, headers=None, query_params=None, _preload_content=True,
             _request_timeout=None):
         return self.request("GET", url,
@@ -198,3 +235,12 @@ class ApiException(Exception):
             error_message += "HTTP response body: {0}\n".format(self.body)
 
         return error_message
+
+
+def get_zstd_compressor():
+    """Compressor of the optional zstandard package, None when it is not installed"""
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard.ZstdCompressor(level=ZSTD_COMPRESSION_LEVEL)
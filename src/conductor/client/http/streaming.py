@@ -0,0 +1,67 @@
+from conductor.client.http.api.metadata_resource_api import MetadataResourceApi
+from conductor.client.http.api.task_resource_api import TaskResourceApi
+from conductor.client.http.api_client import ApiClient
+from conductor.client.http.models.task_def import TaskDef
+from conductor.client.http.models.workflow_def import WorkflowDef
+from typing import Any, Callable, Dict, Iterator, Tuple
+
+
+class StreamedSearchPage:
+    """Search result page whose results are decoded while they are iterated.
+
+    `results` is an iterator, which closes the response once consumed.
+    `total_hits` and `query_id` are available as soon as they were read,
+    which is after the last result when the server sends them after the
+    results.
+    """
+
+    def __init__(self, response, api_client: ApiClient, result_type: str):
+        self._response = response
+        self._fields = {}
+        self.results = api_client.deserialize_stream(
+            response, f'list[{result_type}]', key='results', fields=self._fields
+        )
+
+    @property
+    def total_hits(self) -> int:
+        return self._fields.get('totalHits')
+
+    @property
+    def query_id(self) -> str:
+        return self._fields.get('queryId')
+
+    def close(self) -> None:
+        """Releases the response, when its results are not iterated to the end"""
+        self._response.resp.close()
+
+
+def stream_search_page(search: Callable[..., Any], api_client: ApiClient, result_type: str, **kwargs) -> StreamedSearchPage:
+    """Requests a search result page with `search`, e.g. `WorkflowResourceApi.search`, without reading its body upfront"""
+    return StreamedSearchPage(search(_preload_content=False, **kwargs), api_client, result_type)
+
+
+def iter_all_workflows(metadata_client: MetadataResourceApi, **kwargs) -> Iterator[WorkflowDef]:
+    """`MetadataResourceApi.get_all_workflows`, decoding one workflow definition at a time"""
+    yield from _iter_response(metadata_client.api_client, metadata_client.get_all_workflows, 'list[WorkflowDef]', kwargs)
+
+
+def iter_task_defs(metadata_client: MetadataResourceApi, **kwargs) -> Iterator[TaskDef]:
+    """`MetadataResourceApi.get_task_defs`, decoding one task definition at a time"""
+    yield from _iter_response(metadata_client.api_client, metadata_client.get_task_defs, 'list[TaskDef]', kwargs)
+
+
+def iter_all_verbose(task_client: TaskResourceApi, **kwargs) -> Iterator[Tuple[str, Dict[str, Dict[str, int]]]]:
+    """`TaskResourceApi.all_verbose`, decoding the (queue name, details) pairs one at a time"""
+    yield from _iter_response(
+        task_client.api_client, task_client.all_verbose, 'dict(str, dict(str, dict(str, int)))', kwargs
+    )
+
+
+def _iter_response(api_client: ApiClient, request: Callable[..., Any], response_type: str, kwargs: Dict[str, Any]) -> Iterator[Any]:
+    # The request is only sent once iteration starts, and the response is
+    # closed even when iteration stops before its first item
+    response = request(_preload_content=False, **kwargs)
+    try:
+        yield from api_client.deserialize_stream(response, response_type)
+    finally:
+        response.resp.close()
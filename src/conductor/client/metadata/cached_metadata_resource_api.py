@@ -0,0 +1,249 @@
+from conductor.client.cache.ttl_lru_cache import TtlLruCache
+from conductor.client.configuration.configuration import Configuration
+from conductor.client.configuration.settings.metrics_settings import MetricsSettings
+from conductor.client.http.api_client import ApiClient
+from conductor.client.http.api.metadata_resource_api import MetadataResourceApi
+from conductor.client.http.rest import ApiException
+from conductor.client.metadata.definition_hash import get_definition_hash
+from conductor.client.telemetry.metrics_collector import MetricsCollector
+from copy import deepcopy
+from typing import Any, Dict, Hashable, List, Tuple
+import logging
+
+logger = logging.getLogger(
+    Configuration.get_logging_formatted_name(
+        __name__
+    )
+)
+
+CACHE_NAME = 'metadata'
+HASH_TAG_PREFIX = 'sha256:'
+
+WORKFLOW_DEF_KEY = 'workflow_def'
+WORKFLOW_DEFS_KEY = 'workflow_defs'
+TASK_DEF_KEY = 'task_def'
+TASK_DEFS_KEY = 'task_defs'
+
+
+class CachedMetadataResourceApi(MetadataResourceApi):
+    """Drop-in replacement for `MetadataResourceApi` that caches definitions.
+
+    `get`, `get_task_def`, `get_all_workflows` and `get_task_defs` are served
+    from a TTL + LRU cache. Any call that changes a definition (`create`,
+    `update1`, `register_task_def`, `update_task_def` and the unregister calls)
+    invalidates the affected entries.
+
+    When `revalidate` is enabled, an expired entry is revalidated instead of
+    being replaced: if the server returned an ETag, the next request is sent
+    with `If-None-Match` and a 304 keeps the cached value; otherwise the new
+    response is compared by content hash and the cached object is kept when
+    nothing changed.
+
+    Cached values are deep copied on read unless `copy_on_read` is disabled,
+    so callers cannot corrupt the cache by mutating returned definitions.
+    """
+
+    def __init__(
+        self,
+        api_client: ApiClient = None,
+        ttl_seconds: float = 60,
+        max_size: int = 1000,
+        revalidate: bool = True,
+        copy_on_read: bool = True,
+        metrics_settings: MetricsSettings = None,
+    ):
+        super().__init__(api_client)
+        self.metrics_collector = None
+        if metrics_settings is not None:
+            self.metrics_collector = MetricsCollector(
+                metrics_settings
+            )
+        self.cache = TtlLruCache(
+            max_size=max_size,
+            ttl_seconds=ttl_seconds,
+            on_eviction=self.__on_eviction,
+        )
+        self.revalidate = revalidate
+        self.copy_on_read = copy_on_read
+
+    def get(self, name, **kwargs):
+        if not _is_cacheable(kwargs, 'version'):
+            return super().get(name, **kwargs)
+        version = kwargs.get('version')
+        query_params = []
+        if version is not None:
+            query_params.append(('version', version))
+        return self.__get_cached(
+            key=(WORKFLOW_DEF_KEY, name, version),
+            resource_path='/metadata/workflow/{name}',
+            path_params={'name': name},
+            query_params=query_params,
+            response_type='WorkflowDef',
+        )
+
+    def get_all_workflows(self, **kwargs):
+        if not _is_cacheable(kwargs, 'access'):
+            return super().get_all_workflows(**kwargs)
+        access = kwargs.get('access')
+        query_params = []
+        if access is not None:
+            query_params.append(('access', access))
+        return self.__get_cached(
+            key=(WORKFLOW_DEFS_KEY, access),
+            resource_path='/metadata/workflow',
+            path_params={},
+            query_params=query_params,
+            response_type='list[WorkflowDef]',
+        )
+
+    def get_task_def(self, tasktype, **kwargs):
+        if not _is_cacheable(kwargs):
+            return super().get_task_def(tasktype, **kwargs)
+        return self.__get_cached(
+            key=(TASK_DEF_KEY, tasktype),
+            resource_path='/metadata/taskdefs/{tasktype}',
+            path_params={'tasktype': tasktype},
+            query_params=[],
+            response_type='TaskDef',
+        )
+
+    def get_task_defs(self, **kwargs):
+        if not _is_cacheable(kwargs, 'access'):
+            return super().get_task_defs(**kwargs)
+        access = kwargs.get('access')
+        query_params = []
+        if access is not None:
+            query_params.append(('access', access))
+        return self.__get_cached(
+            key=(TASK_DEFS_KEY, access),
+            resource_path='/metadata/taskdefs',
+            path_params={},
+            query_params=query_params,
+            response_type='list[TaskDef]',
+        )
+
+    def create(self, body, **kwargs):
+        try:
+            return super().create(body, **kwargs)
+        finally:
+            self.invalidate_workflow_def(body.name)
+
+    def update1(self, body, **kwargs):
+        try:
+            return super().update1(body, **kwargs)
+        finally:
+            for workflow_def in body:
+                self.invalidate_workflow_def(workflow_def.name)
+
+    def unregister_workflow_def(self, name, version, **kwargs):
+        try:
+            return super().unregister_workflow_def(name, version, **kwargs)
+        finally:
+            self.invalidate_workflow_def(name)
+
+    def register_task_def(self, body, **kwargs):
+        try:
+            return super().register_task_def(body, **kwargs)
+        finally:
+            for task_def in body:
+                self.invalidate_task_def(task_def.name)
+
+    def update_task_def(self, body, **kwargs):
+        try:
+            return super().update_task_def(body, **kwargs)
+        finally:
+            self.invalidate_task_def(body.name)
+
+    def unregister_task_def(self, tasktype, **kwargs):
+        try:
+            return super().unregister_task_def(tasktype, **kwargs)
+        finally:
+            self.invalidate_task_def(tasktype)
+
+    def invalidate_workflow_def(self, name: str) -> None:
+        self.cache.invalidate_if(
+            lambda key: key[0] == WORKFLOW_DEFS_KEY or (
+                key[0] == WORKFLOW_DEF_KEY and key[1] == name
+            )
+        )
+
+    def invalidate_task_def(self, name: str) -> None:
+        self.cache.invalidate_if(
+            lambda key: key[0] == TASK_DEFS_KEY or (
+                key[0] == TASK_DEF_KEY and key[1] == name
+            )
+        )
+
+    def invalidate_all(self) -> None:
+        self.cache.clear()
+
+    def __get_cached(
+        self,
+        key: Hashable,
+        resource_path: str,
+        path_params: Dict[str, Any],
+        query_params: List[Tuple[str, Any]],
+        response_type: str,
+    ) -> Any:
+        found, value = self.cache.lookup(key)
+        if found:
+            self.__record_cache_access(hit=True)
+            return self.__copy(value)
+        self.__record_cache_access(hit=False)
+        entry = None
+        if self.revalidate:
+            entry = self.cache.get_entry(key)
+        header_params = {
+            'Accept': self.api_client.select_header_accept(['*/*'])
+        }
+        if entry is not None and entry.tag is not None and not entry.tag.startswith(HASH_TAG_PREFIX):
+            header_params['If-None-Match'] = entry.tag
+        try:
+            data, _, headers = self.api_client.call_api(
+                resource_path, 'GET',
+                path_params,
+                query_params,
+                header_params,
+                response_type=response_type,
+                auth_settings=[],
+                collection_formats={},
+            )
+        except ApiException as e:
+            if e.status == 304 and entry is not None:
+                logger.debug(f'Revalidated cached metadata using ETag: {key}')
+                self.cache.touch(key)
+                return self.__copy(entry.value)
+            raise
+        tag = headers.get('ETag') if headers is not None else None
+        if tag is None:
+            tag = HASH_TAG_PREFIX + get_definition_hash(data)
+        if entry is not None and entry.tag == tag:
+            logger.debug(f'Revalidated cached metadata using content hash: {key}')
+            self.cache.touch(key)
+            return self.__copy(entry.value)
+        self.cache.put(key, data, tag=tag)
+        return self.__copy(data)
+
+    def __copy(self, value: Any) -> Any:
+        if self.copy_on_read:
+            return deepcopy(value)
+        return value
+
+    def __record_cache_access(self, hit: bool) -> None:
+        if self.metrics_collector is None:
+            return
+        if hit:
+            self.metrics_collector.increment_cache_hit(CACHE_NAME)
+        else:
+            self.metrics_collector.increment_cache_miss(CACHE_NAME)
+
+    def __on_eviction(self, key: Hashable, value: Any) -> None:
+        if self.metrics_collector is not None:
+            self.metrics_collector.increment_cache_eviction(CACHE_NAME)
+
+
+def _is_cacheable(kwargs: Dict[str, Any], *cacheable_params: str) -> bool:
+    for key in kwargs.keys():
+        if key not in cacheable_params:
+            return False
+    return True
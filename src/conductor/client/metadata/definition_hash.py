@@ -0,0 +1,104 @@
+from typing import Any, Iterable
+import datetime
+import hashlib
+import json
+import six
+
+# Fields populated by the server which do not describe the definition itself
+SERVER_MANAGED_FIELDS = (
+    'createTime',
+    'updateTime',
+    'createdBy',
+    'updatedBy',
+    'ownerApp',
+    # Derived from the task type
+    'workflowTaskType',
+)
+
+# Values filled in by the server when a definition leaves them unset, by model
+SERVER_DEFAULT_VALUES = {
+    'WorkflowDef': {
+        'schemaVersion': 2,
+        'restartable': True,
+        'timeoutPolicy': 'ALERT_ONLY',
+    },
+    'WorkflowTask': {
+        'type': 'SIMPLE',
+    },
+}
+
+
+def to_canonical_dict(obj: Any, ignored_fields: Iterable[str] = (), drop_defaults: bool = False) -> Any:
+    """Converts a swagger model into plain JSON data with a stable representation.
+
+    Model attributes set to None are dropped, so a missing value and an
+    explicit null are considered equal. `ignored_fields` (JSON keys) are
+    removed from every model in the structure and, when `drop_defaults` is
+    set, model attributes holding a default value are dropped as well: the
+    value of `SERVER_DEFAULT_VALUES` when there is one, otherwise False, 0,
+    empty string or empty collection. Plain dicts, such as task inputs, are always kept as they are.
+    """
+    return __to_canonical(obj, frozenset(ignored_fields), drop_defaults)
+
+
+def get_definition_hash(obj: Any, ignored_fields: Iterable[str] = (), drop_defaults: bool = False) -> str:
+    """Returns the sha256 of the canonical JSON representation of `obj`"""
+    canonical = to_canonical_dict(obj, ignored_fields, drop_defaults)
+    encoded = json.dumps(
+        canonical,
+        sort_keys=True,
+        separators=(',', ':'),
+        default=str,
+    ).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def get_structural_hash(obj: Any) -> str:
+    """Returns a hash of a definition that is stable across server round trips"""
+    return get_definition_hash(
+        obj,
+        ignored_fields=SERVER_MANAGED_FIELDS,
+        drop_defaults=True,
+    )
+
+
+def __to_canonical(obj: Any, ignored_fields: frozenset, drop_defaults: bool) -> Any:
+    if obj is None or isinstance(obj, (bool, int, float, six.text_type)):
+        return obj
+    if isinstance(obj, (list, tuple)):
+        return [
+            __to_canonical(item, ignored_fields, drop_defaults) for item in obj
+        ]
+    if isinstance(obj, (datetime.datetime, datetime.date)):
+        return obj.isoformat()
+    if isinstance(obj, dict):
+        return {
+            str(key): __to_canonical(value, ignored_fields, drop_defaults)
+            for key, value in six.iteritems(obj)
+        }
+    if not hasattr(obj, 'swagger_types'):
+        return str(obj)
+    canonical = {}
+    server_default_values = SERVER_DEFAULT_VALUES.get(type(obj).__name__, {})
+    for attr in obj.swagger_types:
+        key = obj.attribute_map[attr]
+        value = getattr(obj, attr)
+        if value is None or key in ignored_fields:
+            continue
+        value = __to_canonical(value, ignored_fields, drop_defaults)
+        if drop_defaults and __is_default(value, server_default_values.get(key, None)):
+            continue
+        canonical[key] = value
+    return canonical
+
+
+def __is_default(value: Any, server_default_value: Any) -> bool:
+    if server_default_value is not None:
+        return value == server_default_value
+    if value is False:
+        return True
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value == 0
+    if isinstance(value, (six.text_type, list, dict)):
+        return len(value) == 0
+    return False
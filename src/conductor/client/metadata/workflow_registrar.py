@@ -0,0 +1,168 @@
+from concurrent.futures import ThreadPoolExecutor
+from conductor.client.configuration.configuration import Configuration
+from conductor.client.http.api.metadata_resource_api import MetadataResourceApi
+from conductor.client.http.models.workflow_def import WorkflowDef
+from conductor.client.http.rest import ApiException
+from conductor.client.metadata.definition_hash import get_structural_hash
+from typing import Dict, List, Tuple
+import json
+import logging
+import os
+import threading
+import traceback
+
+logger = logging.getLogger(
+    Configuration.get_logging_formatted_name(
+        __name__
+    )
+)
+
+CREATED = 'created'
+UPDATED = 'updated'
+UNCHANGED = 'unchanged'
+
+
+class RegistrationSummary:
+    def __init__(self):
+        self.created = []
+        self.updated = []
+        self.unchanged = []
+        self.failed = {}
+
+    def __repr__(self) -> str:
+        return 'RegistrationSummary(created={created}, updated={updated}, unchanged={unchanged}, failed={failed})'.format(
+            created=len(self.created),
+            updated=len(self.updated),
+            unchanged=len(self.unchanged),
+            failed=len(self.failed),
+        )
+
+
+class WorkflowRegistrar:
+    """Registers workflow definitions, uploading only the ones that changed.
+
+    Each definition is reduced to a structural hash which ignores
+    server-managed fields and default values, and is compared against the
+    hash recorded locally by a previous registration or, when it is unknown,
+    against the definition currently stored in the server. Definitions that
+    are new or changed are uploaded concurrently by up to `max_workers`
+    threads.
+
+    Definitions that differ from the server copy are updated unless
+    `overwrite` is unset, in which case they fail to register.
+
+    When `state_file` is given, the hashes of registered definitions are
+    persisted there as JSON, so subsequent runs skip unchanged definitions
+    without any server round trip. The state file must only be shared by
+    registrations against the same server.
+    """
+
+    def __init__(
+        self,
+        metadata_client: MetadataResourceApi,
+        max_workers: int = 8,
+        state_file: str = None,
+    ):
+        self.metadata_client = metadata_client
+        self.max_workers = max_workers
+        self.state_file = state_file
+        self._known_hashes = self.__load_state()
+        self._lock = threading.Lock()
+
+    def register(self, workflow_defs: List[WorkflowDef], overwrite: bool = True) -> RegistrationSummary:
+        summary = RegistrationSummary()
+        if len(workflow_defs) == 0:
+            return summary
+        max_workers = min(self.max_workers, len(workflow_defs))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            outcomes = list(executor.map(
+                lambda workflow_def: self.__try_register_one(workflow_def, overwrite), workflow_defs
+            ))
+        for workflow_def, (outcome, reason) in zip(workflow_defs, outcomes):
+            key = _get_workflow_key(workflow_def)
+            if outcome == CREATED:
+                summary.created.append(key)
+            elif outcome == UPDATED:
+                summary.updated.append(key)
+            elif outcome == UNCHANGED:
+                summary.unchanged.append(key)
+            else:
+                summary.failed[key] = reason
+        self.__save_state()
+        logger.info(f'Registered workflow definitions: {summary}')
+        return summary
+
+    def register_workflow(self, workflow_def: WorkflowDef, overwrite: bool = True) -> object:
+        """Register a single definition, raising when it fails, and return the server response, None when unchanged"""
+        _, response = self.__register_one(workflow_def, overwrite)
+        self.__save_state()
+        return response
+
+    def __try_register_one(self, workflow_def: WorkflowDef, overwrite: bool) -> Tuple[str, str]:
+        try:
+            outcome, _ = self.__register_one(workflow_def, overwrite)
+            return outcome, None
+        except Exception as e:
+            logger.error(
+                f'Failed to register workflow definition: {_get_workflow_key(workflow_def)}, reason: {traceback.format_exc()}'
+            )
+            return None, str(e)
+
+    def __register_one(self, workflow_def: WorkflowDef, overwrite: bool) -> Tuple[str, object]:
+        key = _get_workflow_key(workflow_def)
+        local_hash = get_structural_hash(workflow_def)
+        with self._lock:
+            known_hash = self._known_hashes.get(key)
+        if known_hash == local_hash:
+            return UNCHANGED, None
+        server_def = self.__get_server_definition(workflow_def)
+        response = None
+        if server_def is None:
+            response = self.metadata_client.create(body=workflow_def, overwrite=overwrite)
+            outcome = CREATED
+        elif get_structural_hash(server_def) == local_hash:
+            outcome = UNCHANGED
+        elif not overwrite:
+            raise Exception(f'workflow definition {key} differs from the server copy, and overwrite is not set')
+        else:
+            response = self.metadata_client.update1(body=[workflow_def])
+            outcome = UPDATED
+        with self._lock:
+            self._known_hashes[key] = local_hash
+        return outcome, response
+
+    def __get_server_definition(self, workflow_def: WorkflowDef) -> WorkflowDef:
+        kwargs = {}
+        if workflow_def.version is not None:
+            kwargs['version'] = workflow_def.version
+        try:
+            return self.metadata_client.get(workflow_def.name, **kwargs)
+        except ApiException as e:
+            if e.status == 404:
+                return None
+            raise
+
+    def __load_state(self) -> Dict[str, str]:
+        if self.state_file is None or not os.path.isfile(self.state_file):
+            return {}
+        try:
+            with open(self.state_file, 'r') as file:
+                return json.load(file)
+        except Exception:
+            logger.warning(
+                f'Failed to load workflow registration state from {self.state_file}, reason: {traceback.format_exc()}'
+            )
+            return {}
+
+    def __save_state(self) -> None:
+        if self.state_file is None:
+            return
+        temporary_file = self.state_file + '.tmp'
+        with self._lock:
+            with open(temporary_file, 'w') as file:
+                json.dump(self._known_hashes, file, sort_keys=True)
+        os.replace(temporary_file, self.state_file)
+
+
+def _get_workflow_key(workflow_def: WorkflowDef) -> str:
+    return f'{workflow_def.name}:{workflow_def.version}'
@@ -0,0 +1,188 @@
+from typing import Any, Dict, List
+import re
+
+# Conditions generated as `if ( <condition> ) { true; } else { false; }`, e.g. by `LoopTask`
+IF_TRUE_ELSE_FALSE_PATTERN = re.compile(
+    r'^\s*if\s*\((.*)\)\s*\{\s*(?:return\s+)?true\s*;?\s*\}\s*else\s*\{\s*(?:return\s+)?false\s*;?\s*\}\s*;?\s*$',
+    re.DOTALL,
+)
+
+TOKEN_PATTERN = re.compile(r'''
+    \s*(?:
+        (?P<number>\d+(?:\.\d+)?)
+        | (?P<string>'[^']*'|"[^"]*")
+        | (?P<operator>===|!==|==|!=|<=|>=|&&|\|\||[<>!()\[\].$])
+        | (?P<identifier>[A-Za-z_][A-Za-z0-9_]*)
+    )''', re.VERBOSE)
+
+LITERALS = {
+    'true': True,
+    'false': False,
+    'null': None,
+    'undefined': None,
+}
+
+COMPARISONS = {
+    '==': lambda left, right: left == right,
+    '===': lambda left, right: left == right,
+    '!=': lambda left, right: left != right,
+    '!==': lambda left, right: left != right,
+    '<': lambda left, right: left < right,
+    '<=': lambda left, right: left <= right,
+    '>': lambda left, right: left > right,
+    '>=': lambda left, right: left >= right,
+}
+
+
+def evaluate_condition(script: str, context: Dict[str, Any]) -> bool:
+    """Evaluates a boolean javascript condition such as a `DO_WHILE` loop condition.
+
+    Only the subset used by loop conditions is supported: `$` paths into the
+    given context, number, string and boolean literals, comparisons, `&&`,
+    `||`, `!` and parentheses, optionally wrapped in
+    `if (...) { true; } else { false; }`. A `$.<number>` path evaluates to
+    the number itself, as generated by `LoopTask`.
+    """
+    match = IF_TRUE_ELSE_FALSE_PATTERN.match(script)
+    if match is not None:
+        script = match.group(1)
+    script = script.strip().rstrip(';')
+    parser = _Parser(_tokenize(script), context)
+    value = parser.parse_or()
+    if not parser.is_done():
+        raise Exception(f'unsupported loop condition: {script}')
+    return _is_truthy(value)
+
+
+def _tokenize(script: str) -> List[str]:
+    tokens = []
+    position = 0
+    script = script.rstrip()
+    while position < len(script):
+        match = TOKEN_PATTERN.match(script, position)
+        if match is None or match.end() == position:
+            raise Exception(f'unsupported loop condition: {script}')
+        tokens.append(match.group().strip())
+        position = match.end()
+    return tokens
+
+
+def _is_truthy(value: Any) -> bool:
+    if isinstance(value, (list, dict)):
+        # javascript objects and arrays are truthy, even when empty
+        return True
+    return bool(value)
+
+
+class _Parser:
+    def __init__(self, tokens: List[str], context: Dict[str, Any]):
+        self.tokens = tokens
+        self.position = 0
+        self.context = context
+
+    def is_done(self) -> bool:
+        return self.position == len(self.tokens)
+
+    def parse_or(self) -> Any:
+        value = self.parse_and()
+        while self.__accept('||'):
+            right = self.parse_and()
+            value = value if _is_truthy(value) else right
+        return value
+
+    def parse_and(self) -> Any:
+        value = self.parse_not()
+        while self.__accept('&&'):
+            right = self.parse_not()
+            value = right if _is_truthy(value) else value
+        return value
+
+    def parse_not(self) -> Any:
+        if self.__accept('!'):
+            return not _is_truthy(self.parse_not())
+        return self.parse_comparison()
+
+    def parse_comparison(self) -> Any:
+        left = self.parse_operand()
+        operator = self.__peek()
+        if operator not in COMPARISONS:
+            return left
+        self.position += 1
+        right = self.parse_operand()
+        try:
+            return COMPARISONS[operator](left, right)
+        except TypeError:
+            # javascript comparisons with null or mismatching types are false
+            return False
+
+    def parse_operand(self) -> Any:
+        token = self.__next()
+        if token == '(':
+            value = self.parse_or()
+            self.__expect(')')
+            return value
+        if token == '$':
+            return self.__parse_path()
+        if token in LITERALS:
+            return LITERALS[token]
+        if token[0] in '\'"':
+            return token[1:-1]
+        if token[0].isdigit():
+            return _to_number(token)
+        raise Exception(f'unsupported token in loop condition: {token}')
+
+    def __parse_path(self) -> Any:
+        value = self.context
+        is_root = True
+        while self.__peek() in ('.', '['):
+            if self.__accept('.'):
+                key = self.__next()
+                if is_root and key[0].isdigit():
+                    return _to_number(key)
+            else:
+                self.__next()
+                key = self.__next()
+                if key[0] in '\'"':
+                    key = key[1:-1]
+                self.__expect(']')
+            is_root = False
+            value = _get_child(value, key)
+        return value
+
+    def __peek(self) -> str:
+        if self.is_done():
+            return None
+        return self.tokens[self.position]
+
+    def __next(self) -> str:
+        if self.is_done():
+            raise Exception('unexpected end of loop condition')
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def __accept(self, token: str) -> bool:
+        if self.__peek() == token:
+            self.position += 1
+            return True
+        return False
+
+    def __expect(self, token: str) -> None:
+        if not self.__accept(token):
+            raise Exception(f'expected {token} in loop condition')
+
+
+def _get_child(value: Any, key: str) -> Any:
+    if isinstance(value, dict):
+        return value.get(key)
+    if isinstance(value, list) and key.isdigit() and int(key) < len(value):
+        return value[int(key)]
+    if isinstance(value, list) and key == 'length':
+        return len(value)
+    return None
+
+
+def _to_number(token: str) -> Any:
+    if '.' in token:
+        return float(token)
+    return int(token)
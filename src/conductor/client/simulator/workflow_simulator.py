@@ -0,0 +1,476 @@
+from concurrent.futures import ThreadPoolExecutor
+from conductor.client.configuration.configuration import Configuration
+from conductor.client.http.raw_json import load_raw_json
+from conductor.client.http.models.task import Task
+from conductor.client.http.models.task_exec_log import TaskExecLog
+from conductor.client.http.models.task_result import TaskResult
+from conductor.client.http.models.task_result_status import TaskResultStatus
+from conductor.client.http.models.workflow import Workflow
+from conductor.client.http.models.workflow_def import WorkflowDef
+from conductor.client.http.models.workflow_task import WorkflowTask
+from conductor.client.simulator.script_evaluator import evaluate_condition
+from conductor.client.workflow.conductor_workflow import ConductorWorkflow
+from conductor.client.workflow.task.task_type import TaskType
+from conductor.client.worker.worker_interface import WorkerInterface
+from enum import Enum
+from typing import Any, Dict, List, Union
+import logging
+import re
+import threading
+import time
+import traceback
+import uuid
+
+logger = logging.getLogger(
+    Configuration.get_logging_formatted_name(
+        __name__
+    )
+)
+
+# Matches every `${...}` expression of an input or output parameter
+EXPRESSION_PATTERN = re.compile(r'\$\{([^}]*)\}')
+# Single component of a wait duration, e.g. `2m` in `1h 2m`
+DURATION_PATTERN = re.compile(r'(\d+)\s*([a-zA-Z]+)')
+DURATION_UNITS_IN_SECONDS = {
+    's': 1, 'sec': 1, 'secs': 1, 'second': 1, 'seconds': 1,
+    'm': 60, 'min': 60, 'mins': 60, 'minute': 60, 'minutes': 60,
+    'h': 3600, 'hr': 3600, 'hrs': 3600, 'hour': 3600, 'hours': 3600,
+    'd': 86400, 'day': 86400, 'days': 86400,
+}
+
+WORKFLOW_REFERENCE = 'workflow'
+
+
+class SimulationReport:
+    def __init__(self, workflows: List[Workflow], duration_seconds: float):
+        self.workflows = workflows
+        self.duration_seconds = duration_seconds
+        latencies = sorted(
+            (workflow.end_time - workflow.start_time) / 1000 for workflow in workflows
+        )
+        self.completed = sum(1 for workflow in workflows if workflow.status == 'COMPLETED')
+        self.failed = len(workflows) - self.completed
+        self.throughput = len(workflows) / duration_seconds if duration_seconds > 0 else 0
+        self.latency_p50 = _get_percentile(latencies, 50)
+        self.latency_p95 = _get_percentile(latencies, 95)
+        self.latency_p99 = _get_percentile(latencies, 99)
+        self.latency_max = latencies[-1] if len(latencies) > 0 else 0
+
+    def __repr__(self) -> str:
+        return ('SimulationReport(workflows={count}, completed={completed}, failed={failed}, '
+                'throughput={throughput:.1f}/s, p50={p50:.4f}s, p95={p95:.4f}s, p99={p99:.4f}s)').format(
+            count=len(self.workflows),
+            completed=self.completed,
+            failed=self.failed,
+            throughput=self.throughput,
+            p50=self.latency_p50,
+            p95=self.latency_p95,
+            p99=self.latency_p99,
+        )
+
+
+class WorkflowSimulator:
+    """Executes workflow definitions in process, without a Conductor server.
+
+    SIMPLE tasks are dispatched directly to the registered workers, by task
+    definition name, on the thread executing the workflow. Fork branches run
+    concurrently, one thread per branch. Supported system tasks are
+    FORK_JOIN, JOIN, SWITCH and DECISION with `value-param`, DO_WHILE (see
+    `evaluate_condition` for the supported loop conditions), SET_VARIABLE,
+    WAIT and TERMINATE; any other task type fails the workflow.
+
+    WAIT tasks complete immediately unless `sleep_on_wait` is set, in which
+    case their `duration` is honored. This is meant for tests and benchmarks
+    of worker code, the semantics of the server are only approximated.
+    """
+
+    def __init__(
+        self,
+        workers: List[WorkerInterface] = None,
+        sleep_on_wait: bool = False,
+        max_loop_iterations: int = 1000,
+    ):
+        self.workers = {}
+        for worker in workers or []:
+            self.register_worker(worker)
+        self.sleep_on_wait = sleep_on_wait
+        self.max_loop_iterations = max_loop_iterations
+
+    def register_worker(self, worker: WorkerInterface) -> None:
+        self.workers[worker.get_task_definition_name()] = worker
+
+    def execute(
+        self,
+        workflow: Union[WorkflowDef, ConductorWorkflow],
+        workflow_input: Dict[str, Any] = None,
+        correlation_id: str = None,
+    ) -> Workflow:
+        """Executes the workflow until it completes, fails or is terminated"""
+        workflow_def = workflow
+        if not isinstance(workflow, WorkflowDef):
+            workflow_def = workflow.to_workflow_def()
+        return _WorkflowExecution(self, workflow_def, workflow_input or {}, correlation_id).run()
+
+    def benchmark(
+        self,
+        workflow: Union[WorkflowDef, ConductorWorkflow],
+        workflow_inputs: List[Dict[str, Any]],
+        max_workers: int = 1,
+    ) -> SimulationReport:
+        """Executes one workflow per input, `max_workers` at a time, and reports throughput and latency"""
+        workflow_def = workflow
+        if not isinstance(workflow, WorkflowDef):
+            workflow_def = workflow.to_workflow_def()
+        start_time = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            workflows = list(executor.map(
+                lambda workflow_input: self.execute(workflow_def, workflow_input),
+                workflow_inputs,
+            ))
+        return SimulationReport(workflows, time.perf_counter() - start_time)
+
+
+class _WorkflowStopped(Exception):
+    def __init__(self, status: str, reason: str, output: Dict[str, Any] = None):
+        self.status = status
+        self.reason = reason
+        self.output = output
+        super().__init__(reason)
+
+
+class _WorkflowExecution:
+    def __init__(self, simulator: WorkflowSimulator, workflow_def: WorkflowDef,
+                 workflow_input: Dict[str, Any], correlation_id: str):
+        self.simulator = simulator
+        self.workflow_def = workflow_def
+        self.workflow = Workflow(
+            workflow_id=str(uuid.uuid4()),
+            workflow_name=workflow_def.name,
+            workflow_version=workflow_def.version,
+            correlation_id=correlation_id,
+            input=workflow_input,
+            variables=dict(workflow_def.variables or {}),
+            tasks=[],
+            status='RUNNING',
+            start_time=_get_time_millis(),
+        )
+        # Latest execution of each task, by reference name
+        self.tasks = {}
+        self.lock = threading.Lock()
+
+    def run(self) -> Workflow:
+        try:
+            self.__execute_task_list(self.workflow_def.tasks or [], '')
+            self.workflow.status = 'COMPLETED'
+            self.workflow.output = self.__get_workflow_output()
+        except _WorkflowStopped as e:
+            self.workflow.status = e.status
+            self.workflow.reason_for_incompletion = e.reason
+            self.workflow.output = e.output if e.output is not None else {}
+        self.workflow.end_time = _get_time_millis()
+        logger.debug(
+            f'Simulated workflow {self.workflow.workflow_name}, id: {self.workflow.workflow_id}, status: {self.workflow.status}'
+        )
+        return self.workflow
+
+    def __get_workflow_output(self) -> Dict[str, Any]:
+        if self.workflow_def.output_parameters:
+            return self.__resolve(self.workflow_def.output_parameters)
+        if len(self.workflow.tasks) == 0:
+            return {}
+        return self.workflow.tasks[-1].output_data or {}
+
+    def __execute_task_list(self, workflow_tasks: List[WorkflowTask], iteration_suffix: str) -> None:
+        for workflow_task in workflow_tasks:
+            self.__execute_task(workflow_task, iteration_suffix)
+
+    def __execute_task(self, workflow_task: WorkflowTask, iteration_suffix: str) -> None:
+        task_type = workflow_task.type
+        if task_type == TaskType.SIMPLE.value:
+            self.__execute_simple_task(workflow_task, iteration_suffix)
+            return
+        task = self.__schedule_task(workflow_task, iteration_suffix)
+        if task_type == TaskType.FORK_JOIN.value:
+            self.__execute_fork(workflow_task, iteration_suffix)
+        elif task_type == TaskType.JOIN.value:
+            task.output_data = {
+                reference_name: self.tasks[reference_name].output_data
+                for reference_name in workflow_task.join_on or [] if reference_name in self.tasks
+            }
+        elif task_type in (TaskType.SWITCH.value, TaskType.DECISION.value):
+            self.__execute_switch(workflow_task, task, iteration_suffix)
+        elif task_type == TaskType.DO_WHILE.value:
+            self.__execute_loop(workflow_task, task, iteration_suffix)
+        elif task_type == TaskType.SET_VARIABLE.value:
+            with self.lock:
+                self.workflow.variables.update(task.input_data)
+        elif task_type == TaskType.WAIT.value:
+            if self.simulator.sleep_on_wait and task.input_data.get('duration'):
+                time.sleep(_get_duration_in_seconds(task.input_data['duration']))
+        elif task_type == TaskType.TERMINATE.value:
+            self.__complete_task(task, 'COMPLETED')
+            raise _WorkflowStopped(
+                _get_enum_value(task.input_data.get('terminationStatus') or 'TERMINATED'),
+                task.input_data.get('terminationReason'),
+                task.input_data.get('workflowOutput'),
+            )
+        else:
+            self.__fail_task(workflow_task, task, f'unsupported task type {task_type}')
+            return
+        self.__complete_task(task, 'COMPLETED')
+
+    def __execute_simple_task(self, workflow_task: WorkflowTask, iteration_suffix: str) -> None:
+        worker = self.simulator.workers.get(workflow_task.name)
+        retry_count = 0
+        while True:
+            task = self.__schedule_task(workflow_task, iteration_suffix)
+            task.retry_count = retry_count
+            if worker is None:
+                self.__fail_task(workflow_task, task, f'no worker registered for task {workflow_task.name}')
+                return
+            task_result = self.__poll_until_done(worker, task)
+            task.output_data = task_result.output_data or {}
+            task.reason_for_incompletion = task_result.reason_for_incompletion
+            task.worker_id = task_result.worker_id
+            if task_result.status == TaskResultStatus.COMPLETED:
+                self.__complete_task(task, 'COMPLETED')
+                return
+            if task_result.status == TaskResultStatus.FAILED and retry_count < (workflow_task.retry_count or 0):
+                self.__complete_task(task, 'FAILED')
+                retry_count += 1
+                continue
+            self.__fail_task(workflow_task, task, task_result.reason_for_incompletion, task_result.status)
+            return
+
+    def __poll_until_done(self, worker: WorkerInterface, task: Task) -> TaskResult:
+        while True:
+            task.poll_count = (task.poll_count or 0) + 1
+            task.start_time = _get_time_millis()
+            try:
+                task_result = worker.execute(task)
+            except Exception as e:
+                task_result = TaskResult(
+                    task_id=task.task_id,
+                    workflow_instance_id=task.workflow_instance_id,
+                    worker_id=worker.get_identity(),
+                )
+                task_result.status = TaskResultStatus.FAILED
+                task_result.reason_for_incompletion = str(e)
+                task_result.logs = [TaskExecLog(
+                    traceback.format_exc(), task_result.task_id, int(time.time()))]
+            # The server would only see the JSON of RawJson outputs
+            task_result.output_data = load_raw_json(task_result.output_data)
+            if task_result.status != TaskResultStatus.IN_PROGRESS:
+                return task_result
+            task.output_data = task_result.output_data
+            if task_result.callback_after_seconds:
+                time.sleep(task_result.callback_after_seconds)
+
+    def __execute_fork(self, workflow_task: WorkflowTask, iteration_suffix: str) -> None:
+        fork_tasks = workflow_task.fork_tasks or []
+        if len(fork_tasks) == 0:
+            return
+        with ThreadPoolExecutor(max_workers=len(fork_tasks)) as executor:
+            futures = [
+                executor.submit(self.__execute_task_list, branch, iteration_suffix)
+                for branch in fork_tasks
+            ]
+        for future in futures:
+            future.result()
+
+    def __execute_switch(self, workflow_task: WorkflowTask, task: Task, iteration_suffix: str) -> None:
+        if workflow_task.type == TaskType.DECISION.value:
+            parameter_name = workflow_task.case_value_param
+        elif workflow_task.evaluator_type == 'value-param':
+            parameter_name = workflow_task.expression
+        else:
+            self.__fail_task(
+                workflow_task, task, f'unsupported switch evaluator {workflow_task.evaluator_type}'
+            )
+            return
+        case_value = task.input_data.get(parameter_name)
+        case_value = str(case_value) if case_value is not None else None
+        decision_cases = workflow_task.decision_cases or {}
+        if case_value in decision_cases:
+            case_tasks = decision_cases[case_value]
+        else:
+            case_tasks = workflow_task.default_case or []
+        task.output_data = {'evaluationResult': [case_value]}
+        self.__execute_task_list(case_tasks, iteration_suffix)
+
+    def __execute_loop(self, workflow_task: WorkflowTask, task: Task, iteration_suffix: str) -> None:
+        loop_over = workflow_task.loop_over or []
+        task.output_data = {}
+        iteration = 0
+        while True:
+            iteration += 1
+            if iteration > self.simulator.max_loop_iterations:
+                self.__fail_task(
+                    workflow_task, task, f'loop exceeded {self.simulator.max_loop_iterations} iterations'
+                )
+                return
+            task.iteration = iteration
+            self.__execute_task_list(loop_over, f'__{iteration}')
+            iteration_output = {
+                loop_task.task_reference_name: self.tasks[loop_task.task_reference_name].output_data
+                for loop_task in loop_over if loop_task.task_reference_name in self.tasks
+            }
+            task.output_data[str(iteration)] = iteration_output
+            task.output_data['iteration'] = iteration
+            context = dict(task.input_data)
+            context.update(iteration_output)
+            context[workflow_task.task_reference_name] = task.output_data
+            try:
+                should_continue = evaluate_condition(workflow_task.loop_condition or 'false', context)
+            except Exception as e:
+                self.__fail_task(workflow_task, task, str(e))
+                return
+            if not should_continue:
+                return
+
+    def __schedule_task(self, workflow_task: WorkflowTask, iteration_suffix: str) -> Task:
+        now = _get_time_millis()
+        task = Task(
+            task_id=str(uuid.uuid4()),
+            task_type=workflow_task.type,
+            task_def_name=workflow_task.name,
+            reference_task_name=workflow_task.task_reference_name + iteration_suffix,
+            workflow_instance_id=self.workflow.workflow_id,
+            workflow_type=self.workflow.workflow_name,
+            correlation_id=self.workflow.correlation_id,
+            input_data=self.__resolve(workflow_task.input_parameters or {}),
+            status='IN_PROGRESS',
+            scheduled_time=now,
+            start_time=now,
+            poll_count=0,
+            retry_count=0,
+            workflow_task=workflow_task,
+        )
+        with self.lock:
+            task.seq = len(self.workflow.tasks) + 1
+            self.workflow.tasks.append(task)
+            self.tasks[workflow_task.task_reference_name] = task
+            if iteration_suffix:
+                self.tasks[task.reference_task_name] = task
+        return task
+
+    def __complete_task(self, task: Task, status: str) -> None:
+        if task.status != 'IN_PROGRESS':
+            return
+        task.status = status
+        task.end_time = _get_time_millis()
+        task.update_time = task.end_time
+
+    def __fail_task(self, workflow_task: WorkflowTask, task: Task, reason: str,
+                    status: TaskResultStatus = TaskResultStatus.FAILED) -> None:
+        task.reason_for_incompletion = reason
+        if workflow_task.optional:
+            self.__complete_task(task, 'COMPLETED_WITH_ERRORS')
+            return
+        self.__complete_task(task, TaskResultStatus(status).value)
+        with self.lock:
+            self.workflow.failed_reference_task_names = (self.workflow.failed_reference_task_names or []) + [
+                task.reference_task_name
+            ]
+        raise _WorkflowStopped('FAILED', f'task {task.reference_task_name} failed: {reason}')
+
+    def __resolve(self, value: Any) -> Any:
+        if isinstance(value, str):
+            return self.__resolve_string(value)
+        if isinstance(value, dict):
+            return {key: self.__resolve(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self.__resolve(item) for item in value]
+        return value
+
+    def __resolve_string(self, value: str) -> Any:
+        if '${' not in value:
+            return value
+        match = EXPRESSION_PATTERN.fullmatch(value)
+        if match is not None:
+            return self.__resolve_expression(match.group(1))
+        return EXPRESSION_PATTERN.sub(
+            lambda match: _to_string(self.__resolve_expression(match.group(1))), value
+        )
+
+    def __resolve_expression(self, expression: str) -> Any:
+        path = _split_path(expression.strip())
+        if len(path) == 0:
+            return None
+        if path[0] == WORKFLOW_REFERENCE:
+            root = {
+                'input': self.workflow.input,
+                'output': self.workflow.output,
+                'variables': self.workflow.variables,
+                'workflowId': self.workflow.workflow_id,
+                'correlationId': self.workflow.correlation_id,
+                'workflowType': self.workflow.workflow_name,
+                'version': self.workflow.workflow_version,
+            }
+        else:
+            task = self.tasks.get(path[0])
+            if task is None:
+                return None
+            root = {
+                'input': task.input_data,
+                'output': task.output_data,
+                'status': task.status,
+                'taskId': task.task_id,
+                'referenceTaskName': task.reference_task_name,
+                'retryCount': task.retry_count,
+                'reasonForIncompletion': task.reason_for_incompletion,
+            }
+        value = root
+        for key in path[1:]:
+            if isinstance(value, dict):
+                value = value.get(key)
+            elif isinstance(value, list) and isinstance(key, int) and key < len(value):
+                value = value[key]
+            else:
+                return None
+        return value
+
+
+def _split_path(expression: str) -> List[Union[str, int]]:
+    path = []
+    for part in expression.split('.'):
+        name, _, indexes = part.partition('[')
+        if name:
+            path.append(name)
+        if indexes:
+            for index in ('[' + indexes).split('[')[1:]:
+                index = index.rstrip(']')
+                path.append(int(index) if index.isdigit() else index.strip('\'"'))
+    return path
+
+
+def _get_enum_value(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def _to_string(value: Any) -> str:
+    if value is None:
+        return 'null'
+    return str(value)
+
+
+def _get_duration_in_seconds(duration: str) -> int:
+    seconds = 0
+    for amount, unit in DURATION_PATTERN.findall(str(duration)):
+        if unit.lower() not in DURATION_UNITS_IN_SECONDS:
+            raise Exception(f'invalid wait duration {duration}')
+        seconds += int(amount) * DURATION_UNITS_IN_SECONDS[unit.lower()]
+    return seconds
+
+
+def _get_percentile(sorted_values: List[float], percentile: int) -> float:
+    if len(sorted_values) == 0:
+        return 0
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * percentile / 100))
+    return sorted_values[index]
+
+
+def _get_time_millis() -> int:
+    return int(time.time() * 1000)
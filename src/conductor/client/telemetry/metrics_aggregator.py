@@ -0,0 +1,165 @@
+from conductor.client.configuration.configuration import Configuration
+from conductor.client.helpers.fork import register_after_fork_in_child
+from typing import Any, Callable, Dict, Hashable, List
+import atexit
+import logging
+import threading
+import traceback
+import weakref
+
+logger = logging.getLogger(
+    Configuration.get_logging_formatted_name(
+        __name__
+    )
+)
+
+# Receives the aggregated counter increments, last gauge values and histogram observations, by metric key
+FlushCallback = Callable[
+    [Dict[Hashable, float], Dict[Hashable, Any], Dict[Hashable, List[float]]],
+    None
+]
+
+
+class _ThreadMetrics:
+    __slots__ = ('thread', 'counters', 'flushed_counters', 'gauges', 'observations')
+
+    def __init__(self, thread: threading.Thread):
+        self.thread = thread
+        # Totals since the thread started, only written by the thread itself
+        self.counters = {}
+        # Totals already handed to the flush callback, only written by the flushing thread
+        self.flushed_counters = {}
+        self.gauges = {}
+        self.observations = {}
+
+    def drain(self) -> tuple:
+        """Takes the events recorded since the previous drain, without blocking the recording thread.
+
+        Each step is a single operation on a builtin container, which cannot
+        interleave with the single operation recording an event: the totals
+        are copied, gauges are popped one at a time and only the observations
+        present when their list was measured are deleted.
+        """
+        counters = {}
+        flushed_counters = self.flushed_counters
+        for key, total in self.counters.copy().items():
+            amount = total - flushed_counters.get(key, 0)
+            if amount != 0:
+                counters[key] = amount
+                flushed_counters[key] = total
+        gauges = {}
+        recorded_gauges = self.gauges
+        while len(recorded_gauges) > 0:
+            # A gauge set again while draining is popped again, with its later value
+            key, value = recorded_gauges.popitem()
+            gauges[key] = value
+        observations = {}
+        for key, values in self.observations.copy().items():
+            count = len(values)
+            if count > 0:
+                observations[key] = values[:count]
+                del values[:count]
+        return counters, gauges, observations
+
+
+class MetricsAggregator:
+    """Aggregates metric events in memory and flushes them periodically.
+
+    Each thread records into its own buffers without taking any lock:
+    counters are totals written by that thread only, gauges are the last
+    values set and observations are appended to lists. Every `flush_interval`
+    seconds a daemon thread drains the buffers of all threads, which only
+    takes what was recorded so far, and hands their aggregated content to
+    `on_flush`.
+
+    The flush thread is started on the first event recorded by each process,
+    so aggregators created before forking keep working in the children.
+    Pending events are flushed when the process exits.
+    """
+
+    def __init__(self, flush_interval: float, on_flush: FlushCallback):
+        self.flush_interval = flush_interval
+        self.on_flush = on_flush
+        self.__reset()
+        register_after_fork_in_child(self.__reset)
+        reference = weakref.ref(self)
+        atexit.register(lambda: reference() and reference().flush())
+
+    def increment(self, key: Hashable, amount: float = 1) -> None:
+        try:
+            counters = self._local.metrics.counters
+        except AttributeError:
+            counters = self.__register_thread().counters
+        counters[key] = counters.get(key, 0) + amount
+
+    def set(self, key: Hashable, value: Any) -> None:
+        try:
+            gauges = self._local.metrics.gauges
+        except AttributeError:
+            gauges = self.__register_thread().gauges
+        gauges[key] = value
+
+    def observe(self, key: Hashable, value: float) -> None:
+        try:
+            observations = self._local.metrics.observations
+        except AttributeError:
+            observations = self.__register_thread().observations
+        values = observations.get(key)
+        if values is None:
+            observations[key] = values = []
+        values.append(value)
+
+    def flush(self) -> None:
+        """Hands every event recorded since the previous flush to `on_flush`"""
+        with self._flush_lock:
+            drained = []
+            for thread_metrics in list(self._thread_metrics):
+                # Checked before draining, so that a finished thread was drained after its last event
+                is_alive = thread_metrics.thread.is_alive()
+                drained.append(thread_metrics.drain())
+                if not is_alive:
+                    self._thread_metrics.remove(thread_metrics)
+            counters, gauges, observations = {}, {}, {}
+            for drained_counters, drained_gauges, drained_observations in drained:
+                for key, amount in drained_counters.items():
+                    counters[key] = counters.get(key, 0) + amount
+                gauges.update(drained_gauges)
+                for key, values in drained_observations.items():
+                    observations.setdefault(key, []).extend(values)
+            if len(counters) == 0 and len(gauges) == 0 and len(observations) == 0:
+                return
+            try:
+                self.on_flush(counters, gauges, observations)
+            except Exception:
+                logger.warning(f'Failed to flush metrics, reason: {traceback.format_exc()}')
+
+    def __register_thread(self) -> _ThreadMetrics:
+        thread_metrics = _ThreadMetrics(threading.current_thread())
+        with self._flush_lock:
+            self._thread_metrics.append(thread_metrics)
+            if self._flush_thread is None:
+                self._flush_thread = threading.Thread(
+                    target=self.__flush_periodically, name='MetricsAggregatorFlush', daemon=True
+                )
+                self._flush_thread.start()
+        self._local.metrics = thread_metrics
+        return thread_metrics
+
+    def __flush_periodically(self) -> None:
+        stopped = self._stopped
+        while not stopped.wait(self.flush_interval):
+            self.flush()
+
+    def __reset(self) -> None:
+        # A forked child has no flush thread yet, and must not flush again the events its parent
+        # recorded, which the parent flushes itself
+        self._local = threading.local()
+        self._thread_metrics = []
+        self._flush_thread = None
+        self._stopped = threading.Event()
+        self._flush_lock = threading.Lock()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self.flush()
+
@@ -1,16 +1,20 @@
 from conductor.client.configuration.configuration import Configuration
 from conductor.client.configuration.settings.metrics_settings import MetricsSettings
+from conductor.client.telemetry.metrics_aggregator import MetricsAggregator
+from conductor.client.telemetry.metrics_server import MetricsServer
 from conductor.client.telemetry.model.metric_documentation import MetricDocumentation
 from conductor.client.telemetry.model.metric_label import MetricLabel
 from conductor.client.telemetry.model.metric_name import MetricName
 from prometheus_client import CollectorRegistry
 from prometheus_client import Counter
 from prometheus_client import Gauge
+from prometheus_client import Histogram
 from prometheus_client import write_to_textfile
 from prometheus_client.multiprocess import MultiProcessCollector
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 import logging
 import os
+import threading
 import time
 
 logger = logging.getLogger(
@@ -19,211 +23,401 @@ logger = logging.getLogger(
     )
 )
 
+# Exception label of the error metrics for exception classes outside of their most frequent ones
+OTHER_EXCEPTION_LABEL = 'other'
+
+# Exception classes counted by each error metric per exception label it gives out, which bounds the
+# memory used to find the most frequent ones
+TRACKED_EXCEPTION_CLASSES_PER_LABEL = 10
+
+# Touched in the metrics directory after every flush of aggregated metrics, not a `.db` file so
+# the multiprocess collector ignores it
+FLUSH_MARKER_FILE_NAME = 'aggregated_metrics.flushed'
+
+# Modification times closer than this to a read of the metrics may not tell a later flush apart
+FILE_TIME_RESOLUTION_NANOSECONDS = 1e9
+
+
+class _ExceptionLabels:
+    """Exception labels of an error metric, given to its `max_labels` most frequent exception classes.
+
+    Occurrences are counted for up to `TRACKED_EXCEPTION_CLASSES_PER_LABEL`
+    classes per label. Once that many are counted, a new class replaces the
+    least frequent unlabeled one and starts from its count, as in the
+    space-saving algorithm. A class becoming more frequent than the least
+    frequent labeled one takes over its label; the classes left out are
+    labeled as other.
+    """
+
+    def __init__(self, max_labels: int):
+        self.max_labels = max_labels
+        self.counts = {}
+        self.labels = set()
+
+    def get_label(self, class_name: str) -> str:
+        if self.max_labels <= 0:
+            return OTHER_EXCEPTION_LABEL
+        counts = self.counts
+        if class_name in counts:
+            counts[class_name] += 1
+        elif len(counts) < self.max_labels * TRACKED_EXCEPTION_CLASSES_PER_LABEL:
+            counts[class_name] = 1
+        else:
+            replaced_class_name = min(
+                (tracked_class_name for tracked_class_name in counts if tracked_class_name not in self.labels),
+                key=counts.get
+            )
+            counts[class_name] = counts.pop(replaced_class_name) + 1
+        if class_name in self.labels:
+            return class_name
+        if len(self.labels) < self.max_labels:
+            self.labels.add(class_name)
+            return class_name
+        least_frequent_class_name = min(self.labels, key=counts.get)
+        if counts[class_name] > counts[least_frequent_class_name]:
+            self.labels.remove(least_frequent_class_name)
+            self.labels.add(class_name)
+            return class_name
+        return OTHER_EXCEPTION_LABEL
+
+
+class _MetricKeys(dict):
+    """Keys of the events of a metric, by label values, built once for each label values.
+
+    A metric with a single label is indexed by the value of that label,
+    others by the tuple of their label values. Events reuse the key instead
+    of building their labels again.
+    """
+
+    def __init__(self, name: MetricName, documentation: MetricDocumentation, *label_names: MetricLabel):
+        super().__init__()
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+
+    def __missing__(self, label_values: Any) -> tuple:
+        values = (label_values,) if len(self.label_names) == 1 else label_values
+        key = (self.name, self.documentation, tuple(zip(self.label_names, values)))
+        self[label_values] = key
+        return key
+
+
+_TASK_POLL_KEYS = _MetricKeys(MetricName.TASK_POLL, MetricDocumentation.TASK_POLL, MetricLabel.TASK_TYPE)
+_TASK_EXECUTION_QUEUE_FULL_KEYS = _MetricKeys(
+    MetricName.TASK_EXECUTION_QUEUE_FULL, MetricDocumentation.TASK_EXECUTION_QUEUE_FULL,
+    MetricLabel.TASK_TYPE
+)
+_THREAD_UNCAUGHT_EXCEPTION_KEYS = _MetricKeys(
+    MetricName.THREAD_UNCAUGHT_EXCEPTION, MetricDocumentation.THREAD_UNCAUGHT_EXCEPTION,
+    
+)
+_TASK_POLL_ERROR_KEYS = _MetricKeys(
+    MetricName.TASK_POLL_ERROR, MetricDocumentation.TASK_POLL_ERROR,
+    MetricLabel.TASK_TYPE, MetricLabel.EXCEPTION
+)
+_TASK_PAUSED_KEYS = _MetricKeys(MetricName.TASK_PAUSED, MetricDocumentation.TASK_PAUSED, MetricLabel.TASK_TYPE)
+_TASK_EXECUTE_ERROR_KEYS = _MetricKeys(
+    MetricName.TASK_EXECUTE_ERROR, MetricDocumentation.TASK_EXECUTE_ERROR,
+    MetricLabel.TASK_TYPE, MetricLabel.EXCEPTION
+)
+_TASK_SLOW_KEYS = _MetricKeys(MetricName.TASK_SLOW, MetricDocumentation.TASK_SLOW, MetricLabel.TASK_TYPE)
+_TASK_ACK_FAILED_KEYS = _MetricKeys(
+    MetricName.TASK_ACK_FAILED, MetricDocumentation.TASK_ACK_FAILED,
+    MetricLabel.TASK_TYPE
+)
+_TASK_ACK_ERROR_KEYS = _MetricKeys(
+    MetricName.TASK_ACK_ERROR, MetricDocumentation.TASK_ACK_ERROR,
+    MetricLabel.TASK_TYPE, MetricLabel.EXCEPTION
+)
+_TASK_UPDATE_ERROR_KEYS = _MetricKeys(
+    MetricName.TASK_UPDATE_ERROR, MetricDocumentation.TASK_UPDATE_ERROR,
+    MetricLabel.TASK_TYPE, MetricLabel.EXCEPTION
+)
+_EXTERNAL_PAYLOAD_USED_KEYS = _MetricKeys(
+    MetricName.EXTERNAL_PAYLOAD_USED, MetricDocumentation.EXTERNAL_PAYLOAD_USED,
+    MetricLabel.ENTITY_NAME, MetricLabel.OPERATION, MetricLabel.PAYLOAD_TYPE
+)
+_WORKFLOW_START_ERROR_KEYS = _MetricKeys(
+    MetricName.WORKFLOW_START_ERROR, MetricDocumentation.WORKFLOW_START_ERROR,
+    MetricLabel.WORKFLOW_TYPE, MetricLabel.EXCEPTION
+)
+_CACHE_HIT_KEYS = _MetricKeys(MetricName.CACHE_HIT, MetricDocumentation.CACHE_HIT, MetricLabel.CACHE_NAME)
+_CACHE_MISS_KEYS = _MetricKeys(MetricName.CACHE_MISS, MetricDocumentation.CACHE_MISS, MetricLabel.CACHE_NAME)
+_CACHE_EVICTION_KEYS = _MetricKeys(
+    MetricName.CACHE_EVICTION, MetricDocumentation.CACHE_EVICTION,
+    MetricLabel.CACHE_NAME
+)
+_WORKFLOW_INPUT_SIZE_KEYS = _MetricKeys(
+    MetricName.WORKFLOW_INPUT_SIZE, MetricDocumentation.WORKFLOW_INPUT_SIZE,
+    MetricLabel.WORKFLOW_TYPE, MetricLabel.WORKFLOW_VERSION
+)
+_TASK_RESULT_SIZE_KEYS = _MetricKeys(
+    MetricName.TASK_RESULT_SIZE, MetricDocumentation.TASK_RESULT_SIZE,
+    MetricLabel.TASK_TYPE
+)
+_TASK_POLL_TIME_KEYS = _MetricKeys(MetricName.TASK_POLL_TIME, MetricDocumentation.TASK_POLL_TIME, MetricLabel.TASK_TYPE)
+_TASK_EXECUTE_TIME_KEYS = _MetricKeys(
+    MetricName.TASK_EXECUTE_TIME, MetricDocumentation.TASK_EXECUTE_TIME,
+    MetricLabel.TASK_TYPE
+)
+_TASK_UPDATE_TIME_KEYS = _MetricKeys(
+    MetricName.TASK_UPDATE_TIME, MetricDocumentation.TASK_UPDATE_TIME,
+    MetricLabel.TASK_TYPE
+)
+_TASK_QUEUE_WAIT_TIME_KEYS = _MetricKeys(
+    MetricName.TASK_QUEUE_WAIT_TIME, MetricDocumentation.TASK_QUEUE_WAIT_TIME,
+    MetricLabel.TASK_TYPE
+)
+_TASK_QUEUE_TO_COMPLETION_TIME_KEYS = _MetricKeys(
+    MetricName.TASK_QUEUE_TO_COMPLETION_TIME, MetricDocumentation.TASK_QUEUE_TO_COMPLETION_TIME,
+    MetricLabel.TASK_TYPE
+)
+_METRIC_LABEL_DROPPED_KEYS = _MetricKeys(
+    MetricName.METRIC_LABEL_DROPPED, MetricDocumentation.METRIC_LABEL_DROPPED,
+    MetricLabel.METRIC_NAME
+)
+
 
 class MetricsCollector:
     counters = {}
     gauges = {}
+    histograms = {}
     registry = CollectorRegistry()
     must_collect_metrics = False
+    aggregator = None
+    # Aggregator shared by every collector of the process, created by the first collector aggregating metrics
+    shared_aggregator = None
+    shared_aggregator_lock = threading.Lock()
 
     def __init__(self, settings: MetricsSettings):
+        # Most frequent exception classes, by metric
+        self.exception_labels = {}
         if settings != None:
             os.environ["PROMETHEUS_MULTIPROC_DIR"] = settings.directory
             MultiProcessCollector(self.registry)
             self.must_collect_metrics = True
+            self.latency_buckets = settings.latency_buckets
+            self.max_exception_labels = settings.max_exception_labels
+            self.flush_interval = settings.flush_interval
+            if settings.flush_interval:
+                self.aggregator = self.__get_shared_aggregator()
+
+    def __getstate__(self) -> Dict:
+        # A spawned child gets the aggregator of its own process instead of a copy of this one
+        state = self.__dict__.copy()
+        state.pop('aggregator', None)
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__dict__.update(state)
+        if self.must_collect_metrics and self.flush_interval:
+            self.aggregator = self.__get_shared_aggregator()
+
+    def __get_shared_aggregator(self) -> MetricsAggregator:
+        with MetricsCollector.shared_aggregator_lock:
+            if MetricsCollector.shared_aggregator is None:
+                MetricsCollector.shared_aggregator = MetricsAggregator(
+                    self.flush_interval, self.__write_aggregated_metrics
+                )
+            return MetricsCollector.shared_aggregator
 
     @staticmethod
-    def provide_metrics(settings: MetricsSettings) -> None:
+    def provide_metrics(settings: MetricsSettings, task_runner_processes: List[Tuple[str, int]] = None) -> None:
         if settings == None:
             return
+        if settings.http_port != None:
+            MetricsServer(
+                directory=settings.directory,
+                port=settings.http_port,
+                address=settings.http_address,
+                task_runner_processes=task_runner_processes,
+            ).serve_forever()
+            return
         OUTPUT_FILE_PATH = os.path.join(
             settings.directory,
             settings.file_name
         )
         registry = CollectorRegistry()
         MultiProcessCollector(registry)
+        flush_marker_path = None
+        if settings.flush_interval:
+            flush_marker_path = os.path.join(settings.directory, FLUSH_MARKER_FILE_NAME)
+        previous_flush_time = None
+        previous_write_time = None
         while True:
-            write_to_textfile(
-                OUTPUT_FILE_PATH,
-                registry
-            )
+            write_time = int(time.time() * 1e9)
+            flush_time = _get_modification_time(flush_marker_path)
+            # Aggregated metrics only change on flush, skip collecting them again until the next one
+            if flush_marker_path is None or previous_write_time is None or flush_time != previous_flush_time or \
+                    (flush_time is not None and previous_write_time - flush_time < FILE_TIME_RESOLUTION_NANOSECONDS):
+                write_to_textfile(
+                    OUTPUT_FILE_PATH,
+                    registry
+                )
+                previous_flush_time = flush_time
+                previous_write_time = write_time
             time.sleep(settings.update_interval)
 
+    def flush(self) -> None:
+        """Writes every aggregated metric event still held in memory"""
+        if self.aggregator is not None:
+            self.aggregator.flush()
+
     def increment_task_poll(self, task_type: str) -> None:
-        self.__increment_counter(
-            name=MetricName.TASK_POLL,
-            documentation=MetricDocumentation.TASK_POLL,
-            labels={
-                MetricLabel.TASK_TYPE: task_type
-            }
-        )
+        self.__increment_counter(_TASK_POLL_KEYS[task_type])
 
     def increment_task_execution_queue_full(self, task_type: str) -> None:
-        self.__increment_counter(
-            name=MetricName.TASK_EXECUTION_QUEUE_FULL,
-            documentation=MetricDocumentation.TASK_EXECUTION_QUEUE_FULL,
-            labels={
-                MetricLabel.TASK_TYPE: task_type
-            }
-        )
+        self.__increment_counter(_TASK_EXECUTION_QUEUE_FULL_KEYS[task_type])
 
     def increment_uncaught_exception(self):
-        self.__increment_counter(
-            name=MetricName.THREAD_UNCAUGHT_EXCEPTION,
-            documentation=MetricDocumentation.THREAD_UNCAUGHT_EXCEPTION,
-            labels={}
-        )
+        self.__increment_counter(_THREAD_UNCAUGHT_EXCEPTION_KEYS[()])
 
     def increment_task_poll_error(self, task_type: str, exception: Exception) -> None:
-        self.__increment_counter(
-            name=MetricName.TASK_POLL_ERROR,
-            documentation=MetricDocumentation.TASK_POLL_ERROR,
-            labels={
-                MetricLabel.TASK_TYPE: task_type,
-                MetricLabel.EXCEPTION: str(exception)
-            }
-        )
+        exception_label = self.__get_exception_label(MetricName.TASK_POLL_ERROR, exception)
+        self.__increment_counter(_TASK_POLL_ERROR_KEYS[task_type, exception_label])
 
     def increment_task_paused(self, task_type: str) -> None:
-        self.__increment_counter(
-            name=MetricName.TASK_PAUSED,
-            documentation=MetricDocumentation.TASK_PAUSED,
-            labels={
-                MetricLabel.TASK_TYPE: task_type
-            }
-        )
+        self.__increment_counter(_TASK_PAUSED_KEYS[task_type])
 
     def increment_task_execution_error(self, task_type: str, exception: Exception) -> None:
-        self.__increment_counter(
-            name=MetricName.TASK_EXECUTE_ERROR,
-            documentation=MetricDocumentation.TASK_EXECUTE_ERROR,
-            labels={
-                MetricLabel.TASK_TYPE: task_type,
-                MetricLabel.EXCEPTION: str(exception)
-            }
-        )
+        exception_label = self.__get_exception_label(MetricName.TASK_EXECUTE_ERROR, exception)
+        self.__increment_counter(_TASK_EXECUTE_ERROR_KEYS[task_type, exception_label])
+
+    def increment_task_slow(self, task_type: str) -> None:
+        self.__increment_counter(_TASK_SLOW_KEYS[task_type])
 
     def increment_task_ack_failed(self, task_type: str) -> None:
-        self.__increment_counter(
-            name=MetricName.TASK_ACK_FAILED,
-            documentation=MetricDocumentation.TASK_ACK_FAILED,
-            labels={
-                MetricLabel.TASK_TYPE: task_type
-            }
-        )
+        self.__increment_counter(_TASK_ACK_FAILED_KEYS[task_type])
 
     def increment_task_ack_error(self, task_type: str, exception: Exception) -> None:
-        self.__increment_counter(
-            name=MetricName.TASK_ACK_ERROR,
-            documentation=MetricDocumentation.TASK_ACK_ERROR,
-            labels={
-                MetricLabel.TASK_TYPE: task_type,
-                MetricLabel.EXCEPTION: str(exception)
-            }
-        )
+        exception_label = self.__get_exception_label(MetricName.TASK_ACK_ERROR, exception)
+        self.__increment_counter(_TASK_ACK_ERROR_KEYS[task_type, exception_label])
 
     def increment_task_update_error(self, task_type: str, exception: Exception) -> None:
-        self.__increment_counter(
-            name=MetricName.TASK_UPDATE_ERROR,
-            documentation=MetricDocumentation.TASK_UPDATE_ERROR,
-            labels={
-                MetricLabel.TASK_TYPE: task_type,
-                MetricLabel.EXCEPTION: str(exception)
-            }
-        )
+        exception_label = self.__get_exception_label(MetricName.TASK_UPDATE_ERROR, exception)
+        self.__increment_counter(_TASK_UPDATE_ERROR_KEYS[task_type, exception_label])
 
     def increment_external_payload_used(self, entity_name: str, operation: str, payload_type: str) -> None:
-        self.__increment_counter(
-            name=MetricName.EXTERNAL_PAYLOAD_USED,
-            documentation=MetricDocumentation.EXTERNAL_PAYLOAD_USED,
-            labels={
-                MetricLabel.ENTITY_NAME: entity_name,
-                MetricLabel.OPERATION: operation,
-                MetricLabel.PAYLOAD_TYPE: payload_type
-            }
-        )
+        self.__increment_counter(_EXTERNAL_PAYLOAD_USED_KEYS[entity_name, operation, payload_type])
 
     def increment_workflow_start_error(self, workflow_type: str, exception: Exception) -> None:
-        self.__increment_counter(
-            name=MetricName.WORKFLOW_START_ERROR,
-            documentation=MetricDocumentation.WORKFLOW_START_ERROR,
-            labels={
-                MetricLabel.WORKFLOW_TYPE: workflow_type,
-                MetricLabel.EXCEPTION: str(exception)
-            }
-        )
+        exception_label = self.__get_exception_label(MetricName.WORKFLOW_START_ERROR, exception)
+        self.__increment_counter(_WORKFLOW_START_ERROR_KEYS[workflow_type, exception_label])
+
+    def increment_cache_hit(self, cache_name: str) -> None:
+        self.__increment_counter(_CACHE_HIT_KEYS[cache_name])
+
+    def increment_cache_miss(self, cache_name: str) -> None:
+        self.__increment_counter(_CACHE_MISS_KEYS[cache_name])
+
+    def increment_cache_eviction(self, cache_name: str) -> None:
+        self.__increment_counter(_CACHE_EVICTION_KEYS[cache_name])
 
     def record_workflow_input_payload_size(self, workflow_type: str, version: str, payload_size: int) -> None:
-        self.__record_gauge(
-            name=MetricName.WORKFLOW_INPUT_SIZE,
-            documentation=MetricDocumentation.WORKFLOW_INPUT_SIZE,
-            labels={
-                MetricLabel.WORKFLOW_TYPE: workflow_type,
-                MetricLabel.WORKFLOW_VERSION: version
-            },
-            value=payload_size
-        )
+        self.__record_gauge(_WORKFLOW_INPUT_SIZE_KEYS[workflow_type, version], payload_size)
 
     def record_task_result_payload_size(self, task_type: str, payload_size: int) -> None:
-        self.__record_gauge(
-            name=MetricName.TASK_RESULT_SIZE,
-            documentation=MetricDocumentation.TASK_RESULT_SIZE,
-            labels={
-                MetricLabel.TASK_TYPE: task_type
-            },
-            value=payload_size
-        )
+        self.__record_gauge(_TASK_RESULT_SIZE_KEYS[task_type], payload_size)
 
     def record_task_poll_time(self, task_type: str, time_spent: float) -> None:
-        self.__record_gauge(
-            name=MetricName.TASK_POLL_TIME,
-            documentation=MetricDocumentation.TASK_POLL_TIME,
-            labels={
-                MetricLabel.TASK_TYPE: task_type
-            },
-            value=time_spent
-        )
+        self.__record_histogram(_TASK_POLL_TIME_KEYS[task_type], time_spent)
 
     def record_task_execute_time(self, task_type: str, time_spent: float) -> None:
-        self.__record_gauge(
-            name=MetricName.TASK_EXECUTE_TIME,
-            documentation=MetricDocumentation.TASK_EXECUTE_TIME,
-            labels={
-                MetricLabel.TASK_TYPE: task_type
-            },
-            value=time_spent
-        )
+        self.__record_histogram(_TASK_EXECUTE_TIME_KEYS[task_type], time_spent)
 
-    def __increment_counter(
-        self,
-        name: MetricName,
-        documentation: MetricDocumentation,
-        labels: Dict[MetricLabel, str]
-    ) -> None:
+    def record_task_update_time(self, task_type: str, time_spent: float) -> None:
+        self.__record_histogram(_TASK_UPDATE_TIME_KEYS[task_type], time_spent)
+
+    def record_task_queue_wait_time(self, task_type: str, time_spent: float) -> None:
+        self.__record_histogram(_TASK_QUEUE_WAIT_TIME_KEYS[task_type], time_spent)
+
+    def record_task_queue_to_completion_time(self, task_type: str, time_spent: float) -> None:
+        self.__record_histogram(_TASK_QUEUE_TO_COMPLETION_TIME_KEYS[task_type], time_spent)
+
+    def __get_exception_label(self, name: MetricName, exception: Any) -> str:
+        """Class name of the exception, or other unless it is among the `max_exception_labels` most frequent ones"""
+        if not self.must_collect_metrics:
+            return None
+        if isinstance(exception, type):
+            class_name = exception.__name__
+        else:
+            class_name = type(exception).__name__
+        exception_labels = self.exception_labels.get(name)
+        if exception_labels is None:
+            exception_labels = self.exception_labels[name] = _ExceptionLabels(self.max_exception_labels)
+        label = exception_labels.get_label(class_name)
+        if label == OTHER_EXCEPTION_LABEL:
+            self.__increment_counter(_METRIC_LABEL_DROPPED_KEYS[name.value])
+        return label
+
+    def __increment_counter(self, key: tuple) -> None:
+        if not self.must_collect_metrics:
+            return
+        if self.aggregator is not None:
+            self.aggregator.increment(key)
+            return
+        self.__get_labeled_counter(key).inc()
+
+    def __record_gauge(self, key: tuple, value: Any) -> None:
+        if not self.must_collect_metrics:
+            return
+        if self.aggregator is not None:
+            self.aggregator.set(key, value)
+            return
+        self.__get_labeled_gauge(key).set(value)
+
+    def __record_histogram(self, key: tuple, value: float) -> None:
         if not self.must_collect_metrics:
             return
+        if self.aggregator is not None:
+            self.aggregator.observe(key, value)
+            return
+        self.__get_labeled_histogram(key).observe(value)
+
+    def __write_aggregated_metrics(
+        self,
+        counters: Dict[tuple, float],
+        gauges: Dict[tuple, Any],
+        observations: Dict[tuple, List[float]]
+    ) -> None:
+        for key, amount in counters.items():
+            self.__get_labeled_counter(key).inc(amount)
+        for key, value in gauges.items():
+            self.__get_labeled_gauge(key).set(value)
+        for key, values in observations.items():
+            histogram = self.__get_labeled_histogram(key)
+            for value in values:
+                histogram.observe(value)
+        flush_marker_path = os.path.join(os.environ['PROMETHEUS_MULTIPROC_DIR'], FLUSH_MARKER_FILE_NAME)
+        with open(flush_marker_path, 'a'):
+            os.utime(flush_marker_path)
+
+    def __get_labeled_counter(self, key: tuple) -> Counter:
+        name, documentation, labels = key
         counter = self.__get_counter(
             name=name,
             documentation=documentation,
-            labelnames=labels.keys()
+            labelnames=[label for label, _ in labels]
         )
-        counter.labels(*labels.values()).inc()
+        return counter.labels(*[label_value for _, label_value in labels])
 
-    def __record_gauge(
-        self,
-        name: MetricName,
-        documentation: MetricDocumentation,
-        labels: Dict[MetricLabel, str],
-        value: Any
-    ) -> None:
-        if not self.must_collect_metrics:
-            return
+    def __get_labeled_gauge(self, key: tuple) -> Gauge:
+        name, documentation, labels = key
         gauge = self.__get_gauge(
             name=name,
             documentation=documentation,
-            labelnames=labels.keys()
+            labelnames=[label for label, _ in labels]
+        )
+        return gauge.labels(*[label_value for _, label_value in labels])
+
+    def __get_labeled_histogram(self, key: tuple) -> Histogram:
+        name, documentation, labels = key
+        histogram = self.__get_histogram(
+            name=name,
+            documentation=documentation,
+            labelnames=[label for label, _ in labels]
         )
-        gauge.labels(*labels.values()).set(value)
+        return histogram.labels(*[label_value for _, label_value in labels])
 
     def __get_counter(
         self,
@@ -249,6 +443,18 @@ class MetricsCollector:
             )
         return self.gauges[name]
 
+    def __get_histogram(
+        self,
+        name: MetricName,
+        documentation: MetricDocumentation,
+        labelnames: List[MetricLabel]
+    ) -> Histogram:
+        if name not in self.histograms:
+            self.histograms[name] = self.__generate_histogram(
+                name, documentation, labelnames
+            )
+        return self.histograms[name]
+
     def __generate_counter(
         self,
         name: MetricName,
@@ -274,3 +480,26 @@ class MetricsCollector:
             labelnames=labelnames,
             registry=self.registry
         )
+
+    def __generate_histogram(
+        self,
+        name: MetricName,
+        documentation: MetricDocumentation,
+        labelnames: List[MetricLabel]
+    ) -> Histogram:
+        return Histogram(
+            name=name,
+            documentation=documentation,
+            labelnames=labelnames,
+            buckets=self.latency_buckets,
+            registry=self.registry
+        )
+
+
+def _get_modification_time(path: str) -> int:
+    if path is None:
+        return None
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
@@ -0,0 +1,139 @@
+from conductor.client.configuration.configuration import Configuration
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from prometheus_client import CONTENT_TYPE_LATEST
+from prometheus_client import CollectorRegistry
+from prometheus_client import generate_latest
+from prometheus_client.multiprocess import MultiProcessCollector
+from typing import Any, Dict, List, Tuple
+from urllib.parse import urlparse
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger(
+    Configuration.get_logging_formatted_name(
+        __name__
+    )
+)
+
+METRICS_PATH = '/metrics'
+HEALTH_PATH = '/health'
+
+
+class MetricsServer:
+    """Serves the metrics of every worker process over HTTP.
+
+    `GET /metrics` collects the Prometheus multiprocess files of `directory`
+    on each request, so nothing is computed unless metrics are scraped.
+    `GET /health` reports whether each task runner process, given as
+    `(task_type, pid)` pairs, is still running, with status 503 when any of
+    them is not.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        port: int = 0,
+        address: str = '0.0.0.0',
+        task_runner_processes: List[Tuple[str, int]] = None,
+    ):
+        self.directory = directory
+        self.task_runner_processes = task_runner_processes or []
+        self._server = ThreadingHTTPServer((address, port), _get_request_handler(self))
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def start(self) -> 'MetricsServer':
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        logger.debug(f'Started metrics server on port {self.port}')
+        return self
+
+    def serve_forever(self) -> None:
+        logger.debug(f'Serving metrics on port {self.port}')
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> 'MetricsServer':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+    def get_metrics(self) -> bytes:
+        registry = CollectorRegistry()
+        MultiProcessCollector(registry, path=self.directory)
+        return generate_latest(registry)
+
+    def get_health(self) -> Dict[str, Any]:
+        processes = [
+            {
+                'taskType': task_type,
+                'pid': pid,
+                'alive': is_process_alive(pid),
+            }
+            for task_type, pid in self.task_runner_processes
+        ]
+        healthy = all(process['alive'] for process in processes)
+        return {
+            'status': 'UP' if healthy else 'DOWN',
+            'processes': processes,
+        }
+
+
+def is_process_alive(pid: int) -> bool:
+    if pid is None:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    # Exited processes not yet reaped by their parent still accept signals
+    try:
+        with open(f'/proc/{pid}/stat', 'r') as file:
+            state = file.read().rsplit(')', 1)[1].split()[0]
+        return state not in ('Z', 'X')
+    except (OSError, IndexError):
+        return True
+
+
+def _get_request_handler(server: MetricsServer) -> type:
+    class RequestHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = urlparse(self.path).path
+            try:
+                if path == METRICS_PATH:
+                    self.__respond(200, CONTENT_TYPE_LATEST, server.get_metrics())
+                elif path == HEALTH_PATH:
+                    health = server.get_health()
+                    status = 200 if health['status'] == 'UP' else 503
+                    self.__respond(status, 'application/json', json.dumps(health).encode('utf-8'))
+                else:
+                    self.__respond(404, 'text/plain', b'Not found')
+            except Exception as e:
+                logger.warning(f'Failed to serve {path}, reason: {e}')
+                self.__respond(500, 'text/plain', str(e).encode('utf-8'))
+
+        def __respond(self, status: int, content_type: str, data: bytes) -> None:
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format: str, *args) -> None:
+            logger.debug(format % args)
+
+    return RequestHandler
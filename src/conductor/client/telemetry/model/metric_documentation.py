@@ -2,7 +2,11 @@ from enum import Enum
 
 
 class MetricDocumentation(str, Enum):
+    CACHE_EVICTION = "Incremented each time an entry is evicted from a client side cache"
+    CACHE_HIT = "Incremented each time a value is served from a client side cache"
+    CACHE_MISS = "Incremented each time a value is not found in a client side cache"
     EXTERNAL_PAYLOAD_USED = "Incremented each time external payload storage is used"
+    METRIC_LABEL_DROPPED = "Incremented each time a label value is replaced by other to bound the number of series"
     TASK_ACK_ERROR = "Task ack has encountered an exception"
     TASK_ACK_FAILED = "Task ack failed"
     TASK_EXECUTE_ERROR = "Execution error"
@@ -12,8 +16,12 @@ class MetricDocumentation(str, Enum):
     TASK_POLL = "Incremented each time polling is done"
     TASK_POLL_ERROR = "Client error when polling for a task queue"
     TASK_POLL_TIME = "Time to poll for a batch of tasks"
+    TASK_QUEUE_TO_COMPLETION_TIME = "Time from when a task was scheduled by the server until its result was updated"
+    TASK_QUEUE_WAIT_TIME = "Time a task waited in the queue before being polled"
     TASK_RESULT_SIZE = "Records output payload size of a task"
+    TASK_SLOW = "Incremented each time a task execution runs for longer than the slow task threshold"
     TASK_UPDATE_ERROR = "Task status cannot be updated back to server"
+    TASK_UPDATE_TIME = "Time to update a task result back to server"
     THREAD_UNCAUGHT_EXCEPTION = "thread_uncaught_exceptions"
     WORKFLOW_START_ERROR = "Counter for workflow start errors"
     WORKFLOW_INPUT_SIZE = "Records input payload size of a workflow"
@@ -2,8 +2,10 @@ from enum import Enum
 
 
 class MetricLabel(str, Enum):
+    CACHE_NAME = "cacheName"
     ENTITY_NAME = "entityName"
     EXCEPTION = "exception"
+    METRIC_NAME = "metricName"
     OPERATION = "operation"
     PAYLOAD_TYPE = "payload_type"
     TASK_TYPE = "taskType"
@@ -2,7 +2,11 @@ from enum import Enum
 
 
 class MetricName(str, Enum):
+    CACHE_EVICTION = "cache_eviction"
+    CACHE_HIT = "cache_hit"
+    CACHE_MISS = "cache_miss"
     EXTERNAL_PAYLOAD_USED = "external_payload_used"
+    METRIC_LABEL_DROPPED = "metric_label_dropped"
     TASK_ACK_ERROR = "task_ack_error"
     TASK_ACK_FAILED = "task_ack_failed"
     TASK_EXECUTE_ERROR = "task_execute_error"
@@ -12,8 +16,12 @@ class MetricName(str, Enum):
     TASK_POLL = "task_poll"
     TASK_POLL_ERROR = "task_poll_error"
     TASK_POLL_TIME = "task_poll_time"
+    TASK_QUEUE_TO_COMPLETION_TIME = "task_queue_to_completion_time"
+    TASK_QUEUE_WAIT_TIME = "task_queue_wait_time"
     TASK_RESULT_SIZE = "task_result_size"
+    TASK_SLOW = "task_slow"
     TASK_UPDATE_ERROR = "task_update_error"
+    TASK_UPDATE_TIME = "task_update_time"
     THREAD_UNCAUGHT_EXCEPTION = "thread_uncaught_exceptions"
     WORKFLOW_INPUT_SIZE = "workflow_input_size"
     WORKFLOW_START_ERROR = "workflow_start_error"
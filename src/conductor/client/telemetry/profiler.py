@@ -0,0 +1,140 @@
+from conductor.client.configuration.configuration import Configuration
+from conductor.client.helpers.context import nullcontext
+from conductor.client.helpers.fork import register_after_fork_in_child
+from contextlib import contextmanager
+from typing import ContextManager, Dict, Iterator, List
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+
+logger = logging.getLogger(
+    Configuration.get_logging_formatted_name(
+        __name__
+    )
+)
+
+
+class SamplingProfiler:
+    """Samples the stacks of threads executing tasks, by task type.
+
+    `TaskRunner` wraps every `worker.execute` call in `profile`, while a
+    daemon thread samples the stacks of the threads in it every
+    `sampling_interval` seconds, so the overhead is bounded by the sampling
+    rate and nothing is sampled between tasks. Every `dump_interval`
+    seconds, the samples are written to `directory` as collapsed stacks,
+    `<task_type>.<pid>.collapsed`, one `frame;frame;frame count` line per
+    stack, ready for flamegraph tools. Only `task_types` are profiled, when
+    given.
+
+    Set an instance as `Configuration.profiler` to profile task runners.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        sampling_interval: float = 0.01,
+        dump_interval: float = 60,
+        task_types: List[str] = None,
+    ):
+        self.directory = directory
+        self.sampling_interval = sampling_interval
+        self.dump_interval = dump_interval
+        self.task_types = task_types
+        self.__reset()
+        register_after_fork_in_child(self.__reset)
+
+    def profile(self, task_type: str) -> ContextManager:
+        if self.task_types is not None and task_type not in self.task_types:
+            return nullcontext()
+        return self.__profile(task_type)
+
+    def get_samples(self, task_type: str) -> Dict[str, int]:
+        """Number of samples of each collapsed stack of the task type"""
+        with self._lock:
+            return dict(self._samples.get(task_type, {}))
+
+    def dump(self) -> None:
+        with self._lock:
+            samples = {task_type: dict(stacks) for task_type, stacks in self._samples.items()}
+        os.makedirs(self.directory, exist_ok=True)
+        for task_type, stacks in samples.items():
+            file_path = os.path.join(self.directory, f'{task_type}.{os.getpid()}.collapsed')
+            temporary_file_path = f'{file_path}.tmp'
+            with open(temporary_file_path, 'w') as file:
+                for stack, count in stacks.items():
+                    file.write(f'{stack} {count}\n')
+            os.replace(temporary_file_path, file_path)
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._sampling_thread is not None:
+            self._sampling_thread.join()
+        self.dump()
+
+    @contextmanager
+    def __profile(self, task_type: str) -> Iterator[None]:
+        thread_id = threading.get_ident()
+        if self._sampling_thread is None:
+            self.__start_sampling_thread()
+        self._profiled_threads[thread_id] = task_type
+        try:
+            yield
+        finally:
+            self._profiled_threads.pop(thread_id, None)
+
+    def __start_sampling_thread(self) -> None:
+        with self._lock:
+            if self._sampling_thread is not None:
+                return
+            self._sampling_thread = threading.Thread(
+                target=self.__sample_periodically, name='SamplingProfiler', daemon=True
+            )
+            self._sampling_thread.start()
+
+    def __sample_periodically(self) -> None:
+        last_dump_time = time.monotonic()
+        while not self._stopped.wait(self.sampling_interval):
+            try:
+                self.__sample()
+                if time.monotonic() - last_dump_time >= self.dump_interval:
+                    self.dump()
+                    last_dump_time = time.monotonic()
+            except Exception:
+                logger.warning(f'Failed to sample task stacks, reason: {traceback.format_exc()}')
+
+    def __sample(self) -> None:
+        profiled_threads = list(self._profiled_threads.items())
+        if len(profiled_threads) == 0:
+            return
+        frames = sys._current_frames()
+        with self._lock:
+            for thread_id, task_type in profiled_threads:
+                frame = frames.get(thread_id)
+                if frame is None:
+                    continue
+                stacks = self._samples.setdefault(task_type, {})
+                stack = _get_collapsed_stack(frame)
+                stacks[stack] = stacks.get(stack, 0) + 1
+
+    def __reset(self) -> None:
+        # A forked child has no sampling thread yet, and must not dump the samples of its parent
+        # in a file named after its own pid
+        self._lock = threading.Lock()
+        self._profiled_threads = {}
+        self._samples = {}
+        self._sampling_thread = None
+        self._stopped = threading.Event()
+
+
+def _get_collapsed_stack(frame) -> str:
+    names = []
+    while frame is not None:
+        module = frame.f_globals.get('__name__', '?')
+        names.append(f'{module}:{frame.f_code.co_name}'.replace(';', ':').replace(' ', '_'))
+        frame = frame.f_back
+    names.reverse()
+    return ';'.join(names)
+
@@ -0,0 +1,156 @@
+from collections import deque
+from conductor.client.configuration.configuration import Configuration
+from conductor.client.helpers.fork import register_after_fork_in_child
+from conductor.client.http.models.task import Task
+from conductor.client.telemetry.metrics_collector import MetricsCollector
+from contextlib import contextmanager
+from typing import Iterator
+import logging
+import statistics
+import sys
+import threading
+import time
+import traceback
+
+logger = logging.getLogger(
+    Configuration.get_logging_formatted_name(
+        __name__
+    )
+)
+
+
+class _Execution:
+    __slots__ = ('task_type', 'task_id', 'workflow_instance_id', 'thread_id', 'start_time', 'metrics_collector', 'reported')
+
+    def __init__(self, task_type: str, task: Task, metrics_collector: MetricsCollector):
+        self.task_type = task_type
+        self.task_id = task.task_id
+        self.workflow_instance_id = task.workflow_instance_id
+        self.thread_id = threading.get_ident()
+        self.start_time = time.monotonic()
+        self.metrics_collector = metrics_collector
+        self.reported = False
+
+
+class SlowTaskWatchdog:
+    """Reports task executions that run for much longer than usual.
+
+    `TaskRunner` wraps every `worker.execute` call in `watch`. Every
+    `check_interval` seconds a daemon thread checks the executions in
+    flight, and reports, once, those running for longer than `multiplier`
+    times the median duration of the last `window_size` executions of their
+    task type, or than `threshold_seconds`. Durations are only compared to
+    the median once `min_samples` executions completed. A report logs the
+    stack of the thread executing the task, with its task id and workflow
+    instance id, and increments the `task_slow` metric.
+
+    Set an instance as `Configuration.slow_task_watchdog` to watch task
+    runners.
+    """
+
+    def __init__(
+        self,
+        multiplier: float = 10,
+        threshold_seconds: float = None,
+        check_interval: float = 1,
+        window_size: int = 100,
+        min_samples: int = 20,
+    ):
+        self.multiplier = multiplier
+        self.threshold_seconds = threshold_seconds
+        self.check_interval = check_interval
+        self.window_size = window_size
+        self.min_samples = min_samples
+        self.__reset()
+        register_after_fork_in_child(self.__reset)
+
+    @contextmanager
+    def watch(self, task_type: str, task: Task, metrics_collector: MetricsCollector = None) -> Iterator[None]:
+        if self._checking_thread is None:
+            self.__start_checking_thread()
+        execution = _Execution(task_type, task, metrics_collector)
+        with self._lock:
+            self._executions[id(execution)] = execution
+        try:
+            yield
+        finally:
+            time_spent = time.monotonic() - execution.start_time
+            with self._lock:
+                del self._executions[id(execution)]
+                self._durations.setdefault(task_type, deque(maxlen=self.window_size)).append(time_spent)
+            if execution.reported:
+                logger.warning(
+                    f'Slow task completed after {time_spent:.3f}s, id: {execution.task_id}, '
+                    f'workflow_instance_id: {execution.workflow_instance_id}, task_definition_name: {task_type}'
+                )
+
+    def get_threshold(self, task_type: str) -> float:
+        """Seconds after which an execution of the task type is reported, None when not known yet"""
+        thresholds = []
+        if self.threshold_seconds is not None:
+            thresholds.append(self.threshold_seconds)
+        if self.multiplier is not None:
+            with self._lock:
+                durations = list(self._durations.get(task_type, ()))
+            if len(durations) >= self.min_samples:
+                thresholds.append(self.multiplier * statistics.median(durations))
+        if len(thresholds) == 0:
+            return None
+        return min(thresholds)
+
+    def check(self) -> None:
+        with self._lock:
+            executions = [execution for execution in self._executions.values() if not execution.reported]
+        if len(executions) == 0:
+            return
+        now = time.monotonic()
+        frames = None
+        for execution in executions:
+            threshold = self.get_threshold(execution.task_type)
+            time_spent = now - execution.start_time
+            if threshold is None or time_spent <= threshold:
+                continue
+            if frames is None:
+                frames = sys._current_frames()
+            execution.reported = True
+            self.__report(execution, time_spent, threshold, frames.get(execution.thread_id))
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._checking_thread is not None:
+            self._checking_thread.join()
+
+    def __report(self, execution: _Execution, time_spent: float, threshold: float, frame) -> None:
+        stack = ''.join(traceback.format_stack(frame)) if frame is not None else 'unavailable'
+        logger.warning(
+            f'Slow task running for {time_spent:.3f}s, over {threshold:.3f}s, id: {execution.task_id}, '
+            f'workflow_instance_id: {execution.workflow_instance_id}, task_definition_name: {execution.task_type}, '
+            f'stack:\n{stack}'
+        )
+        if execution.metrics_collector is not None:
+            execution.metrics_collector.increment_task_slow(execution.task_type)
+
+    def __start_checking_thread(self) -> None:
+        with self._lock:
+            if self._checking_thread is not None:
+                return
+            self._checking_thread = threading.Thread(
+                target=self.__check_periodically, name='SlowTaskWatchdog', daemon=True
+            )
+            self._checking_thread.start()
+
+    def __check_periodically(self) -> None:
+        while not self._stopped.wait(self.check_interval):
+            try:
+                self.check()
+            except Exception:
+                logger.warning(f'Failed to check for slow tasks, reason: {traceback.format_exc()}')
+
+    def __reset(self) -> None:
+        # A forked child starts without the checking thread of its parent, and must not report
+        # the executions its parent was running, nor wait on a lock a parent thread held
+        self._lock = threading.Lock()
+        self._executions = {}
+        self._durations = {}
+        self._checking_thread = None
+        self._stopped = threading.Event()
@@ -0,0 +1,216 @@
+from conductor.client.configuration.configuration import Configuration
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List
+import abc
+import atexit
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import traceback
+import uuid
+import weakref
+
+logger = logging.getLogger(
+    Configuration.get_logging_formatted_name(
+        __name__
+    )
+)
+
+_current_span = ContextVar('conductor_current_span', default=None)
+
+
+class Span:
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        span_id: str,
+        parent_span_id: str = None,
+        attributes: Dict[str, Any] = None,
+    ):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_span_id = parent_span_id
+        self.attributes = dict(attributes or {})
+        self.start_time_ns = time.time_ns()
+        self.end_time_ns = None
+        self.error = None
+
+    @property
+    def duration_seconds(self) -> float:
+        if self.end_time_ns is None:
+            return None
+        return (self.end_time_ns - self.start_time_ns) / 1e9
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_error(self, exception: BaseException) -> None:
+        self.error = f'{type(exception).__name__}: {exception}'
+
+    def end(self) -> None:
+        if self.end_time_ns is None:
+            self.end_time_ns = time.time_ns()
+
+    def get_traceparent(self) -> str:
+        """W3C trace context header value, to propagate the span to the server"""
+        return f'00-{self.trace_id}-{self.span_id}-01'
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'parentSpanId': self.parent_span_id,
+            'startTimeUnixNano': self.start_time_ns,
+            'endTimeUnixNano': self.end_time_ns,
+            'attributes': self.attributes,
+            'error': self.error,
+        }
+
+
+class SpanExporter(abc.ABC):
+    @abc.abstractmethod
+    def export(self, spans: List[Span]) -> None:
+        """
+        Sends ended spans to their destination.
+
+        :param spans: List[Span]
+        """
+        pass
+
+    def close(self) -> None:
+        """Sends the spans still held by the exporter and releases its resources"""
+        pass
+
+    def __enter__(self) -> 'SpanExporter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback) -> None:
+        self.close()
+
+
+class FileSpanExporter(SpanExporter):
+    """Appends spans to a file, one JSON object per line.
+
+    Exported spans are only queued in memory. A daemon thread serializes them
+    every `flush_interval` seconds and appends each batch with a single write
+    on a file opened in append mode, so task runner processes can share the
+    same file. Call `close`, or use the exporter as a context manager, to
+    write the pending spans and close the file; spans still pending when the
+    process exits are written too.
+    """
+
+    def __init__(self, file_path: str, flush_interval: float = 1):
+        self.file_path = file_path
+        self.flush_interval = flush_interval
+        # Guards the pending spans, `_write_lock` the file
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._pending = []
+        self._file = None
+        self._pid = None
+        self._closed = threading.Event()
+        reference = weakref.ref(self)
+        atexit.register(lambda: reference() and reference().close())
+
+    def export(self, spans: List[Span]) -> None:
+        with self._lock:
+            if self._closed.is_set():
+                raise Exception('span exporter is closed')
+            if self._pid != os.getpid():
+                self.__start()
+            self._pending.extend(spans)
+
+    def flush(self) -> None:
+        """Writes every span exported so far"""
+        with self._write_lock:
+            with self._lock:
+                if self._pid != os.getpid():
+                    return
+                spans, self._pending = self._pending, []
+            if len(spans) == 0:
+                return
+            data = ''.join(json.dumps(span.to_dict()) + '\n' for span in spans)
+            if self._file is None:
+                self._file = open(self.file_path, 'ab', buffering=0)
+            self._file.write(data.encode('utf-8'))
+
+    def close(self) -> None:
+        self._closed.set()
+        self.flush()
+        with self._write_lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __start(self) -> None:
+        # Spans, file and flush thread inherited from a parent process belong to the parent
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._pending = []
+        self._pid = os.getpid()
+        threading.Thread(target=self.__flush_periodically, name='FileSpanExporterFlush', daemon=True).start()
+
+    def __flush_periodically(self) -> None:
+        while not self._closed.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                logger.warning(f'Failed to write spans to {self.file_path}, reason: {traceback.format_exc()}')
+
+
+class Tracer:
+    """Creates spans and hands them to `exporter` when they end.
+
+    Spans started while another span is current, in the same thread or
+    coroutine, become its children. Set an instance as
+    `Configuration.tracer` to trace `TaskRunner` and `ApiClient`.
+    """
+
+    def __init__(self, exporter: SpanExporter):
+        self.exporter = exporter
+
+    @contextmanager
+    def start_span(self, name: str, attributes: Dict[str, Any] = None, trace_id: str = None) -> Iterator[Span]:
+        parent = _current_span.get()
+        parent_span_id = None
+        if trace_id is None:
+            trace_id = parent.trace_id if parent is not None else uuid.uuid4().hex
+        if parent is not None and parent.trace_id == trace_id:
+            parent_span_id = parent.span_id
+        span = Span(name, trace_id, uuid.uuid4().hex[:16], parent_span_id, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set_error(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+            self.__export(span)
+
+    def __export(self, span: Span) -> None:
+        try:
+            self.exporter.export([span])
+        except Exception:
+            logger.warning(f'Failed to export span: {span.name}, reason: {traceback.format_exc()}')
+
+
+def get_current_span() -> Span:
+    return _current_span.get()
+
+
+def get_trace_id(workflow_instance_id: str) -> str:
+    """Trace id shared by the spans of every task of a workflow, on any worker"""
+    try:
+        return uuid.UUID(workflow_instance_id).hex
+    except (TypeError, ValueError, AttributeError):
+        return hashlib.md5(str(workflow_instance_id).encode('utf-8')).hexdigest()
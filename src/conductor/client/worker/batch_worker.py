@@ -0,0 +1,84 @@
+from conductor.client.http.models.task import Task
+from conductor.client.http.models.task_result import TaskResult
+from conductor.client.http.models.task_result_status import TaskResultStatus
+from conductor.client.worker.batch_worker_interface import BatchWorkerInterface
+from conductor.client.worker.result_cache import ResultCache, get_result_cache
+from typing import Any, Callable, Dict, List, Union
+from typing_extensions import Self
+
+ExecuteBatchFunction = Callable[
+    [
+        List[Task]
+    ],
+    List[Union[TaskResult, object]]
+]
+
+
+class BatchWorker(BatchWorkerInterface):
+    """Batch worker executing tasks with a function.
+
+    The function takes the list of tasks and returns one item per task, in
+    the same order: either a `TaskResult`, or the output of a completed task.
+    """
+
+    def __init__(self,
+                 task_definition_name: str,
+                 execute_batch_function: ExecuteBatchFunction,
+                 batch_size: int = 64,
+                 batch_wait_seconds: float = 0.1,
+                 poll_interval: float = None,
+                 domain: str = None,
+                 worker_id: str = None,
+                 cache: Union[ResultCache, bool, Dict[str, Any]] = None,
+                 ) -> Self:
+        super().__init__(task_definition_name)
+        if not isinstance(batch_size, int) or batch_size <= 0:
+            raise Exception('invalid batch size')
+        self.execute_batch_function = execute_batch_function
+        self.batch_size = batch_size
+        self.batch_wait_seconds = batch_wait_seconds
+        if poll_interval is None:
+            self.poll_interval = super().get_polling_interval_in_seconds()
+        else:
+            self.poll_interval = poll_interval
+        self.domain = domain
+        if worker_id is None:
+            self.worker_id = super().get_identity()
+        else:
+            self.worker_id = worker_id
+        self.result_cache = get_result_cache(cache)
+
+    def execute_batch(self, tasks: List[Task]) -> List[TaskResult]:
+        outputs = self.execute_batch_function(tasks)
+        if len(outputs) != len(tasks):
+            raise Exception(f'invalid batch output, expected {len(tasks)} items, got {len(outputs)}')
+        task_results = []
+        for task, output in zip(tasks, outputs):
+            if isinstance(output, TaskResult):
+                task_result = output
+                task_result.task_id = task.task_id
+                task_result.workflow_instance_id = task.workflow_instance_id
+            else:
+                task_result = self.get_task_result_from_task(task)
+                task_result.status = TaskResultStatus.COMPLETED
+                task_result.output_data = output
+            task_results.append(task_result)
+        return task_results
+
+    def get_batch_size(self) -> int:
+        return self.batch_size
+
+    def get_batch_wait_seconds(self) -> float:
+        return self.batch_wait_seconds
+
+    def get_identity(self) -> str:
+        return self.worker_id
+
+    def get_polling_interval_in_seconds(self) -> float:
+        return self.poll_interval
+
+    def get_domain(self) -> str:
+        return self.domain
+
+    def get_result_cache(self) -> ResultCache:
+        return self.result_cache
@@ -0,0 +1,52 @@
+from conductor.client.http.models.task import Task
+from conductor.client.http.models.task_result import TaskResult
+from conductor.client.worker.worker_interface import WorkerInterface
+from typing import List
+import abc
+
+
+class BatchWorkerInterface(WorkerInterface):
+    """Worker executing tasks in batches, e.g. to vectorize their processing.
+
+    `TaskRunner` polls tasks until it has `get_batch_size` of them, or until
+    `get_batch_wait_seconds` elapsed since it started polling, executes them
+    together with `execute_batch`, and reports the result of each task.
+    """
+
+    @abc.abstractmethod
+    def execute_batch(self, tasks: List[Task]) -> List[TaskResult]:
+        """
+        Executes tasks together and returns their results.
+
+        :param tasks: (required)
+        :return: List[TaskResult]
+                 One result per task, in the order of the tasks.
+        """
+        pass
+
+    def execute(self, task: Task) -> TaskResult:
+        """
+        Executes a single task as a batch of one.
+
+        :param Task: (required)
+        :return: TaskResult
+        """
+        return self.execute_batch([task])[0]
+
+    def get_batch_size(self) -> int:
+        """
+        Retrieve the maximum number of tasks executed together.
+
+        :return: int
+                 Default: 64
+        """
+        return 64
+
+    def get_batch_wait_seconds(self) -> float:
+        """
+        Retrieve the maximum time spent polling tasks for a batch, which bounds the latency added to the first task.
+
+        :return: float
+                 Default: 100ms
+        """
+        return 0.1
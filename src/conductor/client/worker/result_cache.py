@@ -0,0 +1,175 @@
+from conductor.client.cache.ttl_lru_cache import TtlLruCache
+from conductor.client.configuration.configuration import Configuration
+from typing import Any, Dict, Union
+import abc
+import hashlib
+import json
+import logging
+import os
+import threading
+import traceback
+
+logger = logging.getLogger(
+    Configuration.get_logging_formatted_name(
+        __name__
+    )
+)
+
+CACHE_NAME_PREFIX = 'result:'
+
+
+class ResultCache(abc.ABC):
+    """Store of the serialized outputs of workers, by content hash of their input"""
+
+    @abc.abstractmethod
+    def get(self, key: str) -> bytes:
+        """
+        Retrieve the output cached for a key.
+
+        :param key: (required)
+        :return: bytes
+                 The JSON output, None when it is not cached.
+        """
+        pass
+
+    @abc.abstractmethod
+    def put(self, key: str, output: bytes) -> int:
+        """
+        Cache the output for a key.
+
+        :param key: (required)
+        :param output: The JSON output (required)
+        :return: int
+                 The number of outputs evicted to make room for it.
+        """
+        pass
+
+
+class MemoryResultCache(ResultCache):
+    """Keeps up to `max_size` outputs in memory, for `ttl_seconds` if given, evicting the least recently used"""
+
+    def __init__(self, max_size: int = 1000, ttl_seconds: float = None):
+        self.cache = TtlLruCache(max_size, ttl_seconds)
+
+    def get(self, key: str) -> bytes:
+        return self.cache.get(key)
+
+    def put(self, key: str, output: bytes) -> int:
+        evictions = self.cache.evictions
+        self.cache.put(key, output)
+        return self.cache.evictions - evictions
+
+
+class DiskResultCache(ResultCache):
+    """Keeps outputs as files in `directory`, up to `max_size_bytes` in total.
+
+    Files are shared by every process using the directory, and survive
+    restarts. Reading an output marks it as recently used, and when the
+    files grow over `max_size_bytes`, the least recently used ones are
+    removed until they take up a tenth less.
+    """
+
+    def __init__(self, directory: str, max_size_bytes: int = 256 * 1024 * 1024):
+        if not isinstance(max_size_bytes, int) or max_size_bytes <= 0:
+            raise Exception('invalid cache size')
+        self.directory = directory
+        self.max_size_bytes = max_size_bytes
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        self._lock = threading.Lock()
+        self._size_bytes = self.__get_size_bytes()
+
+    def get(self, key: str) -> bytes:
+        file_path = self.__get_file_path(key)
+        try:
+            with open(file_path, 'rb') as file:
+                output = file.read()
+            os.utime(file_path)
+            return output
+        except FileNotFoundError:
+            return None
+        except Exception:
+            logger.warning(f'Failed to read cached output {file_path}, reason: {traceback.format_exc()}')
+            return None
+
+    def put(self, key: str, output: bytes) -> int:
+        file_path = self.__get_file_path(key)
+        try:
+            temporary_file_path = f'{file_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+            with open(temporary_file_path, 'wb') as file:
+                file.write(output)
+            os.replace(temporary_file_path, file_path)
+        except Exception:
+            logger.warning(f'Failed to write cached output {file_path}, reason: {traceback.format_exc()}')
+            return 0
+        with self._lock:
+            self._size_bytes += len(output)
+            if self._size_bytes <= self.max_size_bytes:
+                return 0
+            return self.__evict()
+
+    def __evict(self) -> int:
+        # Other processes write to the directory too, so it is measured again
+        files = []
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith('.json'):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+        files.sort()
+        self._size_bytes = sum(size for _, size, _ in files)
+        target_size_bytes = self.max_size_bytes * 0.9
+        evictions = 0
+        for _, size, file_path in files:
+            if self._size_bytes <= target_size_bytes:
+                break
+            try:
+                os.remove(file_path)
+                evictions += 1
+            except FileNotFoundError:
+                pass
+            self._size_bytes -= size
+        return evictions
+
+    def __get_size_bytes(self) -> int:
+        size_bytes = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.json'):
+                size_bytes += entry.stat().st_size
+        return size_bytes
+
+    def __get_file_path(self, key: str) -> str:
+        return os.path.join(self.directory, f'{key}.json')
+
+
+def get_result_cache(cache: Union[ResultCache, bool, Dict[str, Any]]) -> ResultCache:
+    """Result cache of a worker `cache` option.
+
+    Either a `ResultCache`, `True` for a default `MemoryResultCache`, or the
+    arguments of a `DiskResultCache` when they include `directory`, of a
+    `MemoryResultCache` otherwise, since annotated workers only take literals.
+    """
+    if cache is None or cache is False:
+        return None
+    if isinstance(cache, ResultCache):
+        return cache
+    if cache is True:
+        return MemoryResultCache()
+    if isinstance(cache, dict):
+        if 'directory' in cache:
+            return DiskResultCache(**cache)
+        return MemoryResultCache(**cache)
+    raise Exception('invalid result cache')
+
+
+def get_result_cache_key(task_definition_name: str, input_data: Any) -> str:
+    """Content hash of the canonical JSON of the input, None when it is not JSON serializable"""
+    try:
+        canonical_input = json.dumps(
+            input_data, sort_keys=True, separators=(',', ':'), ensure_ascii=False, allow_nan=False
+        )
+    except (TypeError, ValueError):
+        return None
+    return hashlib.sha256(f'{task_definition_name}\n{canonical_input}'.encode('utf-8')).hexdigest()
@@ -2,8 +2,9 @@ from copy import deepcopy
 from conductor.client.http.models.task import Task
 from conductor.client.http.models.task_result import TaskResult
 from conductor.client.http.models.task_result_status import TaskResultStatus
+from conductor.client.worker.result_cache import ResultCache, get_result_cache
 from conductor.client.worker.worker_interface import WorkerInterface
-from typing import Any, Callable, Union
+from typing import Any, Callable, Dict, Union
 from typing_extensions import Self
 import inspect
 
@@ -35,6 +36,7 @@ class Worker(WorkerInterface):
                  poll_interval: float = None,
                  domain: str = None,
                  worker_id: str = None,
+                 cache: Union[ResultCache, bool, Dict[str, Any]] = None,
                  ) -> Self:
         super().__init__(task_definition_name)
         if poll_interval == None:
@@ -48,6 +50,7 @@ class Worker(WorkerInterface):
         else:
             self.worker_id = deepcopy(worker_id)
         self.execute_function = deepcopy(execute_function)
+        self.result_cache = get_result_cache(cache)
 
     def execute(self, task: Task) -> TaskResult:
         execute_function_input = None
@@ -76,6 +79,9 @@ class Worker(WorkerInterface):
     def get_domain(self) -> str:
         return self.domain
 
+    def get_result_cache(self) -> ResultCache:
+        return self.result_cache
+
     @property
     def execute_function(self) -> ExecuteTaskFunction:
         return self._execute_function
@@ -1,5 +1,6 @@
 from conductor.client.http.models.task import Task
 from conductor.client.http.models.task_result import TaskResult
+from conductor.client.worker.result_cache import ResultCache
 import abc
 import socket
 
@@ -65,6 +66,15 @@ class WorkerInterface(abc.ABC):
         """
         return None
 
+    def get_result_cache(self) -> ResultCache:
+        """
+        Override this method to memoize the outputs of a worker whose output only depends on its input.
+
+        :return: ResultCache
+                 Default: None, every task is executed
+        """
+        return None
+
     def paused(self) -> bool:
         """
         Override this method to pause the worker from polling.
@@ -1,13 +1,14 @@
-from typing import Callable, TypeVar
+from typing import Any, Callable, Dict, TypeVar, Union
 from conductor.client.worker.worker import ExecuteTaskFunction
 
 
 class WorkerTask(ExecuteTaskFunction):
-    def __init__(self, task_definition_name: str, domain: str = None, poll_interval_seconds: float = None, worker_id: str = None):
+    def __init__(self, task_definition_name: str, domain: str = None, poll_interval_seconds: float = None, worker_id: str = None, cache: Union[bool, Dict[str, Any]] = None):
         self.task_definition_name = task_definition_name
         self.domain = domain
         self.poll_interval = poll_interval_seconds
         self.worker_id = worker_id
+        self.cache = cache
 
     def __call__(self, *args, **kwargs):
         pass
@@ -3,11 +3,12 @@ from conductor.client.http.models.workflow_task import WorkflowTask
 from conductor.client.workflow.task.fork_task import ForkTask
 from conductor.client.workflow.task.join_task import JoinTask
 from conductor.client.workflow.executor.workflow_executor import WorkflowExecutor
-from conductor.client.workflow.task.task import TaskInterface
+from conductor.client.workflow.task.task import TaskInterface, freeze_tasks
 from conductor.client.workflow.task.timeout_policy import TimeoutPolicy
+from conductor.client.http import raw_json
 from conductor.client.http.models import *
 from copy import deepcopy
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Union
 from typing_extensions import Self
 from shortuuid import uuid
 
@@ -19,8 +20,15 @@ class ConductorWorkflow:
                  executor: WorkflowExecutor,
                  name: str,
                  version: int = None,
-                 description: str = None) -> Self:
+                 description: str = None,
+                 immutable: bool = False) -> Self:
+        # JSON of the compiled definition, sent by inline starts until the
+        # workflow changes
+        self._serialized_workflow_def = None
         self._executor = executor
+        # Tasks are copied when they are added, unless the workflow is
+        # immutable, in which case they are frozen and shared instead
+        self._immutable = immutable
         self.name = name
         self.version = version
         self.description = description
@@ -43,7 +51,8 @@ class ConductorWorkflow:
     def name(self, name: str) -> None:
         if not isinstance(name, str):
             raise Exception('invalid type')
-        self._name = deepcopy(name)
+        self._serialized_workflow_def = None
+        self._name = name
 
     @property
     def version(self) -> int:
@@ -53,7 +62,8 @@ class ConductorWorkflow:
     def version(self, version: int) -> None:
         if version != None and not isinstance(version, int):
             raise Exception('invalid type')
-        self._version = deepcopy(version)
+        self._serialized_workflow_def = None
+        self._version = version
 
     @property
     def description(self) -> str:
@@ -63,24 +73,28 @@ class ConductorWorkflow:
     def description(self, description: str) -> None:
         if description != None and not isinstance(description, str):
             raise Exception('invalid type')
-        self._description = deepcopy(description)
+        self._serialized_workflow_def = None
+        self._description = description
 
     def timeout_policy(self, timeout_policy: TimeoutPolicy) -> Self:
         if not isinstance(timeout_policy, TimeoutPolicy):
             raise Exception('invalid type')
-        self._timeout_policy = deepcopy(timeout_policy)
+        self._serialized_workflow_def = None
+        self._timeout_policy = timeout_policy
         return self
 
     def timeout_seconds(self, timeout_seconds: int) -> Self:
         if not isinstance(timeout_seconds, int):
             raise Exception('invalid type')
-        self._timeout_seconds = deepcopy(timeout_seconds)
+        self._serialized_workflow_def = None
+        self._timeout_seconds = timeout_seconds
         return self
 
     def owner_email(self, owner_email: str) -> Self:
         if not isinstance(owner_email, str):
             raise Exception('invalid type')
-        self._owner_email = deepcopy(owner_email)
+        self._serialized_workflow_def = None
+        self._owner_email = owner_email
         return self
 
     # Name of the workflow to execute when this workflow fails.
@@ -88,7 +102,8 @@ class ConductorWorkflow:
     def failure_workflow(self, failure_workflow: str) -> Self:
         if not isinstance(failure_workflow, str):
             raise Exception('invalid type')
-        self._failure_workflow = deepcopy(failure_workflow)
+        self._serialized_workflow_def = None
+        self._failure_workflow = failure_workflow
         return self
 
     # If the workflow can be restarted after it has reached terminal state.
@@ -96,13 +111,15 @@ class ConductorWorkflow:
     def restartable(self, restartable: bool) -> Self:
         if not isinstance(restartable, bool):
             raise Exception('invalid type')
-        self._restartable = deepcopy(restartable)
+        self._serialized_workflow_def = None
+        self._restartable = restartable
         return self
 
     # Workflow output follows similar structure as task input
     # See https://conductor.netflix.com/how-tos/Tasks/task-inputs.html for more details
     def output_parameters(self, output_parameters: Dict[str, Any]) -> Self:
         if output_parameters == None:
+            self._serialized_workflow_def = None
             self._output_parameters = {}
             return
         if not isinstance(output_parameters, dict):
@@ -110,12 +127,14 @@ class ConductorWorkflow:
         for key in output_parameters.keys():
             if not isinstance(key, str):
                 raise Exception('invalid type')
+        self._serialized_workflow_def = None
         self._output_parameters = deepcopy(output_parameters)
         return self
 
     # InputTemplate template input to the workflow.  Can have combination of variables (e.g. ${workflow.input.abc}) and static values
     def input_template(self, input_template: Dict[str, Any]) -> Self:
         if input_template == None:
+            self._serialized_workflow_def = None
             self._output_parameters = {}
             return
         if not isinstance(input_template, dict):
@@ -123,6 +142,7 @@ class ConductorWorkflow:
         for key in input_template.keys():
             if not isinstance(key, str):
                 raise Exception('invalid type')
+        self._serialized_workflow_def = None
         self._output_parameters = deepcopy(input_template)
         return self
 
@@ -130,6 +150,7 @@ class ConductorWorkflow:
     # e.g. Variables can maintain business/user specific states which can be queried and inspected to find out the state of the workflow
     def variables(self, variables: Dict[str, Any]) -> Self:
         if variables == None:
+            self._serialized_workflow_def = None
             self._output_parameters = {}
             return
         if not isinstance(variables, dict):
@@ -137,6 +158,7 @@ class ConductorWorkflow:
         for key in variables.keys():
             if not isinstance(key, str):
                 raise Exception('invalid type')
+        self._serialized_workflow_def = None
         self._output_parameters = deepcopy(variables)
         return self
 
@@ -147,31 +169,41 @@ class ConductorWorkflow:
         for input_parameter in input_parameters:
             if not isinstance(input_parameter, str):
                 raise Exception('invalid type')
+        self._serialized_workflow_def = None
         self._input_parameters = deepcopy(input_parameters)
         return self
 
     # Register the workflow definition with the server. If overwrite is set, the definition on the server will be
     # overwritten. When not set, the call fails if there is any change in the workflow definition between the server
     # and what is being registered.
-    def register(self, overwrite: bool):
+    # If skip_unchanged is set, the definition is compared with the server copy and only uploaded when it changed.
+    def register(self, overwrite: bool, skip_unchanged: bool = False):
         return self._executor.register_workflow(
             overwrite=overwrite,
             workflow=self.to_workflow_def(),
+            skip_unchanged=skip_unchanged,
         )
 
     # Executes the workflow inline without registering with the server.  Useful for one-off workflows that need not
     # be registered.
+    # The serialized definition is cached, so repeated starts of an unchanged workflow skip compiling and serializing
+    # it again. It is sent in place of `start_workflow_request.workflow_def`, which is left untouched.
     def start_workflow(self, start_workflow_request: StartWorkflowRequest):
-        start_workflow_request.workflow_def = self.to_workflow_def()
-        return self._executor.start_workflow(start_workflow_request)
+        return self._executor.start_workflow(
+            start_workflow_request,
+            serialized_workflow_def=self.__get_serialized_workflow_def(),
+        )
 
     # Converts the workflow to the JSON serializable format
     def to_workflow_def(self) -> WorkflowDef:
+        return self.__get_workflow_def([task.to_workflow_task() for task in self._tasks])
+
+    def __get_workflow_def(self, converted_tasks: List[Union[WorkflowTask, List[WorkflowTask]]]) -> WorkflowDef:
         return WorkflowDef(
             name=self._name,
             description=self._description,
             version=self._version,
-            tasks=self.__get_workflow_task_list(),
+            tasks=get_workflow_task_list(converted_tasks),
             input_parameters=self._input_parameters,
             output_parameters=self._output_parameters,
             failure_workflow=self._failure_workflow,
@@ -183,16 +215,15 @@ class ConductorWorkflow:
             input_template=self._input_template,
         )
 
-    def __get_workflow_task_list(self) -> List[WorkflowTask]:
-        workflow_task_list = []
-        for task in self._tasks:
-            converted_task = task.to_workflow_task()
-            if isinstance(converted_task, list):
-                for subtask in converted_task:
-                    workflow_task_list.append(subtask)
-            else:
-                workflow_task_list.append(converted_task)
-        return workflow_task_list
+    def __get_serialized_workflow_def(self) -> raw_json.RawJson:
+        if self._serialized_workflow_def is None:
+            # Tasks are frozen once added, so their memoized WorkflowTasks can be serialized without copying them
+            workflow_def = self.__get_workflow_def([task.to_cached_workflow_task() for task in self._tasks])
+            api_client = self._executor.workflow_client.api_client
+            self._serialized_workflow_def = raw_json.RawJson(raw_json.dumps(
+                api_client.sanitize_for_serialization(workflow_def)
+            ))
+        return self._serialized_workflow_def
 
     # Append task with the right shift operator `>>`
     def __rshift__(self, task: TaskInterface | List[TaskInterface] | List[List[TaskInterface]]) -> Self:
@@ -213,7 +244,11 @@ class ConductorWorkflow:
     def __add_task(self, task: TaskInterface) -> Self:
         if not issubclass(type(task), TaskInterface):
             raise Exception('invalid type')
-        self._tasks.append(deepcopy(task))
+        self._serialized_workflow_def = None
+        if not self._immutable:
+            # The copy belongs to the workflow alone, so freezing it lets it be compiled once
+            task = deepcopy(task)
+        self._tasks.append(task.freeze())
         return self
 
     def __add_fork_join_tasks(self, forked_tasks: List[List[TaskInterface]]) -> Self:
@@ -222,18 +257,34 @@ class ConductorWorkflow:
                 if not issubclass(type(task), TaskInterface):
                     raise Exception('invalid type')
 
+        if self._immutable:
+            for single_fork in forked_tasks:
+                freeze_tasks(single_fork)
+
         suffix = str(uuid())
 
         fork_task = ForkTask(
             task_ref_name='forked_' + suffix,
             forked_tasks=forked_tasks
-        )
+        ).freeze()
         
         join_task = JoinTask(
             task_ref_name='join_' + suffix,
-            join_on=fork_task.to_workflow_task().join_on
-        )
+            join_on=list(fork_task.to_cached_workflow_task().join_on)
+        ).freeze()
         
+        self._serialized_workflow_def = None
         self._tasks.append(fork_task)
         self._tasks.append(join_task)
         return self
+
+
+def get_workflow_task_list(converted_tasks: List[Union[WorkflowTask, List[WorkflowTask]]]) -> List[WorkflowTask]:
+    workflow_task_list = []
+    for converted_task in converted_tasks:
+        if isinstance(converted_task, list):
+            for subtask in converted_task:
+                workflow_task_list.append(subtask)
+        else:
+            workflow_task_list.append(converted_task)
+    return workflow_task_list
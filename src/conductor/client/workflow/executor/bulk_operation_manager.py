@@ -0,0 +1,171 @@
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from conductor.client.configuration.configuration import Configuration
+from conductor.client.http.api_client import ApiClient
+from conductor.client.http.api.workflow_bulk_resource_api import WorkflowBulkResourceApi
+from conductor.client.http.models.bulk_response import BulkResponse
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, List
+from typing_extensions import Self
+import logging
+import time
+import traceback
+
+logger = logging.getLogger(
+    Configuration.get_logging_formatted_name(
+        __name__
+    )
+)
+
+BulkOperationFunction = Callable[[List[str]], BulkResponse]
+
+
+class BulkOperationManager:
+    """Runs bulk workflow operations over arbitrarily large lists of workflow ids.
+
+    Ids are split into chunks of `chunk_size`, which are sent concurrently by
+    up to `max_workers` threads. A failed chunk of an idempotent operation is
+    retried `max_retries` times, waiting `retry_backoff_seconds * attempt`
+    between attempts. Restarts and retries are not idempotent, since a chunk
+    that timed out may have been applied anyway, so their chunks are sent once.
+    The ids of a chunk that keeps failing are reported in `bulk_error_results`. The ids
+    can be any iterable, e.g. workflow ids taken from a search iterator, and
+    are consumed lazily so only the in-flight chunks are held in memory.
+    """
+
+    def __init__(
+        self,
+        configuration: Configuration,
+        chunk_size: int = 1000,
+        max_workers: int = 4,
+        max_retries: int = 3,
+        retry_backoff_seconds: float = 1,
+    ) -> Self:
+        if not isinstance(chunk_size, int) or chunk_size <= 0:
+            raise Exception('invalid chunk size')
+        if not isinstance(max_workers, int) or max_workers <= 0:
+            raise Exception('invalid number of workers')
+        if not isinstance(max_retries, int) or max_retries < 0:
+            raise Exception('invalid number of retries')
+        self.bulk_client = WorkflowBulkResourceApi(ApiClient(configuration))
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.retry_backoff_seconds = retry_backoff_seconds
+
+    def pause(self, workflow_ids: Iterable[str]) -> BulkResponse:
+        """Pause the list of workflows"""
+        return self.run(
+            lambda chunk: self.bulk_client.pause_workflow(body=chunk),
+            workflow_ids,
+        )
+
+    def resume(self, workflow_ids: Iterable[str]) -> BulkResponse:
+        """Resume the list of workflows"""
+        return self.run(
+            lambda chunk: self.bulk_client.resume_workflow(body=chunk),
+            workflow_ids,
+        )
+
+    def restart(self, workflow_ids: Iterable[str], use_latest_definitions: bool = None) -> BulkResponse:
+        """Restart the list of completed workflows"""
+        kwargs = {}
+        if use_latest_definitions is not None:
+            kwargs['use_latest_definitions'] = use_latest_definitions
+        return self.run(
+            lambda chunk: self.bulk_client.restart(body=chunk, **kwargs),
+            workflow_ids,
+            idempotent=False,
+        )
+
+    def retry(self, workflow_ids: Iterable[str]) -> BulkResponse:
+        """Retry the last failed task for each workflow from the list"""
+        return self.run(
+            lambda chunk: self.bulk_client.retry(body=chunk),
+            workflow_ids,
+            idempotent=False,
+        )
+
+    def terminate(self, workflow_ids: Iterable[str], reason: str = None, trigger_failure_workflow: bool = None) -> BulkResponse:
+        """Terminate workflows execution"""
+        kwargs = {}
+        if reason is not None:
+            kwargs['reason'] = reason
+        if trigger_failure_workflow is not None:
+            kwargs['trigger_failure_workflow'] = trigger_failure_workflow
+        return self.run(
+            lambda chunk: self.bulk_client.terminate(body=chunk, **kwargs),
+            workflow_ids,
+        )
+
+    def run(self, operation: BulkOperationFunction, workflow_ids: Iterable[str], idempotent: bool = True) -> BulkResponse:
+        """Apply the bulk operation to every chunk of ids and merge the responses, retrying failed chunks if it is idempotent"""
+        report = BulkResponse(
+            bulk_error_results={},
+            bulk_successful_results=[],
+        )
+        chunks = get_chunks(workflow_ids, self.chunk_size)
+        max_retries = self.max_retries if idempotent else 0
+        max_in_flight = 2 * self.max_workers
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            in_flight = set()
+            for chunk in chunks:
+                in_flight.add(
+                    executor.submit(self.__run_chunk, operation, chunk, max_retries)
+                )
+                if len(in_flight) >= max_in_flight:
+                    done, in_flight = wait(
+                        in_flight, return_when=FIRST_COMPLETED
+                    )
+                    self.__merge_results(report, done)
+            self.__merge_results(report, in_flight)
+        logger.debug(
+            f'Finished bulk operation, successful: {len(report.bulk_successful_results)}, failed: {len(report.bulk_error_results)}'
+        )
+        return report
+
+    def __run_chunk(self, operation: BulkOperationFunction, chunk: List[str], max_retries: int) -> BulkResponse:
+        for attempt in range(max_retries + 1):
+            if attempt > 0:
+                time.sleep(attempt * self.retry_backoff_seconds)
+            try:
+                response = operation(chunk)
+                if response is None:
+                    return BulkResponse(bulk_successful_results=chunk)
+                return response
+            except Exception as e:
+                reason = str(e)
+                logger.warning(
+                    f'Failed to run bulk operation over {len(chunk)} workflows, attempt: {attempt + 1}, reason: {traceback.format_exc()}'
+                )
+        return BulkResponse(
+            bulk_error_results={
+                workflow_id: reason for workflow_id in chunk
+            }
+        )
+
+    def __merge_results(self, report: BulkResponse, futures: Iterable[Future]) -> None:
+        for future in futures:
+            response = future.result()
+            if response.bulk_successful_results:
+                report.bulk_successful_results.extend(
+                    response.bulk_successful_results
+                )
+            if response.bulk_error_results:
+                report.bulk_error_results.update(
+                    response.bulk_error_results
+                )
+
+
+def get_chunks(items: Iterable[Any], chunk_size: int) -> Iterator[List[Any]]:
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def get_workflow_ids(search_results: Iterable[Any]) -> Iterator[str]:
+    """Extract workflow ids from search results, e.g. from `WorkflowExecutor.search_iterator`"""
+    for result in search_results:
+        yield result.workflow_id
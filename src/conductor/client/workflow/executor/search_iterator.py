@@ -0,0 +1,228 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from conductor.client.configuration.configuration import Configuration
+from conductor.client.http.api.task_resource_api import TaskResourceApi
+from conductor.client.http.api.workflow_resource_api import WorkflowResourceApi
+from conductor.client.http.streaming import stream_search_page
+from typing import Any, Callable, Dict, Iterator
+import logging
+
+logger = logging.getLogger(
+    Configuration.get_logging_formatted_name(
+        __name__
+    )
+)
+
+# Receives (start, size, query_id) and returns a search result page, which is
+# any object exposing `results` and optionally `total_hits` and `query_id`
+FetchPageFunction = Callable[[int, int, str], Any]
+
+DEFAULT_PAGE_SIZE = 100
+
+# Marks the end of the results of a page
+_END = object()
+
+
+class SearchIterator:
+    """Iterates over every result of a paginated search.
+
+    Pages are requested lazily and, when `prefetch` is enabled, the next page
+    is requested in a background thread while the caller consumes the
+    current one. At most two pages are held in memory at any time.
+
+    Pages whose `results` is an iterator rather than a list, such as
+    `StreamedSearchPage`, are decoded one result at a time. Their size is
+    only known at their last result, so the next page is requested then,
+    while the caller consumes that result.
+
+    If a page carries a `query_id`, it is sent back on the following requests
+    so the server can scroll through the result set instead of re-running
+    the query with a new offset.
+    """
+
+    def __init__(
+        self,
+        fetch_page: FetchPageFunction,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+        max_results: int = None,
+    ):
+        if not callable(fetch_page):
+            raise Exception('invalid type')
+        if not isinstance(page_size, int) or page_size <= 0:
+            raise Exception('invalid page size')
+        self.fetch_page = fetch_page
+        self.page_size = page_size
+        self.prefetch = prefetch
+        self.max_results = max_results
+
+    def __iter__(self) -> Iterator[Any]:
+        executor = None
+        if self.prefetch:
+            executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            yield from self.__iterate(executor)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False)
+
+    def __iterate(self, executor: ThreadPoolExecutor) -> Iterator[Any]:
+        start = 0
+        query_id = None
+        returned = 0
+        pending = self.__request_page(executor, start, query_id)
+        while pending is not None:
+            page = pending.result()
+            pending = None
+            results = getattr(page, 'results', None) or []
+            streamed = not isinstance(results, list)
+            if not streamed:
+                query_id = getattr(page, 'query_id', None) or query_id
+                start += len(results)
+                if self.__has_next_page(page, len(results), start, returned + len(results)):
+                    pending = self.__request_page(executor, start, query_id)
+            count = 0
+            results = iter(results)
+            result = next(results, _END)
+            while result is not _END:
+                if self.max_results is not None and returned >= self.max_results:
+                    _discard_page(pending)
+                    _close_results(results)
+                    return
+                count += 1
+                following = next(results, _END)
+                if streamed and following is _END:
+                    # Fields sent after the results, e.g. the query id, are read with the last result
+                    query_id = getattr(page, 'query_id', None) or query_id
+                    start += count
+                    if self.__has_next_page(page, count, start, returned + 1):
+                        pending = self.__request_page(executor, start, query_id)
+                returned += 1
+                yield result
+                result = following
+
+    def __has_next_page(self, page: Any, count: int, start: int, returned: int) -> bool:
+        if count < self.page_size:
+            return False
+        if self.max_results is not None and returned >= self.max_results:
+            return False
+        total_hits = getattr(page, 'total_hits', None)
+        if total_hits is not None and start >= total_hits:
+            return False
+        return True
+
+    def __request_page(self, executor: ThreadPoolExecutor, start: int, query_id: str) -> Future:
+        logger.debug(
+            f'Requesting search page, start: {start}, size: {self.page_size}, query_id: {query_id}'
+        )
+        if executor is not None:
+            return executor.submit(self.fetch_page, start, self.page_size, query_id)
+        future = Future()
+        try:
+            future.set_result(
+                self.fetch_page(start, self.page_size, query_id)
+            )
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
+def iterate_workflow_search(
+    workflow_client: WorkflowResourceApi,
+    query: str = None,
+    free_text: str = None,
+    sort: str = None,
+    skip_cache: bool = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    prefetch: bool = True,
+    max_results: int = None,
+) -> SearchIterator:
+    """Iterates over `WorkflowSummary` results of `WorkflowResourceApi.search`, scrolling with `query_id`"""
+    def fetch_page(start: int, size: int, query_id: str):
+        kwargs = __get_search_kwargs(start, size, sort, free_text, query)
+        if query_id is not None:
+            kwargs['query_id'] = query_id
+        if skip_cache is not None:
+            kwargs['skip_cache'] = skip_cache
+        return stream_search_page(workflow_client.search, workflow_client.api_client, 'WorkflowSummary', **kwargs)
+    return SearchIterator(fetch_page, page_size, prefetch, max_results)
+
+
+def iterate_workflow_search_v2(
+    workflow_client: WorkflowResourceApi,
+    query: str = None,
+    free_text: str = None,
+    sort: str = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    prefetch: bool = True,
+    max_results: int = None,
+) -> SearchIterator:
+    """Iterates over `Workflow` results of `WorkflowResourceApi.search_v22`"""
+    def fetch_page(start: int, size: int, query_id: str):
+        return stream_search_page(
+            workflow_client.search_v22, workflow_client.api_client, 'Workflow',
+            **__get_search_kwargs(start, size, sort, free_text, query)
+        )
+    return SearchIterator(fetch_page, page_size, prefetch, max_results)
+
+
+def iterate_task_search(
+    task_client: TaskResourceApi,
+    query: str = None,
+    free_text: str = None,
+    sort: str = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    prefetch: bool = True,
+    max_results: int = None,
+) -> SearchIterator:
+    """Iterates over `TaskSummary` results of `TaskResourceApi.search1`"""
+    def fetch_page(start: int, size: int, query_id: str):
+        return stream_search_page(
+            task_client.search1, task_client.api_client, 'TaskSummary',
+            **__get_search_kwargs(start, size, sort, free_text, query)
+        )
+    return SearchIterator(fetch_page, page_size, prefetch, max_results)
+
+
+def iterate_task_search_v2(
+    task_client: TaskResourceApi,
+    query: str = None,
+    free_text: str = None,
+    sort: str = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    prefetch: bool = True,
+    max_results: int = None,
+) -> SearchIterator:
+    """Iterates over `Task` results of `TaskResourceApi.search_v21`"""
+    def fetch_page(start: int, size: int, query_id: str):
+        return stream_search_page(
+            task_client.search_v21, task_client.api_client, 'Task',
+            **__get_search_kwargs(start, size, sort, free_text, query)
+        )
+    return SearchIterator(fetch_page, page_size, prefetch, max_results)
+
+
+def _discard_page(pending: Future) -> None:
+    if pending is None or pending.cancel():
+        return
+    pending.add_done_callback(_close_requested_page)
+
+
+def _close_requested_page(future: Future) -> None:
+    if future.exception() is None and hasattr(future.result(), 'close'):
+        future.result().close()
+
+
+def _close_results(results: Iterator[Any]) -> None:
+    if hasattr(results, 'close'):
+        results.close()
+
+
+def __get_search_kwargs(start: int, size: int, sort: str, free_text: str, query: str) -> Dict[str, Any]:
+    kwargs = {'start': start, 'size': size}
+    if sort is not None:
+        kwargs['sort'] = sort
+    if free_text is not None:
+        kwargs['free_text'] = free_text
+    if query is not None:
+        kwargs['query'] = query
+    return kwargs
@@ -5,7 +5,11 @@ from conductor.client.http.api.task_resource_api import TaskResourceApi
 from conductor.client.http.api.workflow_resource_api import WorkflowResourceApi
 from conductor.client.http.models.correlation_ids_search_request import CorrelationIdsSearchRequest
 from conductor.client.http.models import *
-from typing import Any, Dict, List
+from conductor.client.http.raw_json import RawJson
+from conductor.client.http.streaming import iter_all_verbose, iter_all_workflows, iter_task_defs
+from conductor.client.metadata.workflow_registrar import RegistrationSummary, WorkflowRegistrar
+from conductor.client.workflow.executor.search_iterator import DEFAULT_PAGE_SIZE, SearchIterator, iterate_task_search, iterate_task_search_v2, iterate_workflow_search, iterate_workflow_search_v2
+from typing import Any, Dict, Iterator, List, Tuple
 from typing_extensions import Self
 import uuid
 
@@ -16,8 +20,11 @@ class WorkflowExecutor:
         self.task_client = TaskResourceApi(api_client)
         self.workflow_client = WorkflowResourceApi(api_client)
 
-    def register_workflow(self, workflow: WorkflowDef, overwrite: bool = None) -> object:
-        """Create a new workflow definition"""
+    def register_workflow(self, workflow: WorkflowDef, overwrite: bool = None, skip_unchanged: bool = False) -> object:
+        """Create a new workflow definition, skipping the upload if skip_unchanged is set and the server copy is the same"""
+        if skip_unchanged:
+            registrar = WorkflowRegistrar(metadata_client=self.metadata_client)
+            return registrar.register_workflow(workflow, overwrite=overwrite is not False)
         kwargs = {}
         if overwrite is not None:
             kwargs['overwrite'] = overwrite
@@ -25,10 +32,30 @@ class WorkflowExecutor:
             body=workflow, **kwargs
         )
 
-    def start_workflow(self, start_workflow_request: StartWorkflowRequest) -> str:
-        """Start a new workflow with StartWorkflowRequest, which allows task to be executed in a domain """
+    def register_workflows(self, workflows: List[WorkflowDef], max_workers: int = 8, state_file: str = None, overwrite: bool = True) -> RegistrationSummary:
+        """Register workflow definitions concurrently, uploading only the ones that changed"""
+        registrar = WorkflowRegistrar(
+            metadata_client=self.metadata_client,
+            max_workers=max_workers,
+            state_file=state_file,
+        )
+        return registrar.register(workflows, overwrite=overwrite)
+
+    def start_workflow(self, start_workflow_request: StartWorkflowRequest, serialized_workflow_def: RawJson = None) -> str:
+        """Start a new workflow with StartWorkflowRequest, which allows task to be executed in a domain.
+        When given, serialized_workflow_def is sent instead of serializing the workflow_def of the request again.
+        """
+        body = start_workflow_request
+        if serialized_workflow_def is not None:
+            api_client = self.workflow_client.api_client
+            body = {}
+            for attr in start_workflow_request.swagger_types:
+                value = getattr(start_workflow_request, attr)
+                if attr != 'workflow_def' and value is not None:
+                    body[start_workflow_request.attribute_map[attr]] = api_client.sanitize_for_serialization(value)
+            body['workflowDef'] = serialized_workflow_def
         return self.workflow_client.start_workflow(
-            body=start_workflow_request,
+            body=body,
         )
 
     def start_workflows(self, *start_workflow_request: StartWorkflowRequest) -> List[str]:
@@ -110,6 +137,100 @@ class WorkflowExecutor:
             kwargs['skip_cache'] = skip_cache
         return self.workflow_client.search(**kwargs)
 
+    def search_iterator(
+        self,
+        query: str = None,
+        free_text: str = None,
+        sort: str = None,
+        skip_cache: bool = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+        max_results: int = None,
+    ) -> SearchIterator:
+        """Iterate over all workflow summaries matching the search, fetching the next page in background"""
+        return iterate_workflow_search(
+            self.workflow_client,
+            query=query,
+            free_text=free_text,
+            sort=sort,
+            skip_cache=skip_cache,
+            page_size=page_size,
+            prefetch=prefetch,
+            max_results=max_results,
+        )
+
+    def search_v2_iterator(
+        self,
+        query: str = None,
+        free_text: str = None,
+        sort: str = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+        max_results: int = None,
+    ) -> SearchIterator:
+        """Iterate over all workflows matching the search, fetching the next page in background"""
+        return iterate_workflow_search_v2(
+            self.workflow_client,
+            query=query,
+            free_text=free_text,
+            sort=sort,
+            page_size=page_size,
+            prefetch=prefetch,
+            max_results=max_results,
+        )
+
+    def search_tasks_iterator(
+        self,
+        query: str = None,
+        free_text: str = None,
+        sort: str = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+        max_results: int = None,
+    ) -> SearchIterator:
+        """Iterate over all task summaries matching the search, fetching the next page in background"""
+        return iterate_task_search(
+            self.task_client,
+            query=query,
+            free_text=free_text,
+            sort=sort,
+            page_size=page_size,
+            prefetch=prefetch,
+            max_results=max_results,
+        )
+
+    def search_tasks_v2_iterator(
+        self,
+        query: str = None,
+        free_text: str = None,
+        sort: str = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+        max_results: int = None,
+    ) -> SearchIterator:
+        """Iterate over all tasks matching the search, fetching the next page in background"""
+        return iterate_task_search_v2(
+            self.task_client,
+            query=query,
+            free_text=free_text,
+            sort=sort,
+            page_size=page_size,
+            prefetch=prefetch,
+            max_results=max_results,
+        )
+
+    def iter_all_workflows(self, **kwargs) -> Iterator[WorkflowDef]:
+        """Iterate over all workflow definitions, decoding the response one definition at a time"""
+        return iter_all_workflows(self.metadata_client, **kwargs)
+
+    def iter_task_defs(self, **kwargs) -> Iterator[TaskDef]:
+        """Iterate over all task definitions, decoding the response one definition at a time"""
+        return iter_task_defs(self.metadata_client, **kwargs)
+
+    def iter_all_verbose(self, **kwargs) -> Iterator[Tuple[str, Dict[str, Dict[str, int]]]]:
+        """Iterate over the details of every task queue, as (queue name, details) pairs decoded one at a time"""
+        return iter_all_verbose(self.task_client, **kwargs)
+
     def get_by_correlation_ids(
         self,
         workflow_name: str,
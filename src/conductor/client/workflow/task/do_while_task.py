@@ -17,17 +17,26 @@ class DoWhileTask(TaskInterface):
             task_reference_name=task_ref_name,
             task_type=TaskType.DO_WHILE,
         )
-        self._loop_condition = deepcopy(termination_condition)
-        self._loop_over = deepcopy(tasks)
+        self._loop_condition = termination_condition
+        if isinstance(tasks, list):
+            self._loop_over = deepcopy(tasks)
+        else:
+            self._loop_over = [deepcopy(tasks)]
 
     def to_workflow_task(self) -> WorkflowTask:
+        return self._compile_workflow_task(cached=False)
+
+    def _compile_workflow_task(self, cached: bool) -> WorkflowTask:
         workflow = super().to_workflow_task()
         workflow.loop_condition = self._loop_condition
         workflow.loop_over = get_task_interface_list_as_workflow_task_list(
-            self._loop_over,
+            *self._loop_over, cached=cached,
         )
         return workflow
 
+    def _get_child_tasks(self) -> List[TaskInterface]:
+        return self._loop_over
+
 
 class LoopTask(DoWhileTask):
     def __init__(self, task_ref_name: str, iterations: int, tasks: List[TaskInterface]) -> Self:
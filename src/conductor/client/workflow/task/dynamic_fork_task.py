@@ -1,7 +1,7 @@
 from typing import List
 from conductor.client.http.models.workflow_task import WorkflowTask
 from conductor.client.workflow.task.join_task import JoinTask
-from conductor.client.workflow.task.task import TaskInterface
+from conductor.client.workflow.task.task import TaskInterface, get_workflow_task
 from conductor.client.workflow.task.task_type import TaskType
 from copy import deepcopy
 from typing_extensions import Self
@@ -17,6 +17,9 @@ class DynamicForkTask(TaskInterface):
         self._join_task = deepcopy(join_task)
 
     def to_workflow_task(self) -> WorkflowTask:
+        return self._compile_workflow_task(cached=False)
+
+    def _compile_workflow_task(self, cached: bool) -> WorkflowTask:
         workflow = super().to_workflow_task()
         workflow.dynamic_fork_join_tasks_param = 'forkedTasks'
         workflow.dynamic_fork_tasks_input_param_name = 'forkedTasksInputs'
@@ -27,9 +30,14 @@ class DynamicForkTask(TaskInterface):
             'forkedTasksInputs'
         )
         tasks = [
-            self._pre_fork_task.to_workflow_task(),
+            get_workflow_task(self._pre_fork_task, cached),
             workflow,
         ]
         if self._join_task != None:
-            tasks.append(self._join_task.to_workflow_task())
+            tasks.append(get_workflow_task(self._join_task, cached))
         return tasks
+
+    def _get_child_tasks(self) -> List[TaskInterface]:
+        if self._join_task != None:
+            return [self._pre_fork_task, self._join_task]
+        return [self._pre_fork_task]
@@ -1,5 +1,5 @@
 from conductor.client.http.models.workflow_task import WorkflowTask
-from conductor.client.workflow.task.task import TaskInterface
+from conductor.client.workflow.task.task import TaskInterface, get_workflow_task
 from conductor.client.workflow.task.task_type import TaskType
 from copy import deepcopy
 from typing import List
@@ -19,6 +19,9 @@ class ForkTask(TaskInterface):
         self._forked_tasks = deepcopy(forked_tasks)
 
     def to_workflow_task(self) -> WorkflowTask:
+        return self._compile_workflow_task(cached=False)
+
+    def _compile_workflow_task(self, cached: bool) -> WorkflowTask:
         workflow_task = super().to_workflow_task()
         workflow_task.fork_tasks = []
         workflow_task.join_on = []
@@ -26,10 +29,15 @@ class ForkTask(TaskInterface):
             converted_inner_forked_tasks = []
             for inner_forked_task in inner_forked_tasks:
                 converted_inner_forked_tasks.append(
-                    inner_forked_task.to_workflow_task()
+                    get_workflow_task(inner_forked_task, cached)
                 )
             workflow_task.fork_tasks.append(converted_inner_forked_tasks)
             workflow_task.join_on.append(
                 converted_inner_forked_tasks[-1].task_reference_name
             )
         return workflow_task
+
+    def _get_child_tasks(self) -> List[TaskInterface]:
+        return [
+            task for inner_forked_tasks in self._forked_tasks for task in inner_forked_tasks
+        ]
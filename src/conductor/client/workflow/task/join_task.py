@@ -1,7 +1,6 @@
 from conductor.client.http.models.workflow_task import WorkflowTask
 from conductor.client.workflow.task.task import TaskInterface
 from conductor.client.workflow.task.task_type import TaskType
-from copy import deepcopy
 from typing import List
 from typing_extensions import Self
 
@@ -12,9 +11,12 @@ class JoinTask(TaskInterface):
             task_reference_name=task_ref_name,
             task_type=TaskType.JOIN
         )
-        self._join_on = deepcopy(join_on)
+        self._join_on = None
+        if join_on != None:
+            self._join_on = list(join_on)
 
     def to_workflow_task(self) -> WorkflowTask:
         workflow = super().to_workflow_task()
-        workflow.join_on = self._join_on
+        if self._join_on != None:
+            workflow.join_on = list(self._join_on)
         return workflow
@@ -20,10 +20,11 @@ class SwitchTask(TaskInterface):
         )
         self._default_case = None
         self._decision_cases = {}
-        self._expression = deepcopy(case_expression)
-        self._use_javascript = deepcopy(use_javascript)
+        self._expression = case_expression
+        self._use_javascript = use_javascript
 
     def switch_case(self, case_name: str, tasks: List[TaskInterface]) -> Self:
+        self._ensure_mutable()
         if isinstance(tasks, List):
             self._decision_cases[case_name] = deepcopy(tasks)
         else:
@@ -31,6 +32,7 @@ class SwitchTask(TaskInterface):
         return self
 
     def default_case(self, tasks: List[TaskInterface]) -> Self:
+        self._ensure_mutable()
         if isinstance(tasks, List):
             self._default_case = deepcopy(tasks)
         else:
@@ -38,6 +40,9 @@ class SwitchTask(TaskInterface):
         return self
 
     def to_workflow_task(self) -> WorkflowTask:
+        return self._compile_workflow_task(cached=False)
+
+    def _compile_workflow_task(self, cached: bool) -> WorkflowTask:
         workflow = super().to_workflow_task()
         if self._use_javascript:
             workflow.evaluator_type = EvaluatorType.JAVASCRIPT
@@ -49,11 +54,15 @@ class SwitchTask(TaskInterface):
         workflow.decision_cases = {}
         for case_value, tasks in self._decision_cases.items():
             workflow.decision_cases[case_value] = get_task_interface_list_as_workflow_task_list(
-                *tasks,
+                *tasks, cached=cached,
             )
-        if self._default_case is None:
-            self._default_case = []
         workflow.default_case = get_task_interface_list_as_workflow_task_list(
-            *self._default_case
+            *(self._default_case or []), cached=cached,
         )
         return workflow
+
+    def _get_child_tasks(self) -> List[TaskInterface]:
+        child_tasks = list(self._default_case or [])
+        for tasks in self._decision_cases.values():
+            child_tasks.extend(tasks)
+        return child_tasks
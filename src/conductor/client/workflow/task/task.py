@@ -2,18 +2,44 @@ from abc import ABC, abstractmethod
 from conductor.client.http.models.workflow_task import WorkflowTask
 from conductor.client.workflow.task.task_type import TaskType
 from copy import deepcopy
+from types import MappingProxyType
 from typing import Any, Dict, List
 from typing_extensions import Self
 
 
-def get_task_interface_list_as_workflow_task_list(*tasks: Self) -> List[WorkflowTask]:
+def get_task_interface_list_as_workflow_task_list(*tasks: Self, cached: bool = False) -> List[WorkflowTask]:
     converted_tasks = []
     for task in tasks:
-        converted_tasks.append(task.to_workflow_task())
+        converted_tasks.append(get_workflow_task(task, cached))
     return converted_tasks
 
 
+def get_workflow_task(task: Self, cached: bool = False) -> WorkflowTask:
+    """Compiled task, memoized by frozen tasks when `cached` is set, see `TaskInterface.to_cached_workflow_task`"""
+    if cached:
+        return task.to_cached_workflow_task()
+    return task.to_workflow_task()
+
+
+def freeze_tasks(tasks: List[Self]) -> List[Self]:
+    """Freezes the given tasks so they can be shared instead of being copied"""
+    for task in tasks:
+        if not issubclass(type(task), TaskInterface):
+            raise Exception('invalid type')
+        task.freeze()
+    return tasks
+
+
 class TaskInterface(ABC):
+    # A frozen task, see `freeze`, cannot be modified anymore, down to the
+    # values nested in its inputs, so deep copying it returns the task itself
+    # and parent tasks or workflows share it instead of copying it. Since a
+    # frozen task never changes, its compiled WorkflowTask is computed once
+    # and reused afterwards, including by the compiled WorkflowTasks of its
+    # parents.
+    _frozen = False
+    _workflow_task_cache = None
+
     @abstractmethod
     def __init__(self,
                  task_reference_name: str,
@@ -35,9 +61,10 @@ class TaskInterface(ABC):
 
     @task_reference_name.setter
     def task_reference_name(self, task_reference_name: str) -> None:
+        self._ensure_mutable()
         if not isinstance(task_reference_name, str):
             raise Exception('invalid type')
-        self._task_reference_name = deepcopy(task_reference_name)
+        self._task_reference_name = task_reference_name
 
     @property
     def task_type(self) -> TaskType:
@@ -45,9 +72,10 @@ class TaskInterface(ABC):
 
     @task_type.setter
     def task_type(self, task_type: TaskType) -> None:
+        self._ensure_mutable()
         if not isinstance(task_type, TaskType):
             raise Exception('invalid type')
-        self._task_type = deepcopy(task_type)
+        self._task_type = task_type
 
     @property
     def name(self) -> str:
@@ -55,6 +83,7 @@ class TaskInterface(ABC):
 
     @name.setter
     def name(self, name: str) -> None:
+        self._ensure_mutable()
         if not isinstance(name, str):
             raise Exception('invalid type')
         self._name = name
@@ -65,9 +94,10 @@ class TaskInterface(ABC):
 
     @description.setter
     def description(self, description: str) -> None:
+        self._ensure_mutable()
         if description != None and not isinstance(description, str):
             raise Exception('invalid type')
-        self._description = deepcopy(description)
+        self._description = description
 
     @property
     def optional(self) -> bool:
@@ -75,9 +105,10 @@ class TaskInterface(ABC):
 
     @optional.setter
     def optional(self, optional: bool) -> None:
+        self._ensure_mutable()
         if optional != None and not isinstance(optional, bool):
             raise Exception('invalid type')
-        self._optional = deepcopy(optional)
+        self._optional = optional
 
     @property
     def input_parameters(self) -> Dict[str, Any]:
@@ -85,6 +116,7 @@ class TaskInterface(ABC):
 
     @input_parameters.setter
     def input_parameters(self, input_parameters: Dict[str, Any]) -> None:
+        self._ensure_mutable()
         if input_parameters == None:
             self._input_parameters = {}
             return
@@ -96,6 +128,7 @@ class TaskInterface(ABC):
         self._input_parameters = deepcopy(input_parameters)
 
     def input(self, key: str, value: Any) -> Self:
+        self._ensure_mutable()
         if not isinstance(key, str):
             raise Exception('invalid type')
         self._input_parameters[key] = deepcopy(value)
@@ -107,11 +140,78 @@ class TaskInterface(ABC):
             task_reference_name=self._task_reference_name,
             type=self._task_type.value,
             description=self._description,
-            input_parameters=self._input_parameters,
+            input_parameters=_copy_input_value(self._input_parameters),
             optional=self._optional,
         )
 
+    def to_cached_workflow_task(self) -> WorkflowTask:
+        """Same as `to_workflow_task`, but frozen tasks return a memoized result, shared by every caller, that must not be modified"""
+        if not self._frozen:
+            return self._compile_workflow_task(cached=True)
+        if self._workflow_task_cache is None:
+            self._workflow_task_cache = self._compile_workflow_task(cached=True)
+        return self._workflow_task_cache
+
+    def _compile_workflow_task(self, cached: bool) -> WorkflowTask:
+        """Compiles the task, from the memoized WorkflowTasks of its child tasks when `cached` is set"""
+        return self.to_workflow_task()
+
     def output_ref(self, path: str) -> str:
         if path == '':
             return f'${{{self._task_reference_name}.output}}'
         return f'${{{self._task_reference_name}.output.{path}}}'
+
+    @property
+    def frozen(self) -> bool:
+        return self._frozen
+
+    def freeze(self) -> Self:
+        """Makes the task and its child tasks immutable, so they can be shared instead of copied"""
+        if self._frozen:
+            return self
+        self._input_parameters = _freeze_input_value(self._input_parameters)
+        self._frozen = True
+        freeze_tasks(self._get_child_tasks())
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Self:
+        if self._frozen:
+            return self
+        task = self.__class__.__new__(self.__class__)
+        memo[id(self)] = task
+        for key, value in self.__dict__.items():
+            task.__dict__[key] = deepcopy(value, memo)
+        return task
+
+    def _get_child_tasks(self) -> List[Self]:
+        return []
+
+    def _ensure_mutable(self) -> None:
+        if self._frozen:
+            raise Exception(
+                f'task {self._task_reference_name} is frozen and cannot be modified'
+            )
+
+
+def _freeze_input_value(value: Any) -> Any:
+    """Read-only version of an input value: dicts become mapping proxies and lists become tuples, at every depth"""
+    if isinstance(value, (dict, MappingProxyType)):
+        return MappingProxyType({
+            key: _freeze_input_value(item) for key, item in value.items()
+        })
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze_input_value(item) for item in value)
+    return value
+
+
+def _copy_input_value(value: Any) -> Any:
+    """Plain, mutable copy of an input value, frozen or not, so compiled tasks never share inputs"""
+    if isinstance(value, (dict, MappingProxyType)):
+        return {
+            key: _copy_input_value(item) for key, item in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return [_copy_input_value(item) for item in value]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return deepcopy(value)
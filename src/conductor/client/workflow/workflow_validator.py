@@ -0,0 +1,377 @@
+from conductor.client.http.models.workflow_def import WorkflowDef
+from conductor.client.http.models.workflow_task import WorkflowTask
+from conductor.client.workflow.conductor_workflow import ConductorWorkflow
+from conductor.client.workflow.task.task_type import TaskType
+from enum import Enum
+from typing import Any, Generator, List, Set, Union
+import re
+
+# Matches every `${...}` expression of an input or output parameter
+EXPRESSION_PATTERN = re.compile(r'\$\{([^}]*)\}')
+# Reference of a task inside an expression, e.g. `task_ref` in `${task_ref.output.value}`
+REFERENCE_PATTERN = re.compile(r'^\s*([A-Za-z0-9_\-]+)\.')
+# Suffix of the task instances created by each loop iteration
+ITERATION_SUFFIX_PATTERN = re.compile(r'__\d+$')
+
+WORKFLOW_REFERENCE = 'workflow'
+
+SWITCH_EVALUATOR_TYPES = ['value-param', 'javascript', 'graaljs']
+
+ROOT_SCOPE = 0
+
+
+class ValidationSeverity(str, Enum):
+    ERROR = 'ERROR'
+    WARNING = 'WARNING'
+
+
+class ValidationIssue:
+    def __init__(self, severity: ValidationSeverity, task_reference_name: str, message: str):
+        self.severity = severity
+        self.task_reference_name = task_reference_name
+        self.message = message
+
+    def __repr__(self) -> str:
+        return f'{self.severity.value} {self.task_reference_name}: {self.message}'
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ValidationIssue):
+            return False
+        return self.__dict__ == other.__dict__
+
+
+class WorkflowValidationException(Exception):
+    def __init__(self, workflow_name: str, errors: List[ValidationIssue]):
+        self.workflow_name = workflow_name
+        self.errors = errors
+        super().__init__(
+            f'invalid workflow definition {workflow_name}: {errors}'
+        )
+
+
+class ValidationResult:
+    def __init__(self, workflow_name: str):
+        self.workflow_name = workflow_name
+        self.issues = []
+
+    @property
+    def errors(self) -> List[ValidationIssue]:
+        return [issue for issue in self.issues if issue.severity == ValidationSeverity.ERROR]
+
+    @property
+    def warnings(self) -> List[ValidationIssue]:
+        return [issue for issue in self.issues if issue.severity == ValidationSeverity.WARNING]
+
+    @property
+    def is_valid(self) -> bool:
+        return len(self.errors) == 0
+
+    def raise_for_errors(self) -> None:
+        errors = self.errors
+        if len(errors) > 0:
+            raise WorkflowValidationException(self.workflow_name, errors)
+
+    def __repr__(self) -> str:
+        return f'ValidationResult(workflow={self.workflow_name}, errors={len(self.errors)}, warnings={len(self.warnings)})'
+
+
+class WorkflowValidator:
+    """Validates workflow definitions locally, without any server round trip.
+
+    Errors are definitions the server would reject or that cannot run:
+    missing or duplicate task reference names, expressions referencing tasks
+    that do not exist, forks without a join, join_on entries outside the
+    preceding fork, switches and loops without an expression or condition.
+
+    Warnings are definitions that run but most likely not as intended:
+    expressions referencing a task that was not executed yet (a later task,
+    a parallel fork branch or another switch case), tasks that can never be
+    reached because every path before them terminates the workflow, and
+    empty switch cases.
+
+    Each task and each parameter value is visited a constant number of times,
+    so validation is linear in the size of the definition.
+    """
+
+    def validate(self, workflow: Union[WorkflowDef, ConductorWorkflow]) -> ValidationResult:
+        """Validates a `WorkflowDef` or a `ConductorWorkflow`"""
+        workflow_def = workflow
+        if not isinstance(workflow, WorkflowDef):
+            workflow_def = workflow.to_workflow_def()
+        return _Validation(workflow_def).run()
+
+
+class _Validation:
+    def __init__(self, workflow_def: WorkflowDef):
+        self.workflow_def = workflow_def
+        self.result = ValidationResult(workflow_def.name)
+        # Every task of the definition, by reference name
+        self.tasks = {}
+        # Scope in which each task was executed, by reference name. Every
+        # fork branch and switch case is a scope of its own, merged into its
+        # parent once all the branches of the fork or switch were visited.
+        self.executed_scopes = {}
+        # Parent of each scope, or the scope itself until it is merged
+        self.scope_parents = [ROOT_SCOPE]
+        # Scopes containing the task being visited, whose tasks it can see
+        self.open_scopes = {ROOT_SCOPE}
+        self.current_scope = ROOT_SCOPE
+
+    def run(self) -> ValidationResult:
+        tasks = self.workflow_def.tasks or []
+        if len(tasks) == 0:
+            self.__error(self.workflow_def.name, 'workflow has no tasks')
+        self.__index_tasks(tasks)
+        self.__visit(self.__visit_task_list(tasks))
+        # Every scope was merged into the root one when the workflow output is computed
+        self.__check_references(
+            self.workflow_def.name, self.workflow_def.output_parameters, set()
+        )
+        return self.result
+
+    def __index_tasks(self, tasks: List[WorkflowTask]) -> None:
+        pending = list(tasks)
+        while len(pending) > 0:
+            task = pending.pop()
+            reference_name = task.task_reference_name
+            if not reference_name:
+                self.__error(task.name, 'task has no task_reference_name')
+            elif reference_name in self.tasks:
+                self.__error(reference_name, 'duplicate task_reference_name')
+            else:
+                self.tasks[reference_name] = task
+            pending.extend(_get_child_task_lists_flattened(task))
+
+    def __visit(self, visit: Generator) -> Any:
+        """Runs a visit, which yields the nested visits it needs the result of.
+
+        Nested visits are run with an explicit stack, so deeply nested
+        definitions do not reach the recursion limit.
+        """
+        stack = [visit]
+        result = None
+        while len(stack) > 0:
+            try:
+                nested_visit = stack[-1].send(result)
+            except StopIteration as stop:
+                stack.pop()
+                result = stop.value
+            else:
+                stack.append(nested_visit)
+                result = None
+        return result
+
+    def __visit_task_list(self, tasks: List[WorkflowTask], loop_references: Set[str] = frozenset()) -> Generator:
+        """Visits the tasks in execution order and returns whether the list always terminates the workflow"""
+        terminated = False
+        for index, task in enumerate(tasks):
+            if terminated:
+                self.__warning(
+                    task.task_reference_name, 'task is unreachable, the workflow always terminates before it'
+                )
+            if (yield self.__visit_task(task, tasks, index, loop_references)):
+                terminated = True
+        return terminated
+
+    def __visit_task(self, task: WorkflowTask, siblings: List[WorkflowTask], index: int,
+                     loop_references: Set[str]) -> Generator:
+        reference_name = task.task_reference_name
+        if not task.type:
+            self.__error(reference_name, 'task has no type')
+        self.__check_references(reference_name, task.input_parameters, loop_references)
+        terminates = False
+        if task.type == TaskType.FORK_JOIN.value:
+            self.__check_fork(task, siblings, index)
+            yield self.__visit_exclusive_branches(task.fork_tasks or [], loop_references)
+        elif task.type == TaskType.FORK_JOIN_DYNAMIC.value:
+            self.__check_dynamic_fork(task, siblings, index)
+        elif task.type in (TaskType.SWITCH.value, TaskType.DECISION.value):
+            self.__check_switch(task)
+            branches = list((task.decision_cases or {}).values())
+            branches.append(task.default_case or [])
+            terminates = yield self.__visit_exclusive_branches(branches, loop_references)
+        elif task.type == TaskType.DO_WHILE.value:
+            self.__check_loop(task)
+            loop_over = task.loop_over or []
+            # Tasks of a loop can reference each other from previous iterations
+            body_references = set(loop_references)
+            body_references.update(loop_task.task_reference_name for loop_task in loop_over)
+            terminates = yield self.__visit_task_list(loop_over, body_references)
+        elif task.type == TaskType.JOIN.value:
+            self.__check_join(task, siblings, index)
+        elif task.type == TaskType.SUB_WORKFLOW.value:
+            if task.sub_workflow_param is None or not task.sub_workflow_param.name:
+                self.__error(reference_name, 'sub workflow task has no sub_workflow_param name')
+        elif task.type == TaskType.TERMINATE.value:
+            terminates = True
+        if reference_name not in self.executed_scopes:
+            self.executed_scopes[reference_name] = self.current_scope
+        return terminates
+
+    def __visit_exclusive_branches(self, branches: List[List[WorkflowTask]], loop_references: Set[str]) -> Generator:
+        """Visits branches that cannot see each other's tasks and returns whether all of them terminate.
+
+        Each branch is visited in a scope of its own, hidden from the next
+        branches, and all of them are merged into the parent scope at the
+        end. Tasks are marked as executed once, whatever their nesting depth.
+        """
+        parent_scope = self.current_scope
+        branch_scopes = []
+        terminates = len(branches) > 0
+        for branch in branches:
+            self.current_scope = len(self.scope_parents)
+            self.scope_parents.append(self.current_scope)
+            self.open_scopes.add(self.current_scope)
+            branch_terminates = yield self.__visit_task_list(branch, loop_references)
+            self.open_scopes.remove(self.current_scope)
+            branch_scopes.append(self.current_scope)
+            terminates = terminates and branch_terminates
+        self.current_scope = parent_scope
+        for scope in branch_scopes:
+            self.scope_parents[scope] = parent_scope
+        return terminates
+
+    def __is_executed(self, reference_name: str) -> bool:
+        scope = self.executed_scopes.get(reference_name)
+        if scope is None:
+            return False
+        # Finds the scope it was merged into, compressing the path for the next lookups
+        merged_scope = scope
+        while self.scope_parents[merged_scope] != merged_scope:
+            merged_scope = self.scope_parents[merged_scope]
+        while scope != merged_scope:
+            self.scope_parents[scope], scope = merged_scope, self.scope_parents[scope]
+        return merged_scope in self.open_scopes
+
+    def __check_fork(self, task: WorkflowTask, siblings: List[WorkflowTask], index: int) -> None:
+        reference_name = task.task_reference_name
+        fork_tasks = task.fork_tasks or []
+        if len(fork_tasks) == 0:
+            self.__error(reference_name, 'fork task has no fork_tasks')
+        for branch_index, branch in enumerate(fork_tasks):
+            if len(branch or []) == 0:
+                self.__error(reference_name, f'fork branch {branch_index} has no tasks')
+        if not _is_followed_by_join(siblings, index):
+            self.__error(reference_name, 'fork task must be followed by a JOIN task')
+
+    def __check_dynamic_fork(self, task: WorkflowTask, siblings: List[WorkflowTask], index: int) -> None:
+        reference_name = task.task_reference_name
+        input_parameters = task.input_parameters or {}
+        tasks_param = task.dynamic_fork_tasks_param or task.dynamic_fork_join_tasks_param
+        for param in [tasks_param, task.dynamic_fork_tasks_input_param_name]:
+            if not param:
+                self.__error(reference_name, 'dynamic fork task has no dynamic fork tasks parameters')
+            elif param not in input_parameters:
+                self.__error(reference_name, f'dynamic fork parameter {param} is not an input parameter')
+        if not _is_followed_by_join(siblings, index):
+            self.__error(reference_name, 'dynamic fork task must be followed by a JOIN task')
+
+    def __check_join(self, task: WorkflowTask, siblings: List[WorkflowTask], index: int) -> None:
+        reference_name = task.task_reference_name
+        if index == 0 or siblings[index - 1].type not in (TaskType.FORK_JOIN.value, TaskType.FORK_JOIN_DYNAMIC.value):
+            self.__error(reference_name, 'join task must follow a fork task')
+            return
+        fork_task = siblings[index - 1]
+        if fork_task.type == TaskType.FORK_JOIN_DYNAMIC.value:
+            return
+        forked_references = set()
+        for branch in fork_task.fork_tasks or []:
+            for branch_task in branch or []:
+                forked_references.add(branch_task.task_reference_name)
+        for join_on in task.join_on or []:
+            if join_on not in self.tasks:
+                self.__error(reference_name, f'join_on references unknown task {join_on}')
+            elif join_on not in forked_references:
+                self.__error(
+                    reference_name, f'join_on references task {join_on} outside of fork {fork_task.task_reference_name}'
+                )
+
+    def __check_switch(self, task: WorkflowTask) -> None:
+        reference_name = task.task_reference_name
+        input_parameters = task.input_parameters or {}
+        if task.type == TaskType.DECISION.value:
+            if not task.case_value_param and not task.case_expression:
+                self.__error(reference_name, 'decision task has no case_value_param nor case_expression')
+            elif task.case_value_param and task.case_value_param not in input_parameters:
+                self.__error(
+                    reference_name, f'case_value_param {task.case_value_param} is not an input parameter'
+                )
+        else:
+            if task.evaluator_type not in SWITCH_EVALUATOR_TYPES:
+                self.__error(reference_name, f'switch task has invalid evaluator_type {task.evaluator_type}')
+            if not task.expression:
+                self.__error(reference_name, 'switch task has no expression')
+            elif task.evaluator_type == 'value-param' and task.expression not in input_parameters:
+                self.__error(reference_name, f'switch expression {task.expression} is not an input parameter')
+        if len(task.decision_cases or {}) == 0 and len(task.default_case or []) == 0:
+            self.__warning(reference_name, 'switch task has no cases')
+
+    def __check_loop(self, task: WorkflowTask) -> None:
+        reference_name = task.task_reference_name
+        if not task.loop_condition:
+            self.__error(reference_name, 'do while task has no loop_condition')
+        if len(task.loop_over or []) == 0:
+            self.__error(reference_name, 'do while task has no loop_over tasks')
+
+    def __check_references(self, reference_name: str, value: Any, loop_references: Set[str]) -> None:
+        pending = [value]
+        while len(pending) > 0:
+            value = pending.pop()
+            if isinstance(value, str):
+                for referenced_name in _get_referenced_task_names(value):
+                    self.__check_reference(reference_name, referenced_name, loop_references)
+            elif isinstance(value, dict):
+                pending.extend(value.values())
+            elif isinstance(value, (list, tuple)):
+                pending.extend(value)
+
+    def __check_reference(self, reference_name: str, referenced_name: str, loop_references: Set[str]) -> None:
+        if referenced_name == WORKFLOW_REFERENCE or self.__is_executed(referenced_name):
+            return
+        if referenced_name not in self.tasks:
+            self.__error(reference_name, f'expression references unknown task {referenced_name}')
+        elif referenced_name == reference_name:
+            self.__error(reference_name, 'expression references the task itself')
+        elif referenced_name not in loop_references:
+            self.__warning(
+                reference_name, f'expression references task {referenced_name} which is not executed before it'
+            )
+
+    def __error(self, reference_name: str, message: str) -> None:
+        self.result.issues.append(ValidationIssue(ValidationSeverity.ERROR, reference_name, message))
+
+    def __warning(self, reference_name: str, message: str) -> None:
+        self.result.issues.append(ValidationIssue(ValidationSeverity.WARNING, reference_name, message))
+
+
+def _get_referenced_task_names(value: str) -> List[str]:
+    if '${' not in value:
+        return []
+    referenced_names = []
+    for expression in EXPRESSION_PATTERN.findall(value):
+        match = REFERENCE_PATTERN.match(expression)
+        if match is not None:
+            referenced_names.append(
+                ITERATION_SUFFIX_PATTERN.sub('', match.group(1))
+            )
+    return referenced_names
+
+
+def _get_child_task_lists_flattened(task: WorkflowTask) -> List[WorkflowTask]:
+    child_tasks = []
+    for branch in task.fork_tasks or []:
+        child_tasks.extend(branch or [])
+    for case_tasks in (task.decision_cases or {}).values():
+        child_tasks.extend(case_tasks or [])
+    child_tasks.extend(task.default_case or [])
+    child_tasks.extend(task.loop_over or [])
+    return child_tasks
+
+
+def _is_followed_by_join(siblings: List[WorkflowTask], index: int) -> bool:
+    return index + 1 < len(siblings) and siblings[index + 1].type == TaskType.JOIN.value
+
+
+def validate_workflow(workflow: Union[WorkflowDef, ConductorWorkflow]) -> ValidationResult:
+    """Validates a `WorkflowDef` or a `ConductorWorkflow` with the default validator"""
+    return WorkflowValidator().validate(workflow)
@@ -0,0 +1,263 @@
+from conductor.client.automator.task_handler import TaskHandler
+from conductor.client.configuration.configuration import Configuration
+from conductor.client.http.api_client import ApiClient
+from conductor.client.http.models.task import Task
+from conductor.client.http.models.task_result import TaskResult
+from conductor.client.http.models.task_result_status import TaskResultStatus
+from conductor.client.http.models.workflow import Workflow
+from conductor.client.http.rest import get_zstd_compressor
+from conductor.client.worker.worker import Worker
+from tests.benchmark.compression_benchmark import get_records_output, get_text_output, measure_compression
+from tests.benchmark.metrics_benchmark import measure_event_overhead
+from tests.benchmark.task_runner_benchmark import execute, measure_task_runner_throughput
+from tests.benchmark.workflow_builder_benchmark import build_flat_workflow, build_fork_tree, measure
+from typing import Any, Callable, Dict, List
+import argparse
+import json
+import logging
+import platform
+import statistics
+import sys
+import time
+
+# Relative change beyond which a benchmark is reported as a regression
+DEFAULT_THRESHOLD = 0.2
+DEFAULT_REPEATS = 5
+
+SERIALIZATION_ITERATIONS = 2000
+TASK_HANDLER_WORKER_COUNT = 4
+
+
+class BenchmarkResult:
+    def __init__(self, name: str, value: float, unit: str, higher_is_better: bool):
+        self.name = name
+        self.value = value
+        self.unit = unit
+        self.higher_is_better = higher_is_better
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'value': self.value,
+            'unit': self.unit,
+            'higher_is_better': self.higher_is_better,
+        }
+
+
+class _JsonResponse:
+    """Minimal stand-in of the response wrapper `ApiClient.deserialize` expects"""
+
+    def __init__(self, data: Any):
+        self.resp = self
+        self.data = data
+        self.text = json.dumps(data)
+
+    def json(self) -> Any:
+        return self.data
+
+
+def benchmark_task_runner() -> List[BenchmarkResult]:
+    return [
+        BenchmarkResult(
+            'task_runner_cycles_per_second',
+            measure_task_runner_throughput(latency_seconds=0),
+            'cycles/s',
+            True,
+        ),
+    ]
+
+
+def benchmark_serialization() -> List[BenchmarkResult]:
+    api_client = ApiClient(Configuration())
+    results = []
+    for name, model, response_type in [
+        ('task', _get_task(), 'Task'),
+        ('task_result', _get_task_result(), 'TaskResult'),
+        ('workflow', _get_workflow(), 'Workflow'),
+    ]:
+        serialized = api_client.sanitize_for_serialization(model)
+        response = _JsonResponse(serialized)
+        results.append(BenchmarkResult(
+            f'serialize_{name}_per_second',
+            _get_rate(lambda: api_client.sanitize_for_serialization(model)),
+            'ops/s',
+            True,
+        ))
+        results.append(BenchmarkResult(
+            f'deserialize_{name}_per_second',
+            _get_rate(lambda: api_client.deserialize(response, response_type)),
+            'ops/s',
+            True,
+        ))
+    return results
+
+
+def benchmark_workflow_builder() -> List[BenchmarkResult]:
+    return [
+        BenchmarkResult('build_flat_workflow_seconds', measure(build_flat_workflow), 's', False),
+        BenchmarkResult('build_fork_tree_seconds', measure(build_fork_tree), 's', False),
+    ]
+
+
+def benchmark_task_handler_startup() -> List[BenchmarkResult]:
+    workers = [
+        Worker(f'benchmark_task_{index}', execute, poll_interval=1)
+        for index in range(TASK_HANDLER_WORKER_COUNT)
+    ]
+    start_time = time.perf_counter()
+    task_handler = TaskHandler(workers, Configuration(server_api_url='http://127.0.0.1:1/api'))
+    task_handler.start_processes()
+    startup_time = time.perf_counter() - start_time
+    task_handler.stop_processes()
+    return [
+        BenchmarkResult('task_handler_startup_seconds', startup_time, 's', False),
+    ]
+
+
+def benchmark_metrics() -> List[BenchmarkResult]:
+    return [
+        BenchmarkResult('metric_event_nanoseconds', measure_event_overhead(), 'ns', False),
+    ]
+
+
+def benchmark_compression() -> List[BenchmarkResult]:
+    compressions = ['gzip']
+    if get_zstd_compressor() is not None:
+        compressions.append('zstd')
+    results = []
+    for name, output in [('records', get_records_output()), ('text', get_text_output())]:
+        for compression in compressions:
+            result = measure_compression(compression, output)
+            results.append(BenchmarkResult(
+                f'{compression}_{name}_size_ratio', result['size_ratio'], 'ratio', False
+            ))
+            results.append(BenchmarkResult(
+                f'{compression}_{name}_megabytes_per_second', result['megabytes_per_second'], 'MB/s', True
+            ))
+    return results
+
+
+BENCHMARKS = [
+    benchmark_task_runner,
+    benchmark_metrics,
+    benchmark_serialization,
+    benchmark_compression,
+    benchmark_workflow_builder,
+    benchmark_task_handler_startup,
+]
+
+
+def run_benchmarks(repeats: int = DEFAULT_REPEATS) -> Dict[str, Any]:
+    """Runs every benchmark `repeats` times and keeps the median of each result"""
+    values = {}
+    units = {}
+    for benchmark in BENCHMARKS:
+        for _ in range(repeats):
+            for result in benchmark():
+                values.setdefault(result.name, []).append(result.value)
+                units[result.name] = result
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': int(time.time()),
+        'benchmarks': {
+            name: BenchmarkResult(
+                name, statistics.median(values[name]), result.unit, result.higher_is_better
+            ).to_dict()
+            for name, result in units.items()
+        },
+    }
+
+
+def find_regressions(results: Dict[str, Any], baseline: Dict[str, Any],
+                     threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """Returns a description of every benchmark that got worse than the baseline by more than `threshold`"""
+    regressions = []
+    for name, baseline_result in baseline.get('benchmarks', {}).items():
+        result = results.get('benchmarks', {}).get(name)
+        if result is None or baseline_result['value'] == 0:
+            continue
+        change = (result['value'] - baseline_result['value']) / baseline_result['value']
+        if baseline_result['higher_is_better']:
+            change = -change
+        if change > threshold:
+            regressions.append(
+                f'{name}: {result["value"]:.6g} {result["unit"]}, baseline {baseline_result["value"]:.6g}, '
+                f'{change * 100:.1f}% worse'
+            )
+    return regressions
+
+
+def _get_rate(function: Callable[[], Any], iterations: int = SERIALIZATION_ITERATIONS) -> float:
+    start_time = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    return iterations / (time.perf_counter() - start_time)
+
+
+def _get_task() -> Task:
+    return Task(
+        task_id='task_id',
+        task_type='SIMPLE',
+        task_def_name='benchmark_task',
+        reference_task_name='benchmark_task_ref',
+        workflow_instance_id='workflow_id',
+        status='IN_PROGRESS',
+        input_data={f'key_{index}': f'value_{index}' for index in range(20)},
+        scheduled_time=1700000000000,
+        start_time=1700000000000,
+        poll_count=1,
+        retry_count=0,
+    )
+
+
+def _get_task_result() -> TaskResult:
+    task_result = TaskResult(
+        task_id='task_id',
+        workflow_instance_id='workflow_id',
+        worker_id='worker_id',
+        output_data={f'key_{index}': [index, {'nested': index}] for index in range(20)},
+    )
+    task_result.status = TaskResultStatus.COMPLETED
+    return task_result
+
+
+def _get_workflow() -> Workflow:
+    return Workflow(
+        workflow_id='workflow_id',
+        workflow_name='benchmark_workflow',
+        workflow_version=1,
+        status='RUNNING',
+        input={'key': 'value'},
+        tasks=[_get_task() for _ in range(10)],
+        start_time=1700000000000,
+    )
+
+
+def main(arguments: List[str]) -> int:
+    parser = argparse.ArgumentParser(description='Runs the worker benchmark suite')
+    parser.add_argument('--output', help='file where the results are written as JSON')
+    parser.add_argument('--baseline', help='JSON results of a previous run to compare with')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='relative change reported as a regression, e.g. 0.2 for 20%%')
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS)
+    arguments = parser.parse_args(arguments)
+    logging.disable(logging.CRITICAL)
+    results = run_benchmarks(arguments.repeats)
+    for name, result in results['benchmarks'].items():
+        print(f'{name}: {result["value"]:.6g} {result["unit"]}')
+    if arguments.output:
+        with open(arguments.output, 'w') as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+    if arguments.baseline:
+        with open(arguments.baseline, 'r') as file:
+            baseline = json.load(file)
+        regressions = find_regressions(results, baseline, arguments.threshold)
+        for regression in regressions:
+            print(f'REGRESSION {regression}')
+        if len(regressions) > 0:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
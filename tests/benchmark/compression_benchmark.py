@@ -0,0 +1,78 @@
+from conductor.client.http.rest import REQUEST_COMPRESSIONS, RESTClientObject, get_zstd_compressor
+from typing import Any, Dict
+import json
+import random
+import time
+
+RECORD_COUNT = 10000
+TEXT_PARAGRAPH_COUNT = 2000
+ITERATIONS = 10
+
+
+def get_records_output(record_count: int = RECORD_COUNT) -> Dict[str, Any]:
+    """Output of a worker returning rows fetched from a database"""
+    generator = random.Random(0)
+    return {
+        'records': [
+            {
+                'id': index,
+                'name': f'customer_{index}',
+                'email': f'customer_{index}@example.com',
+                'balance': round(generator.random() * 10000, 2),
+                'tags': ['new', 'premium', 'churned'][:index % 3 + 1],
+                'active': index % 2 == 0,
+            }
+            for index in range(record_count)
+        ]
+    }
+
+
+def get_text_output(paragraph_count: int = TEXT_PARAGRAPH_COUNT) -> Dict[str, Any]:
+    """Output of a worker returning generated or extracted text"""
+    generator = random.Random(0)
+    words = ['order', 'shipped', 'customer', 'invoice', 'payment', 'delayed', 'refund', 'warehouse']
+    return {
+        'paragraphs': [
+            ' '.join(generator.choice(words) for _ in range(60))
+            for _ in range(paragraph_count)
+        ]
+    }
+
+
+class _RecordingConnection:
+    def request(self, method, url, data=None, **kwargs):
+        self.data = data
+        return _Response()
+
+
+class _Response:
+    status_code = 200
+    reason = 'OK'
+    headers = {}
+
+
+def measure_compression(compression: str, output: Dict[str, Any], iterations: int = ITERATIONS) -> Dict[str, float]:
+    """Bytes on the wire relative to the uncompressed body, and megabytes of body compressed per second"""
+    connection = _RecordingConnection()
+    rest_client = RESTClientObject(connection, compression=compression)
+    size = len(json.dumps(output).encode('utf-8'))
+    start_time = time.process_time()
+    for _ in range(iterations):
+        rest_client.request('POST', 'http://localhost/api/tasks', body=output)
+    cpu_time = time.process_time() - start_time
+    return {
+        'size_ratio': len(connection.data) / size,
+        'megabytes_per_second': size * iterations / cpu_time / 1e6,
+    }
+
+
+if __name__ == '__main__':
+    for name, output in [('records', get_records_output()), ('text', get_text_output())]:
+        for compression in [None] + REQUEST_COMPRESSIONS:
+            if compression == 'zstd' and get_zstd_compressor() is None:
+                continue
+            result = measure_compression(compression, output)
+            print(
+                f'{name} output with {compression} compression: {result["size_ratio"] * 100:.1f}% of the bytes, '
+                f'{result["megabytes_per_second"]:.0f} MB/s including JSON encoding'
+            )
@@ -0,0 +1,38 @@
+from conductor.client.configuration.settings.metrics_settings import MetricsSettings
+from conductor.client.telemetry.metrics_collector import MetricsCollector
+import tempfile
+import time
+
+EVENT_COUNT = 100000
+# Scheduling noise only ever adds time, the fastest repeat is the closest to the actual cost
+REPEATS = 5
+# Budget of recording one metric event with in-memory aggregation
+MAX_EVENT_OVERHEAD_NANOSECONDS = 1000
+
+
+def measure_event_overhead(flush_interval: float = 1, event_count: int = EVENT_COUNT,
+                           repeats: int = REPEATS) -> float:
+    """Nanoseconds spent by the caller per counter increment and histogram observation"""
+    with tempfile.TemporaryDirectory() as directory:
+        metrics_collector = MetricsCollector(
+            MetricsSettings(directory=directory, flush_interval=flush_interval)
+        )
+        metrics_collector.increment_task_poll('benchmark_task')
+        elapsed_times = []
+        for _ in range(repeats):
+            start_time = time.perf_counter()
+            for _ in range(event_count // 2):
+                metrics_collector.increment_task_poll('benchmark_task')
+                metrics_collector.record_task_execute_time('benchmark_task', 0.01)
+            elapsed_times.append(time.perf_counter() - start_time)
+            metrics_collector.flush()
+    return min(elapsed_times) / event_count * 1e9
+
+
+if __name__ == '__main__':
+    aggregated = measure_event_overhead()
+    direct = measure_event_overhead(flush_interval=None)
+    print(f'aggregated metric event: {aggregated:.0f} ns')
+    print(f'direct metric event: {direct:.0f} ns')
+    if aggregated > MAX_EVENT_OVERHEAD_NANOSECONDS:
+        raise SystemExit(f'metric event overhead above {MAX_EVENT_OVERHEAD_NANOSECONDS} ns')
@@ -0,0 +1,39 @@
+from conductor.client.automator.task_runner import TaskRunner
+from conductor.client.http.models.task import Task
+from conductor.client.http.models.task_result import TaskResult
+from conductor.client.http.models.task_result_status import TaskResultStatus
+from conductor.client.worker.worker import Worker
+from tests.mock_conductor_server import MockConductorServer
+import time
+
+TASK_COUNT = 500
+LATENCIES_IN_SECONDS = [0, 0.001, 0.005]
+
+
+def execute(task: Task) -> TaskResult:
+    task_result = TaskResult(
+        task_id=task.task_id,
+        workflow_instance_id=task.workflow_instance_id,
+    )
+    task_result.status = TaskResultStatus.COMPLETED
+    return task_result
+
+
+def measure_task_runner_throughput(latency_seconds: float, task_count: int = TASK_COUNT) -> float:
+    """Tasks completed per second by a single TaskRunner against a server with the given latency"""
+    with MockConductorServer(latency_seconds=latency_seconds) as server:
+        server.enqueue_tasks('benchmark_task', task_count)
+        task_runner = TaskRunner(
+            worker=Worker('benchmark_task', execute, poll_interval=0),
+            configuration=server.get_configuration(),
+        )
+        start_time = time.perf_counter()
+        while server.stats['completed_tasks'] < task_count:
+            task_runner.run_once()
+        return task_count / (time.perf_counter() - start_time)
+
+
+if __name__ == '__main__':
+    for latency_seconds in LATENCIES_IN_SECONDS:
+        throughput = measure_task_runner_throughput(latency_seconds)
+        print(f'task_runner with {latency_seconds * 1000:.0f} ms latency: {throughput:.0f} tasks/s')
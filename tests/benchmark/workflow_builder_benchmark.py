@@ -0,0 +1,91 @@
+from conductor.client.configuration.configuration import Configuration
+from conductor.client.http.api_client import ApiClient
+from conductor.client.http.models.start_workflow_request import StartWorkflowRequest
+from conductor.client.workflow.conductor_workflow import ConductorWorkflow
+from conductor.client.workflow.task.do_while_task import LoopTask
+from conductor.client.workflow.task.fork_task import ForkTask
+from conductor.client.workflow.task.simple_task import SimpleTask
+from conductor.client.workflow.task.switch_task import SwitchTask
+from typing import Callable
+from unittest.mock import Mock
+import time
+
+TASK_COUNT = 5000
+BRANCH_SIZE = 10
+# Nested trees are compiled recursively, keep them well within the recursion limit
+COMPILE_TASK_COUNT = 1000
+
+
+def build_fork_tree(task_count: int = TASK_COUNT) -> ConductorWorkflow:
+    """Forks of BRANCH_SIZE branches, nested one inside the other"""
+    task = _get_simple_task(0)
+    for index in range(1, task_count, BRANCH_SIZE):
+        branches = [[task]]
+        for branch in range(1, BRANCH_SIZE):
+            branches.append([_get_simple_task(index + branch)])
+        task = ForkTask(f'fork_{index}', branches).freeze()
+    return _get_workflow().add(task)
+
+
+def build_switch_tree(task_count: int = TASK_COUNT) -> ConductorWorkflow:
+    """Switches with BRANCH_SIZE cases, nested in the default case"""
+    task = _get_simple_task(0)
+    for index in range(1, task_count, BRANCH_SIZE):
+        switch_task = SwitchTask(f'switch_{index}', '${workflow.input.case}')
+        for case in range(1, BRANCH_SIZE):
+            switch_task.switch_case(str(case), _get_simple_task(index + case))
+        task = switch_task.default_case(task).freeze()
+    return _get_workflow().add(task)
+
+
+def build_loop_tree(task_count: int = TASK_COUNT) -> ConductorWorkflow:
+    """Loops over BRANCH_SIZE tasks, nested one inside the other"""
+    task = _get_simple_task(0)
+    for index in range(1, task_count, BRANCH_SIZE):
+        tasks = [task]
+        for offset in range(1, BRANCH_SIZE):
+            tasks.append(_get_simple_task(index + offset))
+        task = LoopTask(f'loop_{index}', 2, tasks).freeze()
+    return _get_workflow().add(task)
+
+
+def build_flat_workflow(task_count: int = TASK_COUNT) -> ConductorWorkflow:
+    workflow = _get_workflow()
+    for index in range(task_count):
+        workflow >> _get_simple_task(index)
+    return workflow
+
+
+def measure(build: Callable[[], ConductorWorkflow]) -> float:
+    start_time = time.perf_counter()
+    build()
+    return time.perf_counter() - start_time
+
+
+def measure_start(workflow: ConductorWorkflow) -> float:
+    """Time spent compiling and serializing the definition of an inline start"""
+    start_time = time.perf_counter()
+    workflow.start_workflow(StartWorkflowRequest(name='benchmark_workflow'))
+    return time.perf_counter() - start_time
+
+
+def _get_workflow() -> ConductorWorkflow:
+    executor = Mock()
+    executor.workflow_client.api_client = ApiClient(Configuration())
+    return ConductorWorkflow(executor=executor, name='benchmark_workflow', immutable=True)
+
+
+def _get_simple_task(index: int) -> SimpleTask:
+    # Frozen tasks are shared by their parents, instead of being copied into each level of the tree
+    return SimpleTask('simple_task', f'simple_task_{index}').input(
+        'value', f'${{workflow.input.value_{index}}}'
+    ).freeze()
+
+
+if __name__ == '__main__':
+    for build in [build_flat_workflow, build_fork_tree, build_switch_tree, build_loop_tree]:
+        print(f'{build.__name__}: {measure(build) * 1000:.1f} ms for {TASK_COUNT} tasks')
+        workflow = build(COMPILE_TASK_COUNT)
+        first_start = measure_start(workflow)
+        cached_start = measure_start(workflow)
+        print(f'  start_workflow: {first_start * 1000:.1f} ms, then {cached_start * 1000:.1f} ms when cached, for {COMPILE_TASK_COUNT} tasks')
@@ -0,0 +1,479 @@
+from collections import deque
+from conductor.client.configuration.configuration import Configuration
+from conductor.client.configuration.settings.authentication_settings import AuthenticationSettings
+from conductor.client.http.api_client import ApiClient
+from conductor.client.http.models.workflow_def import WorkflowDef
+from conductor.client.workflow.task.task_type import TaskType
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Tuple
+from urllib.parse import parse_qs, urlparse
+import base64
+import gzip
+import json
+import logging
+import random
+import re
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(
+    Configuration.get_logging_formatted_name(
+        __name__
+    )
+)
+
+API_PREFIX = '/api'
+
+TERMINAL_TASK_STATUSES = ['COMPLETED', 'FAILED', 'FAILED_WITH_TERMINAL_ERROR']
+
+
+class MockConductorServer:
+    """Local stand-in for the Conductor server endpoints used by workers.
+
+    Serves task poll, batch poll and update, and workflow start and status,
+    over HTTP on localhost, so `TaskRunner`, `TaskHandler`,
+    `TaskResourceApi` and `WorkflowResourceApi` can be exercised end to end
+    without a real server.
+
+    Tasks are queued with `enqueue_tasks`, or created by starting workflows
+    whose definition is either inline in the start request or registered
+    with `register_workflow_def`. Workflows schedule their top level SIMPLE
+    tasks one after the other, with their input parameters as they are,
+    without resolving expressions; other task types are completed
+    immediately. Use `WorkflowSimulator` to test workflow semantics instead.
+
+    Every request is delayed by `latency_seconds` plus a random jitter of up
+    to `latency_jitter_seconds`, and fails with `error_status` with
+    probability `error_rate`, or deterministically through `inject_errors`.
+
+    With `token_ttl_seconds`, requests must be authenticated with a token
+    from the token endpoint, which expires after that many seconds, or when
+    revoked with `revoke_tokens`, and are rejected with 401 otherwise.
+    """
+
+    def __init__(
+        self,
+        port: int = 0,
+        latency_seconds: float = 0,
+        latency_jitter_seconds: float = 0,
+        error_rate: float = 0,
+        error_status: int = 500,
+        seed: int = None,
+        token_ttl_seconds: float = None,
+    ):
+        self.latency_seconds = latency_seconds
+        self.latency_jitter_seconds = latency_jitter_seconds
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.token_ttl_seconds = token_ttl_seconds
+        self._random = random.Random(seed)
+        self._api_client = ApiClient(Configuration())
+        self._lock = threading.Condition()
+        # Number of anonymous tasks left in each queue, created on poll
+        self._queued_task_counts = {}
+        # Tasks scheduled by workflows, waiting to be polled
+        self._queued_tasks = {}
+        self._tasks = {}
+        self._workflows = {}
+        self._workflow_defs = {}
+        self._injected_errors = deque()
+        # Expiry time of each valid token
+        self._tokens = {}
+        self.stats = {
+            'requests': 0,
+            'polls': 0,
+            'empty_polls': 0,
+            'polled_tasks': 0,
+            'updates': 0,
+            'completed_tasks': 0,
+            'started_workflows': 0,
+            'injected_errors': 0,
+            'issued_tokens': 0,
+            'unauthorized_requests': 0,
+        }
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), _get_request_handler(self))
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.port}{API_PREFIX}'
+
+    def get_configuration(self) -> Configuration:
+        authentication_settings = None
+        if self.token_ttl_seconds is not None:
+            authentication_settings = AuthenticationSettings(key_id='key_id', key_secret='key_secret')
+        return Configuration(server_api_url=self.url, authentication_settings=authentication_settings)
+
+    def start(self) -> 'MockConductorServer':
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        logger.debug(f'Started mock Conductor server at {self.url}')
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> 'MockConductorServer':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+    def enqueue_tasks(self, task_type: str, count: int) -> None:
+        """Queues `count` tasks of `task_type`, which are not part of any workflow"""
+        with self._lock:
+            self._queued_task_counts[task_type] = self._queued_task_counts.get(task_type, 0) + count
+            self._lock.notify_all()
+
+    def get_queue_depth(self, task_type: str) -> int:
+        with self._lock:
+            return self._queued_task_counts.get(task_type, 0) + len(self._queued_tasks.get(task_type, []))
+
+    def register_workflow_def(self, workflow_def: WorkflowDef) -> None:
+        serialized_workflow_def = self._api_client.sanitize_for_serialization(workflow_def)
+        with self._lock:
+            self._workflow_defs[workflow_def.name] = serialized_workflow_def
+
+    def inject_errors(self, count: int, status: int = 500, path_prefix: str = '') -> None:
+        """Fails the next `count` requests whose path, without the `/api` prefix, starts with `path_prefix`"""
+        with self._lock:
+            for _ in range(count):
+                self._injected_errors.append((path_prefix, status))
+
+    def revoke_tokens(self) -> None:
+        with self._lock:
+            self._tokens.clear()
+
+    def get_workflow(self, workflow_id: str) -> Dict[str, Any]:
+        """Returns the workflow as served by the status endpoint"""
+        with self._lock:
+            workflow = self._workflows.get(workflow_id)
+            if workflow is None:
+                return None
+            return self.__get_workflow_json(workflow)
+
+    def handle(self, method: str, path: str, query: Dict[str, str], body: Any, token: str = None) -> Tuple[int, Any]:
+        self.__simulate_latency()
+        with self._lock:
+            self.stats['requests'] += 1
+            error_status = self.__get_injected_error(path)
+            authorized = path == '/token' or self.__is_authorized(token)
+            if not authorized:
+                self.stats['unauthorized_requests'] += 1
+        if error_status is not None:
+            return error_status, {'message': 'injected error'}
+        if not authorized:
+            return 401, {'message': 'invalid or expired token'}
+        for route_method, pattern, handler in ROUTES:
+            if method != route_method:
+                continue
+            match = pattern.fullmatch(path)
+            if match is not None:
+                return handler(self, query, body, *match.groups())
+        return 404, {'message': f'no mock for {method} {path}'}
+
+    def _generate_token(self, query: Dict[str, str], body: Any) -> Tuple[int, Any]:
+        expiry = time.time() + (self.token_ttl_seconds or 0)
+        claims = json.dumps({'exp': expiry, 'jti': uuid.uuid4().hex}).encode('utf-8')
+        token = f'e30.{base64.urlsafe_b64encode(claims).decode("ascii").rstrip("=")}.'
+        with self._lock:
+            self._tokens[token] = expiry
+            self.stats['issued_tokens'] += 1
+        return 200, {'token': token}
+
+    def _poll(self, query: Dict[str, str], body: Any, task_type: str) -> Tuple[int, Any]:
+        tasks = self.__poll_tasks(task_type, 1, query.get('workerid'), 0)
+        if len(tasks) == 0:
+            return 204, None
+        return 200, tasks[0]
+
+    def _batch_poll(self, query: Dict[str, str], body: Any, task_type: str) -> Tuple[int, Any]:
+        count = int(query.get('count', 1))
+        timeout_seconds = int(query.get('timeout', 100)) / 1000
+        return 200, self.__poll_tasks(task_type, count, query.get('workerid'), timeout_seconds)
+
+    def _update_task(self, query: Dict[str, str], body: Any) -> Tuple[int, Any]:
+        task_id = body.get('taskId')
+        with self._lock:
+            self.stats['updates'] += 1
+            task = self._tasks.get(task_id)
+            if task is None:
+                return 404, {'message': f'task {task_id} not found'}
+            status = body.get('status')
+            task['status'] = status
+            task['outputData'] = body.get('outputData') or {}
+            task['reasonForIncompletion'] = body.get('reasonForIncompletion')
+            task['updateTime'] = _get_time_millis()
+            if status in TERMINAL_TASK_STATUSES:
+                task['endTime'] = task['updateTime']
+            if status == 'COMPLETED':
+                self.stats['completed_tasks'] += 1
+            elif status == 'IN_PROGRESS':
+                self.__queue_task(task)
+            workflow = self._workflows.get(task.get('workflowInstanceId'))
+            if workflow is None and status in TERMINAL_TASK_STATUSES:
+                # Tasks that are not part of a workflow are not needed anymore
+                del self._tasks[task_id]
+            elif workflow is not None and status in TERMINAL_TASK_STATUSES:
+                if status == 'COMPLETED':
+                    self.__schedule_next_task(workflow)
+                else:
+                    workflow['status'] = 'FAILED'
+                    workflow['reasonForIncompletion'] = task['reasonForIncompletion']
+                    workflow['endTime'] = _get_time_millis()
+        return 200, task_id
+
+    def _start_workflow(self, query: Dict[str, str], body: Any) -> Tuple[int, Any]:
+        return 200, self.__start_workflow(
+            body.get('name'), body.get('input') or {}, body.get('correlationId'), body.get('workflowDef')
+        )
+
+    def _start_workflow_by_name(self, query: Dict[str, str], body: Any, name: str) -> Tuple[int, Any]:
+        return 200, self.__start_workflow(name, body or {}, query.get('correlationId'), None)
+
+    def _get_workflow(self, query: Dict[str, str], body: Any, workflow_id: str) -> Tuple[int, Any]:
+        with self._lock:
+            workflow = self._workflows.get(workflow_id)
+            if workflow is None:
+                return 404, {'message': f'workflow {workflow_id} not found'}
+            workflow_json = self.__get_workflow_json(workflow)
+        if query.get('includeTasks', 'true') == 'false':
+            workflow_json['tasks'] = []
+        return 200, workflow_json
+
+    def _get_workflow_status(self, query: Dict[str, str], body: Any, workflow_id: str) -> Tuple[int, Any]:
+        with self._lock:
+            workflow = self._workflows.get(workflow_id)
+            if workflow is None:
+                return 404, {'message': f'workflow {workflow_id} not found'}
+            return 200, {
+                'workflowId': workflow['workflowId'],
+                'correlationId': workflow.get('correlationId'),
+                'status': workflow['status'],
+                'output': workflow.get('output') or {},
+                'variables': workflow.get('variables') or {},
+            }
+
+    def _get_queue_sizes(self, query: Dict[str, str], body: Any) -> Tuple[int, Any]:
+        task_types = query.get('taskType', '')
+        return 200, {
+            task_type: self.get_queue_depth(task_type) for task_type in task_types.split(',') if task_type
+        }
+
+    def __poll_tasks(self, task_type: str, count: int, worker_id: str, timeout_seconds: float) -> List[Dict]:
+        deadline = time.monotonic() + timeout_seconds
+        polled_tasks = []
+        with self._lock:
+            self.stats['polls'] += 1
+            while True:
+                while len(polled_tasks) < count:
+                    task = self.__dequeue_task(task_type)
+                    if task is None:
+                        break
+                    task['status'] = 'IN_PROGRESS'
+                    task['workerId'] = worker_id
+                    task['startTime'] = _get_time_millis()
+                    task['pollCount'] = task.get('pollCount', 0) + 1
+                    polled_tasks.append(dict(task))
+                remaining = deadline - time.monotonic()
+                if len(polled_tasks) > 0 or remaining <= 0:
+                    break
+                self._lock.wait(remaining)
+            self.stats['polled_tasks'] += len(polled_tasks)
+            if len(polled_tasks) == 0:
+                self.stats['empty_polls'] += 1
+        return polled_tasks
+
+    def __dequeue_task(self, task_type: str) -> Dict:
+        queued_tasks = self._queued_tasks.get(task_type)
+        if queued_tasks:
+            return queued_tasks.popleft()
+        if self._queued_task_counts.get(task_type, 0) > 0:
+            self._queued_task_counts[task_type] -= 1
+            return self.__create_task(task_type, task_type, None, {})
+        return None
+
+    def __create_task(self, task_type: str, reference_name: str, workflow: Dict, input_data: Dict) -> Dict:
+        task = {
+            'taskId': str(uuid.uuid4()),
+            'taskType': task_type,
+            'taskDefName': task_type,
+            'referenceTaskName': reference_name,
+            'status': 'SCHEDULED',
+            'inputData': input_data,
+            'scheduledTime': _get_time_millis(),
+            'retryCount': 0,
+            'pollCount': 0,
+        }
+        if workflow is not None:
+            task['workflowInstanceId'] = workflow['workflowId']
+            task['workflowType'] = workflow['workflowName']
+            task['correlationId'] = workflow.get('correlationId')
+            task['seq'] = len(workflow['tasks']) + 1
+            workflow['tasks'].append(task['taskId'])
+        self._tasks[task['taskId']] = task
+        return task
+
+    def __queue_task(self, task: Dict) -> None:
+        task_type = task['taskDefName']
+        if task_type not in self._queued_tasks:
+            self._queued_tasks[task_type] = deque()
+        self._queued_tasks[task_type].append(task)
+        self._lock.notify_all()
+
+    def __start_workflow(self, name: str, workflow_input: Dict, correlation_id: str, workflow_def: Dict) -> str:
+        with self._lock:
+            self.stats['started_workflows'] += 1
+            workflow_def = workflow_def or self._workflow_defs.get(name) or {'name': name, 'tasks': []}
+            workflow = {
+                'workflowId': str(uuid.uuid4()),
+                'workflowName': name,
+                'workflowVersion': workflow_def.get('version'),
+                'correlationId': correlation_id,
+                'input': workflow_input,
+                'status': 'RUNNING',
+                'startTime': _get_time_millis(),
+                'tasks': [],
+                # Workflow tasks that were not scheduled yet
+                'pending': deque(workflow_def.get('tasks') or []),
+            }
+            self._workflows[workflow['workflowId']] = workflow
+            self.__schedule_next_task(workflow)
+            return workflow['workflowId']
+
+    def __schedule_next_task(self, workflow: Dict) -> None:
+        pending = workflow['pending']
+        while len(pending) > 0:
+            workflow_task = pending.popleft()
+            task = self.__create_task(
+                workflow_task.get('name'),
+                workflow_task.get('taskReferenceName'),
+                workflow,
+                workflow_task.get('inputParameters') or {},
+            )
+            if workflow_task.get('type', TaskType.SIMPLE.value) == TaskType.SIMPLE.value:
+                self.__queue_task(task)
+                return
+            task['status'] = 'COMPLETED'
+            task['endTime'] = _get_time_millis()
+        last_task_id = workflow['tasks'][-1] if len(workflow['tasks']) > 0 else None
+        workflow['status'] = 'COMPLETED'
+        workflow['output'] = self._tasks[last_task_id].get('outputData') or {} if last_task_id else {}
+        workflow['endTime'] = _get_time_millis()
+
+    def __get_workflow_json(self, workflow: Dict) -> Dict:
+        workflow_json = {key: value for key, value in workflow.items() if key != 'pending'}
+        workflow_json['tasks'] = [dict(self._tasks[task_id]) for task_id in workflow['tasks']]
+        return workflow_json
+
+    def __is_authorized(self, token: str) -> bool:
+        if self.token_ttl_seconds is None:
+            return True
+        expiry = self._tokens.get(token)
+        return expiry is not None and time.time() < expiry
+
+    def __get_injected_error(self, path: str) -> int:
+        for index, (path_prefix, status) in enumerate(self._injected_errors):
+            if path.startswith(path_prefix):
+                del self._injected_errors[index]
+                self.stats['injected_errors'] += 1
+                return status
+        if self.error_rate > 0 and self._random.random() < self.error_rate:
+            self.stats['injected_errors'] += 1
+            return self.error_status
+        return None
+
+    def __simulate_latency(self) -> None:
+        latency = self.latency_seconds
+        if self.latency_jitter_seconds > 0:
+            with self._lock:
+                latency += self._random.uniform(0, self.latency_jitter_seconds)
+        if latency > 0:
+            time.sleep(latency)
+
+
+ROUTES = [
+    ('POST', re.compile(r'/token'), MockConductorServer._generate_token),
+    ('GET', re.compile(r'/tasks/poll/batch/([^/]+)'), MockConductorServer._batch_poll),
+    ('GET', re.compile(r'/tasks/poll/([^/]+)'), MockConductorServer._poll),
+    ('GET', re.compile(r'/tasks/queue/sizes'), MockConductorServer._get_queue_sizes),
+    ('POST', re.compile(r'/tasks'), MockConductorServer._update_task),
+    ('POST', re.compile(r'/workflow'), MockConductorServer._start_workflow),
+    ('POST', re.compile(r'/workflow/([^/]+)'), MockConductorServer._start_workflow_by_name),
+    ('GET', re.compile(r'/workflow/([^/]+)/status'), MockConductorServer._get_workflow_status),
+    ('GET', re.compile(r'/workflow/([^/]+)'), MockConductorServer._get_workflow),
+]
+
+
+def _get_request_handler(server: MockConductorServer) -> type:
+    class RequestHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        # Headers and body are written separately, which stalls keep-alive
+        # connections on delayed ACKs unless Nagle's algorithm is disabled
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            self.__handle('GET')
+
+        def do_POST(self):
+            self.__handle('POST')
+
+        def __handle(self, method: str) -> None:
+            parsed_url = urlparse(self.path)
+            path = parsed_url.path
+            if path.startswith(API_PREFIX):
+                path = path[len(API_PREFIX):]
+            query = {key: values[-1] for key, values in parse_qs(parsed_url.query).items()}
+            body = None
+            content_length = int(self.headers.get('Content-Length', 0))
+            if content_length > 0:
+                body = json.loads(_decode(self.rfile.read(content_length), self.headers.get('Content-Encoding')))
+            try:
+                status, response = server.handle(method, path, query, body, self.headers.get('X-Authorization'))
+            except Exception as e:
+                logger.debug(f'Mock Conductor server failed to handle {method} {path}, reason: {e}')
+                status, response = 500, {'message': str(e)}
+            self.__respond(status, response)
+
+        def __respond(self, status: int, response: Any) -> None:
+            data = b''
+            if response is not None:
+                if isinstance(response, str):
+                    data = response.encode('utf-8')
+                    content_type = 'text/plain'
+                else:
+                    data = json.dumps(response).encode('utf-8')
+                    content_type = 'application/json'
+            self.send_response(status)
+            if len(data) > 0:
+                self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format: str, *args) -> None:
+            logger.debug(format % args)
+
+    return RequestHandler
+
+
+def _decode(data: bytes, content_encoding: str) -> bytes:
+    if content_encoding == 'gzip':
+        return gzip.decompress(data)
+    if content_encoding == 'zstd':
+        import zstandard
+        return zstandard.ZstdDecompressor().decompress(data)
+    return data
+
+
+def _get_time_millis() -> int:
+    return int(time.time() * 1000)
@@ -0,0 +1,153 @@
+from conductor.client.automator.task_runner import TaskRunner
+from conductor.client.http.api.task_resource_api import TaskResourceApi
+from conductor.client.http.api_client import ApiClient
+from conductor.client.http.auth_token_manager import AuthTokenManager, get_token_expiry
+from tests.mock_conductor_server import MockConductorServer
+from tests.unit.resources.workers import ClassWorker
+import base64
+import json
+import logging
+import multiprocessing
+import os
+import pickle
+import tempfile
+import time
+import unittest
+
+
+def get_token(expiry: float) -> str:
+    claims = base64.urlsafe_b64encode(json.dumps({'exp': expiry}).encode('utf-8')).decode('ascii').rstrip('=')
+    return f'e30.{claims}.'
+
+
+class TokenFetcher:
+    def __init__(self, ttl_seconds: float = 60):
+        self.ttl_seconds = ttl_seconds
+        self.count = 0
+        self.failing = False
+
+    def __call__(self) -> str:
+        if self.failing:
+            raise Exception('failure')
+        self.count += 1
+        return get_token(time.time() + self.ttl_seconds + self.count / 1000)
+
+
+def poll_with_new_client(configuration) -> None:
+    TaskResourceApi(ApiClient(configuration)).poll('authenticated_task')
+
+
+def run_task_runner_once(task_runner: TaskRunner) -> None:
+    task_runner.run_once()
+
+
+class TestAuthTokenManager(unittest.TestCase):
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_token_expiry(self):
+        self.assertEqual(get_token_expiry(get_token(1234)), 1234)
+        self.assertIsNone(get_token_expiry('opaque'))
+        self.assertIsNone(get_token_expiry('e30.e30.'))
+
+    def test_refreshes_before_expiry(self):
+        fetch_token = TokenFetcher(ttl_seconds=0.5)
+        auth_token_manager = AuthTokenManager(fetch_token)
+        token = auth_token_manager.get_token()
+        self.assertEqual(auth_token_manager.get_token(), token)
+        self.assertEqual(fetch_token.count, 1)
+        time.sleep(0.41)
+        self.assertNotEqual(auth_token_manager.get_token(), token)
+        self.assertEqual(fetch_token.count, 2)
+
+    def test_invalidate_refreshes_once(self):
+        fetch_token = TokenFetcher()
+        auth_token_manager = AuthTokenManager(fetch_token)
+        rejected_token = auth_token_manager.get_token()
+        auth_token_manager.invalidate(rejected_token)
+        auth_token_manager.invalidate(rejected_token)
+        self.assertEqual(fetch_token.count, 2)
+        self.assertNotEqual(auth_token_manager.get_token(), rejected_token)
+
+    def test_keeps_token_when_refresh_fails(self):
+        fetch_token = TokenFetcher()
+        auth_token_manager = AuthTokenManager(fetch_token, retry_interval=60)
+        token = auth_token_manager.get_token()
+        fetch_token.failing = True
+        auth_token_manager.invalidate(token)
+        self.assertEqual(auth_token_manager.get_token(), token)
+
+    def test_shares_token_through_cache_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache_file_path = os.path.join(directory, 'tokens', 'token.json')
+            first_fetch_token = TokenFetcher()
+            second_fetch_token = TokenFetcher()
+            first = AuthTokenManager(first_fetch_token, cache_file_path)
+            second = AuthTokenManager(second_fetch_token, cache_file_path)
+            token = first.get_token()
+            self.assertEqual(second.get_token(), token)
+            second.invalidate(token)
+            self.assertEqual(first.get_token(), token)
+            first.invalidate(token)
+            self.assertEqual(first.get_token(), second.get_token())
+            self.assertEqual((first_fetch_token.count, second_fetch_token.count), (1, 1))
+            self.assertEqual(os.stat(cache_file_path).st_mode & 0o777, 0o600)
+
+    def test_api_client_retries_once_with_new_token(self):
+        with MockConductorServer(token_ttl_seconds=60) as server:
+            server.enqueue_tasks('authenticated_task', 2)
+            task_client = TaskResourceApi(ApiClient(server.get_configuration()))
+            self.assertIsNotNone(task_client.poll('authenticated_task').task_id)
+            server.revoke_tokens()
+            self.assertIsNotNone(task_client.poll('authenticated_task').task_id)
+            self.assertEqual(server.stats['issued_tokens'], 2)
+            self.assertEqual(server.stats['unauthorized_requests'], 1)
+
+    def test_api_client_refreshes_token_before_expiry(self):
+        with MockConductorServer(token_ttl_seconds=0.5) as server:
+            task_client = TaskResourceApi(ApiClient(server.get_configuration()))
+            task_client.poll('authenticated_task')
+            time.sleep(0.41)
+            task_client.poll('authenticated_task')
+            self.assertEqual(server.stats['issued_tokens'], 2)
+            self.assertEqual(server.stats['unauthorized_requests'], 0)
+
+    @unittest.skipUnless(hasattr(os, 'fork'), 'requires fork')
+    def test_processes_share_one_token(self):
+        with MockConductorServer(token_ttl_seconds=60) as server, tempfile.TemporaryDirectory() as directory:
+            configuration = server.get_configuration()
+            configuration.auth_token_cache_directory = directory
+            context = multiprocessing.get_context('fork')
+            processes = [context.Process(target=poll_with_new_client, args=(configuration,)) for _ in range(4)]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+            self.assertEqual([process.exitcode for process in processes], [0] * 4)
+            self.assertEqual(server.stats['issued_tokens'], 1)
+            self.assertEqual(server.stats['unauthorized_requests'], 0)
+
+    def test_pickled_manager_keeps_token_only(self):
+        fetch_token = TokenFetcher()
+        auth_token_manager = AuthTokenManager(fetch_token)
+        token = auth_token_manager.get_token()
+        unpickled_auth_token_manager = pickle.loads(pickle.dumps(auth_token_manager))
+        self.assertEqual(unpickled_auth_token_manager.get_token(), token)
+        unpickled_auth_token_manager.invalidate(token)
+        self.assertNotEqual(unpickled_auth_token_manager.get_token(), token)
+
+    def test_authenticated_task_runner_runs_in_spawned_process(self):
+        with MockConductorServer(token_ttl_seconds=60) as server:
+            server.enqueue_tasks('authenticated_task', 1)
+            task_runner = TaskRunner(ClassWorker('authenticated_task'), server.get_configuration())
+            pickle.dumps(task_runner)
+            process = multiprocessing.get_context('spawn').Process(target=run_task_runner_once, args=(task_runner,))
+            process.start()
+            process.join()
+            self.assertEqual(process.exitcode, 0)
+            self.assertEqual(server.stats['completed_tasks'], 1)
+            # The token is sent along with the runner instead of being requested again
+            self.assertEqual(server.stats['issued_tokens'], 1)
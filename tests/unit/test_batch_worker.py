@@ -0,0 +1,75 @@
+from conductor.client.automator.task_runner import TaskRunner
+from conductor.client.http.models.task import Task
+from conductor.client.http.models.task_result import TaskResult
+from conductor.client.http.models.task_result_status import TaskResultStatus
+from conductor.client.worker.batch_worker import BatchWorker
+from tests.mock_conductor_server import MockConductorServer
+from typing import List
+from unittest.mock import Mock
+import logging
+import unittest
+
+
+class TestBatchWorker(unittest.TestCase):
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.server = MockConductorServer().start()
+
+    def tearDown(self):
+        self.server.stop()
+        logging.disable(logging.NOTSET)
+
+    def test_executes_polled_tasks_in_batches(self):
+        batch_sizes = []
+
+        def execute_batch(tasks: List[Task]) -> list:
+            batch_sizes.append(len(tasks))
+            return [{'task_id': task.task_id} for task in tasks]
+
+        self.server.enqueue_tasks('batch_task', 5)
+        task_runner = TaskRunner(
+            worker=BatchWorker('batch_task', execute_batch, batch_size=3, batch_wait_seconds=0.01, poll_interval=0),
+            configuration=self.server.get_configuration(),
+        )
+        task_runner.run_once()
+        task_runner.run_once()
+        self.assertEqual(batch_sizes, [3, 2])
+        self.assertEqual(self.server.stats['completed_tasks'], 5)
+        self.assertEqual(self.server.get_queue_depth('batch_task'), 0)
+
+    def test_reports_result_of_each_task(self):
+        def execute_batch(tasks: List[Task]) -> list:
+            task_result = TaskResult()
+            task_result.status = TaskResultStatus.FAILED
+            task_result.reason_for_incompletion = 'rejected'
+            return [task_result, {'value': 1}]
+
+        self.server.enqueue_tasks('batch_task', 2)
+        task_runner = TaskRunner(
+            worker=BatchWorker('batch_task', execute_batch, batch_size=2, poll_interval=0),
+            configuration=self.server.get_configuration(),
+        )
+        task_runner.run_once()
+        self.assertEqual(self.server.stats['completed_tasks'], 1)
+        self.assertEqual(self.server.stats['updates'], 2)
+
+    def test_fails_every_task_of_a_failed_batch(self):
+        execute_batch = Mock(side_effect=Exception('out of memory'))
+        self.server.enqueue_tasks('batch_task', 3)
+        task_runner = TaskRunner(
+            worker=BatchWorker('batch_task', execute_batch, batch_size=3, poll_interval=0),
+            configuration=self.server.get_configuration(),
+        )
+        task_runner.metrics_collector = Mock()
+        task_runner.run_once()
+        execute_batch.assert_called_once()
+        self.assertEqual(self.server.stats['updates'], 3)
+        self.assertEqual(self.server.stats['completed_tasks'], 0)
+        task_runner.metrics_collector.increment_task_execution_error.assert_called_once()
+        task_runner.metrics_collector.record_task_execute_time.assert_not_called()
+
+    def test_rejects_results_of_the_wrong_length(self):
+        worker = BatchWorker('batch_task', lambda tasks: [{}])
+        with self.assertRaises(Exception):
+            worker.execute_batch([Task(task_id='first'), Task(task_id='second')])
+        self.assertEqual(worker.execute(Task(task_id='first')).task_id, 'first')
@@ -0,0 +1,27 @@
+from tests.benchmark.benchmark_suite import find_regressions
+import unittest
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+    def test_find_regressions(self):
+        baseline = _get_results(throughput=100, duration=1.0)
+        self.assertEqual(
+            find_regressions(_get_results(throughput=85, duration=1.1), baseline, 0.2), []
+        )
+        regressions = find_regressions(_get_results(throughput=70, duration=1.5), baseline, 0.2)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith('throughput: 70'))
+        self.assertTrue(regressions[1].startswith('duration: 1.5'))
+
+    def test_ignores_benchmarks_missing_from_results(self):
+        results = {'benchmarks': {}}
+        self.assertEqual(find_regressions(results, _get_results(100, 1.0)), [])
+
+
+def _get_results(throughput: float, duration: float) -> dict:
+    return {
+        'benchmarks': {
+            'throughput': {'value': throughput, 'unit': 'ops/s', 'higher_is_better': True},
+            'duration': {'value': duration, 'unit': 's', 'higher_is_better': False},
+        }
+    }
@@ -0,0 +1,111 @@
+from conductor.client.configuration.configuration import Configuration
+from conductor.client.http.api.workflow_bulk_resource_api import WorkflowBulkResourceApi
+from conductor.client.http.models.bulk_response import BulkResponse
+from conductor.client.http.models.workflow_summary import WorkflowSummary
+from conductor.client.workflow.executor.bulk_operation_manager import BulkOperationManager, get_chunks, get_workflow_ids
+from unittest.mock import patch
+import logging
+import unittest
+
+
+class TestBulkOperationManager(unittest.TestCase):
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_get_chunks(self):
+        chunks = list(get_chunks(range(7), 3))
+        self.assertEqual(chunks, [[0, 1, 2], [3, 4, 5], [6]])
+
+    def test_merges_chunk_responses(self):
+        workflow_ids = [f'workflow_{i}' for i in range(25)]
+        with patch.object(
+            WorkflowBulkResourceApi,
+            'pause_workflow',
+            side_effect=_get_bulk_response
+        ) as pause_workflow:
+            report = _get_bulk_operation_manager().pause(iter(workflow_ids))
+            self.assertEqual(pause_workflow.call_count, 3)
+        self.assertEqual(
+            sorted(report.bulk_successful_results),
+            sorted(workflow_ids[:-1])
+        )
+        self.assertEqual(
+            report.bulk_error_results,
+            {'workflow_24': 'not found'}
+        )
+
+    def test_retries_failed_chunks(self):
+        with patch.object(
+            WorkflowBulkResourceApi,
+            'terminate',
+            side_effect=[Exception('timeout'), _get_bulk_response(['a'])]
+        ) as terminate:
+            report = _get_bulk_operation_manager().terminate(
+                ['a'], reason='cleanup'
+            )
+            self.assertEqual(terminate.call_count, 2)
+            terminate.assert_called_with(body=['a'], reason='cleanup')
+        self.assertEqual(report.bulk_successful_results, ['a'])
+        self.assertEqual(report.bulk_error_results, {})
+
+    def test_reports_chunk_failing_every_attempt(self):
+        with patch.object(
+            WorkflowBulkResourceApi,
+            'resume_workflow',
+            side_effect=Exception('unavailable')
+        ) as resume_workflow:
+            report = _get_bulk_operation_manager().resume(['a', 'b'])
+            self.assertEqual(resume_workflow.call_count, 3)
+        self.assertEqual(report.bulk_successful_results, [])
+        self.assertEqual(
+            report.bulk_error_results,
+            {'a': 'unavailable', 'b': 'unavailable'}
+        )
+
+    def test_does_not_retry_non_idempotent_operations(self):
+        with patch.object(
+            WorkflowBulkResourceApi,
+            'retry',
+            side_effect=Exception('timeout')
+        ) as retry:
+            report = _get_bulk_operation_manager().retry(['a', 'b'])
+            self.assertEqual(retry.call_count, 1)
+        self.assertEqual(
+            report.bulk_error_results,
+            {'a': 'timeout', 'b': 'timeout'}
+        )
+
+    def test_rejects_negative_retries(self):
+        with self.assertRaises(Exception):
+            BulkOperationManager(Configuration(), max_retries=-1)
+
+    def test_get_workflow_ids(self):
+        search_results = [
+            WorkflowSummary(workflow_id='a'),
+            WorkflowSummary(workflow_id='b'),
+        ]
+        self.assertEqual(list(get_workflow_ids(search_results)), ['a', 'b'])
+
+
+def _get_bulk_operation_manager() -> BulkOperationManager:
+    return BulkOperationManager(
+        Configuration(),
+        chunk_size=10,
+        max_workers=2,
+        max_retries=2,
+        retry_backoff_seconds=0,
+    )
+
+
+def _get_bulk_response(body, **kwargs) -> BulkResponse:
+    return BulkResponse(
+        bulk_successful_results=[
+            workflow_id for workflow_id in body if workflow_id != 'workflow_24'
+        ],
+        bulk_error_results={
+            workflow_id: 'not found' for workflow_id in body if workflow_id == 'workflow_24'
+        },
+    )
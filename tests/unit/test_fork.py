@@ -0,0 +1,46 @@
+from conductor.client.helpers import fork
+from conductor.client.helpers.fork import register_after_fork_in_child
+import gc
+import os
+import unittest
+import weakref
+
+
+class ForkAware:
+    def __init__(self):
+        self.pid = os.getpid()
+        register_after_fork_in_child(self.reset)
+
+    def reset(self):
+        self.pid = os.getpid()
+
+
+@unittest.skipUnless(hasattr(os, 'register_at_fork'), 'fork is not supported')
+class TestRegisterAfterForkInChild(unittest.TestCase):
+    def test_method_runs_in_forked_children(self):
+        instance = ForkAware()
+        read_end, write_end = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.write(write_end, b'1' if instance.pid == os.getpid() else b'0')
+            os._exit(0)
+        os.close(write_end)
+        os.waitpid(pid, 0)
+        with os.fdopen(read_end, 'rb') as pipe:
+            self.assertEqual(pipe.read(), b'1')
+        self.assertEqual(instance.pid, os.getpid())
+
+    def test_registering_does_not_keep_the_instance_alive(self):
+        instance = ForkAware()
+        reference = weakref.ref(instance)
+        del instance
+        gc.collect()
+        self.assertIsNone(reference())
+
+    def test_registrations_are_dropped_with_their_instance(self):
+        registration_count = len(fork._after_fork_in_child_methods)
+        instances = [ForkAware() for _ in range(100)]
+        self.assertEqual(len(fork._after_fork_in_child_methods), registration_count + 100)
+        del instances
+        gc.collect()
+        self.assertEqual(len(fork._after_fork_in_child_methods), registration_count)
@@ -0,0 +1,113 @@
+from conductor.client.http.api.metadata_resource_api import MetadataResourceApi
+from conductor.client.http.api.task_resource_api import TaskResourceApi
+from conductor.client.http.api_client import ApiClient
+from conductor.client.http.json_stream import iter_json_items
+from conductor.client.http.models.task_def import TaskDef
+from conductor.client.http.rest import RESTResponse
+from conductor.client.http.streaming import iter_all_verbose, iter_all_workflows
+from unittest.mock import patch
+import io
+import json
+import requests
+import tracemalloc
+import unittest
+
+
+def get_chunks(text: str, chunk_size: int):
+    data = text.encode('utf-8')
+    return [data[i:i + chunk_size] for i in range(0, len(data), chunk_size)]
+
+
+def get_response(data: bytes) -> RESTResponse:
+    response = requests.Response()
+    response.status_code = 200
+    response.raw = io.BytesIO(data)
+    return RESTResponse(response)
+
+
+class TestJsonStream(unittest.TestCase):
+    def test_array_split_at_every_position(self):
+        items = [{'name': 'ünïcode', 'values': [1, 2.5, None]}, 12345, 'text', True, [], {}]
+        text = f' {json.dumps(items)} '
+        for chunk_size in range(1, 12):
+            self.assertEqual(list(iter_json_items(get_chunks(text, chunk_size))), items)
+
+    def test_object_items(self):
+        document = {'first': {'count': 1}, 'second': 1e10}
+        text = json.dumps(document)
+        for chunk_size in (1, 3, 1024):
+            self.assertEqual(dict(iter_json_items(get_chunks(text, chunk_size))), document)
+
+    def test_items_at_key(self):
+        text = json.dumps({'totalHits': 2, 'skipped': {'results': [0]}, 'results': [1, 2], 'after': 3})
+        for chunk_size in (1, 5, 1024):
+            self.assertEqual(list(iter_json_items(get_chunks(text, chunk_size), 'results')), [1, 2])
+        self.assertEqual(list(iter_json_items(get_chunks(text, 4), 'missing')), [])
+
+    def test_fields_around_key(self):
+        text = json.dumps({'totalHits': 2, 'results': [1, 2], 'queryId': 'scroll-id'})
+        for chunk_size in (1, 5, 1024):
+            fields = {}
+            items = iter_json_items(get_chunks(text, chunk_size), 'results', fields)
+            self.assertEqual(next(items), 1)
+            self.assertEqual(fields, {'totalHits': 2})
+            self.assertEqual(list(items), [2])
+            self.assertEqual(fields, {'totalHits': 2, 'queryId': 'scroll-id'})
+
+    def test_empty_documents(self):
+        for text in ('[]', ' [ ] ', '{}', 'null', '{"results": null}'):
+            self.assertEqual(list(iter_json_items(get_chunks(text, 1), 'results' if 'results' in text else None)), [])
+
+    def test_invalid_documents(self):
+        for text in ('', '[1, 2', '[1 2]', '[{"name": ]', '{"a" 1}'):
+            with self.assertRaises(ValueError):
+                list(iter_json_items(get_chunks(text, 2)))
+
+    def test_memory_is_bounded_by_item_size(self):
+        item = json.dumps({'name': 'x' * 100, 'values': list(range(20))})
+
+        def get_body_chunks():
+            yield b'['
+            for i in range(20000):
+                yield (',' if i > 0 else '').encode('utf-8') + item.encode('utf-8')
+            yield b']'
+
+        tracemalloc.start()
+        try:
+            count = sum(1 for _ in iter_json_items(get_body_chunks()))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(count, 20000)
+        # The whole body is about 4.5MB
+        self.assertLess(peak, 256 * 1024)
+
+    def test_deserialize_stream(self):
+        api_client = ApiClient()
+        task_defs = [TaskDef(name=f'task_{i}', retry_count=i) for i in range(3)]
+        body = json.dumps(api_client.sanitize_for_serialization(task_defs)).encode('utf-8')
+        response = get_response(body)
+        streamed = list(api_client.deserialize_stream(response, 'list[TaskDef]'))
+        self.assertEqual([task_def.name for task_def in streamed], ['task_0', 'task_1', 'task_2'])
+        self.assertEqual([task_def.retry_count for task_def in streamed], [0, 1, 2])
+        self.assertTrue(response.resp.raw.closed)
+        response = get_response(b'{"queue": {"shard": {"size": 1}}}')
+        self.assertEqual(
+            list(api_client.deserialize_stream(response, 'dict(str, dict(str, dict(str, int)))')),
+            [('queue', {'shard': {'size': 1}})]
+        )
+
+    def test_streaming_wrappers(self):
+        metadata_client = MetadataResourceApi(ApiClient())
+        body = json.dumps([{'name': 'first'}, {'name': 'second'}]).encode('utf-8')
+        response = get_response(body)
+        with patch.object(metadata_client, 'get_all_workflows', return_value=response) as get_all_workflows:
+            workflow_defs = iter_all_workflows(metadata_client)
+            get_all_workflows.assert_not_called()
+            self.assertEqual([workflow_def.name for workflow_def in workflow_defs], ['first', 'second'])
+        get_all_workflows.assert_called_once_with(_preload_content=False)
+        self.assertTrue(response.resp.raw.closed)
+        task_client = TaskResourceApi(ApiClient())
+        response = get_response(b'{"queue": {"shard": {"size": 1}}}')
+        with patch.object(task_client, 'all_verbose', return_value=response):
+            self.assertEqual(list(iter_all_verbose(task_client)), [('queue', {'shard': {'size': 1}})])
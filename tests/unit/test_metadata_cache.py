@@ -0,0 +1,138 @@
+from conductor.client.cache.ttl_lru_cache import TtlLruCache
+from conductor.client.configuration.configuration import Configuration
+from conductor.client.http.api_client import ApiClient
+from conductor.client.http.api.metadata_resource_api import MetadataResourceApi
+from conductor.client.http.models.task_def import TaskDef
+from conductor.client.http.models.workflow_def import WorkflowDef
+from conductor.client.http.rest import ApiException
+from conductor.client.metadata.cached_metadata_resource_api import CachedMetadataResourceApi
+from unittest.mock import patch
+import logging
+import time
+import unittest
+
+
+class TestTtlLruCache(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        evicted = []
+        cache = TtlLruCache(
+            max_size=2,
+            on_eviction=lambda key, value: evicted.append(key)
+        )
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        self.assertEqual(evicted, ['b'])
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('b'), None)
+        self.assertEqual(cache.evictions, 1)
+
+    def test_expires_entries(self):
+        cache = TtlLruCache(ttl_seconds=0.01)
+        cache.put('a', 1, tag='etag')
+        time.sleep(0.02)
+        self.assertFalse('a' in cache)
+        self.assertEqual(cache.get_entry('a').tag, 'etag')
+        cache.touch('a')
+        self.assertEqual(cache.get('a'), 1)
+
+    def test_counts_hits_and_misses(self):
+        cache = TtlLruCache()
+        cache.put('a', 1)
+        cache.get('a')
+        cache.get('b')
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+
+class TestCachedMetadataResourceApi(unittest.TestCase):
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_serves_workflow_def_from_cache(self):
+        metadata_client = _get_cached_metadata_client()
+        with patch.object(
+            ApiClient,
+            'call_api',
+            return_value=(_get_workflow_def(), 200, {})
+        ) as call_api:
+            first = metadata_client.get('workflow', version=1)
+            second = metadata_client.get('workflow', version=1)
+            self.assertEqual(call_api.call_count, 1)
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+        self.assertEqual(metadata_client.cache.hits, 1)
+
+    def test_invalidates_on_create(self):
+        metadata_client = _get_cached_metadata_client()
+        with patch.object(
+            ApiClient,
+            'call_api',
+            return_value=(_get_workflow_def(), 200, {})
+        ) as call_api:
+            with patch.object(MetadataResourceApi, 'create'):
+                metadata_client.get('workflow')
+                metadata_client.create(_get_workflow_def())
+                metadata_client.get('workflow')
+            self.assertEqual(call_api.call_count, 2)
+
+    def test_invalidates_on_register_task_def(self):
+        metadata_client = _get_cached_metadata_client()
+        with patch.object(
+            ApiClient,
+            'call_api',
+            return_value=(TaskDef(name='task'), 200, {})
+        ) as call_api:
+            with patch.object(MetadataResourceApi, 'register_task_def'):
+                metadata_client.get_task_def('task')
+                metadata_client.get_task_def('task')
+                metadata_client.register_task_def([TaskDef(name='task')])
+                metadata_client.get_task_def('task')
+            self.assertEqual(call_api.call_count, 2)
+
+    def test_revalidates_with_etag(self):
+        metadata_client = _get_cached_metadata_client(ttl_seconds=0)
+        cached = _get_workflow_def()
+        with patch.object(
+            ApiClient,
+            'call_api',
+            side_effect=[
+                (cached, 200, {'ETag': '"v1"'}),
+                ApiException(status=304),
+            ]
+        ) as call_api:
+            metadata_client.get('workflow')
+            revalidated = metadata_client.get('workflow')
+            headers = call_api.call_args[0][4]
+            self.assertEqual(headers['If-None-Match'], '"v1"')
+        self.assertEqual(revalidated, cached)
+
+    def test_revalidates_with_content_hash(self):
+        metadata_client = _get_cached_metadata_client(
+            ttl_seconds=0, copy_on_read=False
+        )
+        cached = _get_workflow_def()
+        with patch.object(
+            ApiClient,
+            'call_api',
+            side_effect=[
+                (cached, 200, {}),
+                (_get_workflow_def(), 200, {}),
+            ]
+        ):
+            metadata_client.get('workflow')
+            self.assertIs(metadata_client.get('workflow'), cached)
+
+
+def _get_cached_metadata_client(**kwargs) -> CachedMetadataResourceApi:
+    return CachedMetadataResourceApi(
+        ApiClient(Configuration()),
+        **kwargs
+    )
+
+
+def _get_workflow_def() -> WorkflowDef:
+    return WorkflowDef(name='workflow', version=1, tasks=[])
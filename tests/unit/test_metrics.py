@@ -1,5 +1,17 @@
-from conductor.client.configuration.settings.metrics_settings import MetricsSettings
+from conductor.client.configuration.settings.metrics_settings import DEFAULT_LATENCY_BUCKETS, MetricsSettings
+from conductor.client.telemetry.metrics_aggregator import MetricsAggregator
+from conductor.client.telemetry.metrics_collector import FLUSH_MARKER_FILE_NAME, MetricsCollector
+from conductor.client.telemetry.metrics_server import MetricsServer
+from conductor.client.telemetry.model.metric_name import MetricName
+from prometheus_client.values import MultiProcessValue
+from urllib.error import HTTPError
+from urllib.request import urlopen
+import json
 import logging
+import os
+import pickle
+import tempfile
+import threading
 import unittest
 
 
@@ -32,3 +44,232 @@ class TestMetricsCollection(unittest.TestCase):
             metrics_settings.update_interval,
             expected_update_interval
         )
+
+    def test_default_latency_buckets(self):
+        metrics_settings = MetricsSettings()
+        self.assertEqual(metrics_settings.latency_buckets, DEFAULT_LATENCY_BUCKETS)
+
+    def test_latencies_are_recorded_as_histograms(self):
+        previous_directory = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+        with tempfile.TemporaryDirectory() as directory:
+            try:
+                metrics_collector = MetricsCollector(
+                    MetricsSettings(directory=directory, latency_buckets=[0.1, 1, float('inf')])
+                )
+                for time_spent in [0.05, 0.5, 5]:
+                    metrics_collector.record_task_update_time('histogram_task', time_spent)
+                metrics_collector.flush()
+            finally:
+                if previous_directory is None:
+                    os.environ.pop('PROMETHEUS_MULTIPROC_DIR', None)
+                else:
+                    os.environ['PROMETHEUS_MULTIPROC_DIR'] = previous_directory
+        histogram = MetricsCollector.histograms[MetricName.TASK_UPDATE_TIME]
+        samples = {
+            (sample.name, sample.labels.get('le')): sample.value
+            for metric in histogram.collect() for sample in metric.samples
+            if sample.labels.get('taskType') == 'histogram_task'
+        }
+        self.assertEqual(samples[('task_update_time_bucket', '0.1')], 1)
+        self.assertEqual(samples[('task_update_time_bucket', '1.0')], 2)
+        self.assertEqual(samples[('task_update_time_bucket', '+Inf')], 3)
+        self.assertEqual(samples[('task_update_time_count', None)], 3)
+
+    def test_aggregated_counters_are_written_on_flush(self):
+        previous_directory = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+        with tempfile.TemporaryDirectory() as directory:
+            try:
+                metrics_collector = MetricsCollector(
+                    MetricsSettings(directory=directory, flush_interval=60)
+                )
+                for _ in range(3):
+                    metrics_collector.increment_cache_hit('aggregated_cache')
+                self.assertEqual(self.__get_cache_hits(), 0)
+                metrics_collector.flush()
+            finally:
+                if previous_directory is None:
+                    os.environ.pop('PROMETHEUS_MULTIPROC_DIR', None)
+                else:
+                    os.environ['PROMETHEUS_MULTIPROC_DIR'] = previous_directory
+        self.assertEqual(self.__get_cache_hits(), 3)
+
+    def test_collectors_share_one_aggregator(self):
+        previous_directory = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+        with tempfile.TemporaryDirectory() as directory:
+            try:
+                collectors = [
+                    MetricsCollector(MetricsSettings(directory=directory, flush_interval=60)) for _ in range(2)
+                ]
+                collectors[0].increment_cache_hit('shared_cache')
+                collectors[1].flush()
+                self.assertTrue(os.path.exists(os.path.join(directory, FLUSH_MARKER_FILE_NAME)))
+            finally:
+                if previous_directory is None:
+                    os.environ.pop('PROMETHEUS_MULTIPROC_DIR', None)
+                else:
+                    os.environ['PROMETHEUS_MULTIPROC_DIR'] = previous_directory
+        self.assertIs(collectors[0].aggregator, collectors[1].aggregator)
+        self.assertIs(pickle.loads(pickle.dumps(collectors[0])).aggregator, collectors[0].aggregator)
+        self.assertIsNone(MetricsCollector(MetricsSettings(directory=directory, flush_interval=None)).aggregator)
+
+    def test_exception_labels_are_bounded(self):
+        previous_directory = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+        with tempfile.TemporaryDirectory() as directory:
+            try:
+                metrics_collector = MetricsCollector(
+                    MetricsSettings(directory=directory, flush_interval=None, max_exception_labels=2)
+                )
+                for exception in [ValueError, KeyError('dynamic message'), TypeError, ValueError('message')]:
+                    metrics_collector.increment_workflow_start_error('bounded_workflow', exception)
+            finally:
+                if previous_directory is None:
+                    os.environ.pop('PROMETHEUS_MULTIPROC_DIR', None)
+                else:
+                    os.environ['PROMETHEUS_MULTIPROC_DIR'] = previous_directory
+        errors = {
+            sample.labels['exception']: sample.value
+            for metric in MetricsCollector.counters[MetricName.WORKFLOW_START_ERROR].collect()
+            for sample in metric.samples
+            if sample.name.endswith('_total') and sample.labels.get('workflowType') == 'bounded_workflow'
+        }
+        self.assertEqual(errors, {'ValueError': 2, 'KeyError': 1, 'other': 1})
+        dropped = [
+            sample.value
+            for metric in MetricsCollector.counters[MetricName.METRIC_LABEL_DROPPED].collect()
+            for sample in metric.samples
+            if sample.name.endswith('_total') and sample.labels.get('metricName') == 'workflow_start_error'
+        ]
+        self.assertEqual(dropped, [1])
+
+    def test_exception_labels_go_to_the_most_frequent_classes(self):
+        previous_directory = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+        with tempfile.TemporaryDirectory() as directory:
+            try:
+                metrics_collector = MetricsCollector(
+                    MetricsSettings(directory=directory, flush_interval=None, max_exception_labels=1)
+                )
+                for exception in [KeyError, TypeError, TypeError, TypeError, KeyError]:
+                    metrics_collector.increment_workflow_start_error('frequent_workflow', exception)
+            finally:
+                if previous_directory is None:
+                    os.environ.pop('PROMETHEUS_MULTIPROC_DIR', None)
+                else:
+                    os.environ['PROMETHEUS_MULTIPROC_DIR'] = previous_directory
+        errors = {
+            sample.labels['exception']: sample.value
+            for metric in MetricsCollector.counters[MetricName.WORKFLOW_START_ERROR].collect()
+            for sample in metric.samples
+            if sample.name.endswith('_total') and sample.labels.get('workflowType') == 'frequent_workflow'
+        }
+        self.assertEqual(errors, {'KeyError': 1, 'TypeError': 2, 'other': 2})
+
+    def __get_cache_hits(self) -> float:
+        counter = MetricsCollector.counters.get(MetricName.CACHE_HIT)
+        if counter is None:
+            return 0
+        return sum(
+            sample.value
+            for metric in counter.collect() for sample in metric.samples
+            if sample.name == 'cache_hit_total' and sample.labels.get('cacheName') == 'aggregated_cache'
+        )
+
+
+class TestMetricsAggregator(unittest.TestCase):
+    def setUp(self):
+        self.flushes = []
+        self.aggregator = MetricsAggregator(60, lambda *metrics: self.flushes.append(metrics))
+
+    def tearDown(self):
+        self.aggregator.stop()
+
+    def test_events_are_aggregated_until_flushed(self):
+        self.aggregator.increment('counter')
+        self.aggregator.increment('counter', 2)
+        self.aggregator.set('gauge', 1)
+        self.aggregator.set('gauge', 2)
+        self.aggregator.observe('histogram', 0.5)
+        self.assertEqual(self.flushes, [])
+        self.aggregator.flush()
+        self.assertEqual(self.flushes, [({'counter': 3}, {'gauge': 2}, {'histogram': [0.5]})])
+        self.aggregator.flush()
+        self.assertEqual(len(self.flushes), 1)
+
+    def test_events_of_every_thread_are_aggregated(self):
+        def record():
+            for _ in range(1000):
+                self.aggregator.increment('counter')
+                self.aggregator.observe('histogram', 1)
+
+        threads = [threading.Thread(target=record) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.aggregator.flush()
+        counters, _, observations = self.flushes[0]
+        self.assertEqual(counters, {'counter': 4000})
+        self.assertEqual(len(observations['histogram']), 4000)
+        self.aggregator.flush()
+        self.assertEqual(len(self.flushes), 1)
+
+    def test_events_recorded_while_flushing_are_not_lost(self):
+        def record():
+            for _ in range(20000):
+                self.aggregator.increment('counter')
+                self.aggregator.observe('histogram', 1)
+
+        threads = [threading.Thread(target=record) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        while any(thread.is_alive() for thread in threads):
+            self.aggregator.flush()
+        self.aggregator.flush()
+        counted = sum(counters.get('counter', 0) for counters, _, _ in self.flushes)
+        observed = sum(len(observations.get('histogram', [])) for _, _, observations in self.flushes)
+        self.assertEqual((counted, observed), (40000, 40000))
+
+
+class TestMetricsServer(unittest.TestCase):
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_metrics_are_collected_on_scrape(self):
+        previous_directory = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+        with tempfile.TemporaryDirectory() as directory:
+            try:
+                os.environ['PROMETHEUS_MULTIPROC_DIR'] = directory
+                with MetricsServer(directory, address='127.0.0.1') as server:
+                    url = f'http://127.0.0.1:{server.port}/metrics'
+                    self.assertNotIn(b'scraped_total', urlopen(url).read())
+                    value = MultiProcessValue()('counter', 'scraped_total', 'scraped_total', [], [], 'doc')
+                    value.inc(2)
+                    self.assertIn(b'scraped_total 2.0', urlopen(url).read())
+            finally:
+                if previous_directory is None:
+                    os.environ.pop('PROMETHEUS_MULTIPROC_DIR', None)
+                else:
+                    os.environ['PROMETHEUS_MULTIPROC_DIR'] = previous_directory
+
+    def test_health_reports_task_runner_processes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            server = MetricsServer(directory, address='127.0.0.1', task_runner_processes=[('alive', os.getpid())])
+            with server:
+                url = f'http://127.0.0.1:{server.port}/health'
+                health = json.loads(urlopen(url).read())
+                self.assertEqual(health['status'], 'UP')
+                self.assertEqual(health['processes'], [{'taskType': 'alive', 'pid': os.getpid(), 'alive': True}])
+                server.task_runner_processes.append(('exited', self.__get_exited_pid()))
+                with self.assertRaises(HTTPError) as context:
+                    urlopen(url)
+                self.assertEqual(context.exception.code, 503)
+                self.assertEqual(json.loads(context.exception.read())['status'], 'DOWN')
+
+    def __get_exited_pid(self) -> int:
+        pid = os.fork()
+        if pid == 0:
+            os._exit(0)
+        os.waitpid(pid, 0)
+        return pid
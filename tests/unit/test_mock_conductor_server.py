@@ -0,0 +1,96 @@
+from conductor.client.automator.task_runner import TaskRunner
+from conductor.client.http.api.task_resource_api import TaskResourceApi
+from conductor.client.http.api.workflow_resource_api import WorkflowResourceApi
+from conductor.client.http.api_client import ApiClient
+from conductor.client.http.models.start_workflow_request import StartWorkflowRequest
+from conductor.client.http.models.task import Task
+from conductor.client.http.models.task_result import TaskResult
+from conductor.client.http.models.task_result_status import TaskResultStatus
+from conductor.client.http.rest import ApiException
+from conductor.client.worker.worker import Worker
+from conductor.client.workflow.conductor_workflow import ConductorWorkflow
+from conductor.client.workflow.task.simple_task import SimpleTask
+from tests.mock_conductor_server import MockConductorServer
+import logging
+import time
+import unittest
+
+
+def echo(task: Task) -> TaskResult:
+    task_result = TaskResult(
+        task_id=task.task_id,
+        workflow_instance_id=task.workflow_instance_id,
+    )
+    task_result.status = TaskResultStatus.COMPLETED
+    task_result.output_data = dict(task.input_data)
+    return task_result
+
+
+class TestMockConductorServer(unittest.TestCase):
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.server = MockConductorServer().start()
+        api_client = ApiClient(self.server.get_configuration())
+        self.task_client = TaskResourceApi(api_client)
+        self.workflow_client = WorkflowResourceApi(api_client)
+
+    def tearDown(self):
+        self.server.stop()
+        logging.disable(logging.NOTSET)
+
+    def test_poll_and_update_queued_tasks(self):
+        self.assertIsNone(self.task_client.poll('echo').task_id)
+        self.server.enqueue_tasks('echo', 3)
+        self.assertEqual(self.server.get_queue_depth('echo'), 3)
+        tasks = self.task_client.batch_poll('echo', count=5, timeout=10)
+        self.assertEqual(len(tasks), 3)
+        self.assertEqual(self.server.get_queue_depth('echo'), 0)
+        for task in tasks:
+            self.task_client.update_task(body=echo(task))
+        self.assertEqual(self.server.stats['completed_tasks'], 3)
+        self.assertEqual(self.server.stats['empty_polls'], 1)
+
+    def test_task_runner_completes_workflow(self):
+        workflow = ConductorWorkflow(executor=None, name='workflow') >> SimpleTask(
+            'echo', 'first'
+        ).input('value', '${workflow.input.value}') >> SimpleTask('echo', 'second')
+        workflow_id = self.workflow_client.start_workflow(body=StartWorkflowRequest(
+            name='workflow', input={'value': 1}, workflow_def=workflow.to_workflow_def(),
+        ))
+        task_runner = TaskRunner(
+            worker=Worker('echo', echo, poll_interval=0),
+            configuration=self.server.get_configuration(),
+        )
+        task_runner.run_once()
+        task_runner.run_once()
+        workflow_status = self.workflow_client.get_workflow_status_summary(workflow_id)
+        self.assertEqual(workflow_status.status, 'COMPLETED')
+        execution = self.workflow_client.get_execution_status(workflow_id)
+        self.assertEqual(
+            [task.reference_task_name for task in execution.tasks], ['first', 'second']
+        )
+
+    def test_compressed_requests(self):
+        configuration = self.server.get_configuration()
+        configuration.request_compression = 'gzip'
+        configuration.request_compression_threshold_bytes = 0
+        task_client = TaskResourceApi(ApiClient(configuration))
+        self.server.enqueue_tasks('echo', 1)
+        task = task_client.poll('echo')
+        task.input_data = {'value': 'x' * 1000}
+        task_client.update_task(body=echo(task))
+        self.assertEqual(self.server.stats['completed_tasks'], 1)
+
+    def test_error_injection_and_latency(self):
+        self.server.inject_errors(1, status=503, path_prefix='/tasks/poll')
+        with self.assertRaises(ApiException) as context:
+            self.task_client.poll('echo')
+        self.assertEqual(context.exception.status, 503)
+        self.assertIsNone(self.task_client.poll('echo').task_id)
+        self.server.latency_seconds = 0.05
+        start_time = time.perf_counter()
+        self.task_client.poll('echo')
+        self.assertGreaterEqual(time.perf_counter() - start_time, 0.05)
+        self.server.error_rate = 1
+        with self.assertRaises(ApiException):
+            self.task_client.poll('echo')
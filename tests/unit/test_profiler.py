@@ -0,0 +1,62 @@
+from conductor.client.automator.task_runner import TaskRunner
+from conductor.client.http.models.task import Task
+from conductor.client.http.models.task_result import TaskResult
+from conductor.client.http.models.task_result_status import TaskResultStatus
+from conductor.client.telemetry.profiler import SamplingProfiler
+from conductor.client.worker.worker import Worker
+from tests.mock_conductor_server import MockConductorServer
+import logging
+import os
+import tempfile
+import time
+import unittest
+
+
+def busy_execute(task: Task) -> TaskResult:
+    deadline = time.monotonic() + 0.2
+    while time.monotonic() < deadline:
+        pass
+    task_result = TaskResult(
+        task_id=task.task_id,
+        workflow_instance_id=task.workflow_instance_id,
+    )
+    task_result.status = TaskResultStatus.COMPLETED
+    return task_result
+
+
+class TestSamplingProfiler(unittest.TestCase):
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_task_executions_are_sampled(self):
+        with tempfile.TemporaryDirectory() as directory:
+            profiler = SamplingProfiler(directory, sampling_interval=0.005, task_types=['profiled_task'])
+            with MockConductorServer() as server:
+                server.enqueue_tasks('profiled_task', 1)
+                configuration = server.get_configuration()
+                configuration.profiler = profiler
+                TaskRunner(
+                    worker=Worker('profiled_task', busy_execute, poll_interval=0),
+                    configuration=configuration,
+                ).run_once()
+            samples = profiler.get_samples('profiled_task')
+            self.assertGreater(sum(samples.values()), 5)
+            self.assertTrue(all(
+                stack.endswith(f'{busy_execute.__module__}:busy_execute') for stack in samples
+            ))
+            profiler.stop()
+            file_path = os.path.join(directory, f'profiled_task.{os.getpid()}.collapsed')
+            with open(file_path, 'r') as file:
+                lines = file.read().splitlines()
+        self.assertEqual(sum(int(line.rsplit(' ', 1)[1]) for line in lines), sum(samples.values()))
+
+    def test_other_task_types_are_not_sampled(self):
+        with tempfile.TemporaryDirectory() as directory:
+            profiler = SamplingProfiler(directory, sampling_interval=0.005, task_types=['profiled_task'])
+            with profiler.profile('other_task'):
+                time.sleep(0.05)
+            self.assertEqual(profiler.get_samples('other_task'), {})
+            profiler.stop()
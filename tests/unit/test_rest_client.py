@@ -0,0 +1,74 @@
+from conductor.client.http.api_client import ApiClient
+from conductor.client.http.models.task_result import TaskResult
+from conductor.client.http.raw_json import RawJson, dumps, load_raw_json
+from conductor.client.http.rest import RESTClientObject, get_zstd_compressor
+import gzip
+import json
+import logging
+import unittest
+
+
+class RecordingConnection:
+    def request(self, method, url, data=None, headers=None, **kwargs):
+        self.data = data
+        self.headers = headers
+        return Response()
+
+
+class Response:
+    status_code = 200
+    reason = 'OK'
+    headers = {}
+
+
+class TestRESTClientObject(unittest.TestCase):
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.connection = RecordingConnection()
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_request_bodies_are_compressed_above_threshold(self):
+        rest_client = RESTClientObject(self.connection, compression='gzip', compression_threshold_bytes=100)
+        body = {'output': 'x' * 200}
+        rest_client.request('POST', 'http://localhost/api/tasks', body=body)
+        self.assertEqual(self.connection.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(json.loads(gzip.decompress(self.connection.data)), body)
+        rest_client.request('POST', 'http://localhost/api/tasks', body={'output': 'x'})
+        self.assertNotIn('Content-Encoding', self.connection.headers)
+        self.assertEqual(json.loads(self.connection.data), {'output': 'x'})
+
+    def test_request_bodies_are_not_compressed_by_default(self):
+        rest_client = RESTClientObject(self.connection)
+        rest_client.request('POST', 'http://localhost/api/tasks', body={'output': 'x' * 200})
+        self.assertNotIn('Content-Encoding', self.connection.headers)
+
+    def test_invalid_compression(self):
+        with self.assertRaises(Exception):
+            RESTClientObject(self.connection, compression='brotli')
+
+    @unittest.skipIf(get_zstd_compressor() is not None, 'zstandard is installed')
+    def test_zstd_falls_back_to_gzip(self):
+        rest_client = RESTClientObject(self.connection, compression='zstd')
+        self.assertEqual(rest_client.compression, 'gzip')
+
+    def test_raw_json_is_spliced_into_request_bodies(self):
+        rest_client = RESTClientObject(self.connection)
+        task_result = TaskResult(task_id='task_id', output_data={'response': RawJson(b'{"items": [1, 2]}')})
+        body = ApiClient().sanitize_for_serialization(task_result)
+        rest_client.request('POST', 'http://localhost/api/tasks', body=body)
+        self.assertIsInstance(self.connection.data, bytes)
+        self.assertEqual(
+            json.loads(self.connection.data),
+            {'taskId': 'task_id', 'outputData': {'response': {'items': [1, 2]}}}
+        )
+
+    def test_raw_json_dumps(self):
+        self.assertEqual(dumps({'value': 'text'}), '{"value": "text"}')
+        self.assertEqual(dumps(RawJson('{"value": "ü"}')), '{"value": "ü"}'.encode('utf-8'))
+        obj = {'first': RawJson('[1]'), 'text': 'ü', 'nested': [RawJson('null'), {'second': RawJson('"2"')}]}
+        self.assertEqual(json.loads(dumps(obj)), load_raw_json(obj))
+        self.assertEqual(load_raw_json(obj), {'first': [1], 'text': 'ü', 'nested': [None, {'second': '2'}]})
+        with self.assertRaises(TypeError):
+            dumps({'value': object()})
@@ -0,0 +1,102 @@
+from conductor.client.automator.task_runner import TaskRunner
+from conductor.client.configuration.configuration import Configuration
+from conductor.client.http.api.task_resource_api import TaskResourceApi
+from conductor.client.http.models.task import Task
+from conductor.client.worker.batch_worker import BatchWorker
+from conductor.client.worker.result_cache import DiskResultCache, MemoryResultCache, get_result_cache, get_result_cache_key
+from conductor.client.worker.worker import Worker
+from unittest.mock import Mock, patch
+import json
+import logging
+import os
+import tempfile
+import unittest
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_key_of_canonical_input(self):
+        key = get_result_cache_key('task', {'a': 1, 'b': [1, 'ü']})
+        self.assertEqual(get_result_cache_key('task', {'b': [1, 'ü'], 'a': 1}), key)
+        self.assertNotEqual(get_result_cache_key('other_task', {'a': 1, 'b': [1, 'ü']}), key)
+        self.assertNotEqual(get_result_cache_key('task', {'a': 2, 'b': [1, 'ü']}), key)
+        self.assertIsNone(get_result_cache_key('task', {'a': object()}))
+
+    def test_memory_result_cache(self):
+        result_cache = MemoryResultCache(max_size=1)
+        self.assertEqual(result_cache.put('first', b'1'), 0)
+        self.assertEqual(result_cache.get('first'), b'1')
+        self.assertEqual(result_cache.put('second', b'2'), 1)
+        self.assertIsNone(result_cache.get('first'))
+
+    def test_disk_result_cache_evicts_least_recently_used(self):
+        with tempfile.TemporaryDirectory() as directory:
+            result_cache = DiskResultCache(directory, max_size_bytes=25)
+            self.assertEqual(result_cache.put('first', b'x' * 10), 0)
+            self.assertEqual(result_cache.put('second', b'y' * 10), 0)
+            os.utime(os.path.join(directory, 'first.json'), (0, 0))
+            os.utime(os.path.join(directory, 'second.json'), (1, 1))
+            result_cache.get('first')
+            self.assertEqual(result_cache.put('third', b'z' * 10), 1)
+            self.assertIsNone(result_cache.get('second'))
+            # Outputs survive restarts
+            restarted_result_cache = DiskResultCache(directory, max_size_bytes=25)
+            self.assertEqual(restarted_result_cache.get('first'), b'x' * 10)
+            self.assertEqual(restarted_result_cache.get('third'), b'z' * 10)
+
+    def test_result_cache_options(self):
+        self.assertIsNone(get_result_cache(None))
+        self.assertIsInstance(get_result_cache(True), MemoryResultCache)
+        self.assertEqual(get_result_cache({'max_size': 10}).cache.max_size, 10)
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertIsInstance(get_result_cache({'directory': directory}), DiskResultCache)
+        with self.assertRaises(Exception):
+            get_result_cache('memory')
+
+    def test_task_runner_memoizes_outputs(self):
+        execute_function = Mock(side_effect=lambda task: {'length': len(task.input_data['text'])})
+
+        def execute(task: Task) -> object:
+            return execute_function(task)
+
+        worker = Worker('memoized_task', execute, cache=True)
+        tasks = [
+            Task(task_id=f'task_{i}', workflow_instance_id='workflow', input_data={'text': text})
+            for i, text in enumerate(['abc', 'abc', 'abcd'])
+        ]
+        with patch.object(TaskResourceApi, 'poll', side_effect=tasks):
+            with patch.object(TaskResourceApi, 'update_task') as update_task:
+                task_runner = TaskRunner(worker, Configuration())
+                task_runner.metrics_collector = Mock()
+                for _ in tasks:
+                    task_runner.run_once()
+        self.assertEqual(execute_function.call_count, 2)
+        task_results = [call.kwargs['body'] for call in update_task.call_args_list]
+        self.assertEqual([task_result.task_id for task_result in task_results], ['task_0', 'task_1', 'task_2'])
+        self.assertEqual(json.loads(task_results[1].output_data.data), {'length': 3})
+        self.assertEqual(task_results[1].status, 'COMPLETED')
+        self.assertEqual(task_runner.metrics_collector.increment_cache_miss.call_count, 2)
+        task_runner.metrics_collector.increment_cache_hit.assert_called_once_with('result:memoized_task')
+
+    def test_cache_write_failures_keep_the_result(self):
+        failing_cache = MemoryResultCache(max_size=10)
+        failing_cache.put = Mock(side_effect=OSError('disk full'))
+        workers = [
+            Worker('memoized_task', lambda task: {'done': True}, cache=failing_cache),
+            BatchWorker('memoized_task', lambda tasks: [{'done': True} for _ in tasks], batch_size=1, cache=failing_cache),
+        ]
+        for worker in workers:
+            task = Task(task_id='task', workflow_instance_id='workflow', input_data={'text': 'abc'})
+            with patch.object(TaskResourceApi, 'poll', return_value=task):
+                with patch.object(TaskResourceApi, 'batch_poll', return_value=[task]):
+                    with patch.object(TaskResourceApi, 'update_task') as update_task:
+                        TaskRunner(worker, Configuration()).run_once()
+            task_result = update_task.call_args.kwargs['body']
+            self.assertEqual(task_result.status, 'COMPLETED')
+            self.assertEqual(task_result.output_data, {'done': True})
+        self.assertEqual(failing_cache.put.call_count, 2)
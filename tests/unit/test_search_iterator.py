@@ -0,0 +1,100 @@
+from conductor.client.http.api.workflow_resource_api import WorkflowResourceApi
+from conductor.client.http.api_client import ApiClient
+from conductor.client.http.models.search_result_task_summary import SearchResultTaskSummary
+from conductor.client.http.rest import RESTResponse
+from conductor.client.workflow.executor.search_iterator import SearchIterator, iterate_workflow_search
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+import io
+import json
+import logging
+import requests
+import unittest
+
+
+class TestSearchIterator(unittest.TestCase):
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_iterates_over_all_pages(self):
+        fetch_page = _get_fetch_page(total=25)
+        results = list(SearchIterator(fetch_page, page_size=10))
+        self.assertEqual(results, list(range(25)))
+        self.assertEqual(fetch_page.call_count, 3)
+
+    def test_iterates_without_prefetch(self):
+        fetch_page = _get_fetch_page(total=20)
+        results = list(SearchIterator(fetch_page, page_size=10, prefetch=False))
+        self.assertEqual(results, list(range(20)))
+        # total_hits is reached, so no empty page is requested
+        self.assertEqual(fetch_page.call_count, 2)
+
+    def test_max_results(self):
+        fetch_page = _get_fetch_page(total=100)
+        results = list(SearchIterator(fetch_page, page_size=10, max_results=15))
+        self.assertEqual(results, list(range(15)))
+        self.assertEqual(fetch_page.call_count, 2)
+
+    def test_empty_search(self):
+        fetch_page = _get_fetch_page(total=0)
+        self.assertEqual(list(SearchIterator(fetch_page, page_size=10)), [])
+
+    def test_propagates_fetch_error(self):
+        fetch_page = Mock(side_effect=Exception('search failed'))
+        with self.assertRaises(Exception):
+            list(SearchIterator(fetch_page, page_size=10))
+
+    def test_invalid_page_size(self):
+        with self.assertRaises(Exception):
+            SearchIterator(_get_fetch_page(total=0), page_size=0)
+
+    def test_iterates_over_streamed_pages(self):
+        fetch_page = _get_fetch_page(total=25, streamed=True)
+        results = list(SearchIterator(fetch_page, page_size=10))
+        self.assertEqual(results, list(range(25)))
+        self.assertEqual(fetch_page.call_count, 3)
+
+    def test_workflow_search_streams_pages_and_scrolls_with_query_id(self):
+        workflow_client = WorkflowResourceApi(ApiClient())
+        pages = [
+            {'results': [{'workflowId': 'a'}, {'workflowId': 'b'}], 'queryId': 'scroll-id'},
+            {'queryId': 'scroll-id', 'results': [{'workflowId': 'c'}]},
+        ]
+        with patch.object(workflow_client, 'search', side_effect=[_get_response(page) for page in pages]) as search:
+            iterator = iterate_workflow_search(
+                workflow_client, query='status:RUNNING', page_size=2
+            )
+            self.assertEqual([summary.workflow_id for summary in iterator], ['a', 'b', 'c'])
+        search.assert_called_with(
+            start=2, size=2, query='status:RUNNING', query_id='scroll-id', _preload_content=False
+        )
+
+    def test_streamed_page_is_closed_at_max_results(self):
+        workflow_client = WorkflowResourceApi(ApiClient())
+        response = _get_response({'totalHits': 3, 'results': [{'workflowId': 'a'}, {'workflowId': 'b'}]})
+        with patch.object(workflow_client, 'search', return_value=response):
+            iterator = iterate_workflow_search(workflow_client, page_size=2, max_results=1)
+            self.assertEqual([summary.workflow_id for summary in iterator], ['a'])
+        self.assertTrue(response.resp.raw.closed)
+
+
+def _get_response(document: dict) -> RESTResponse:
+    response = requests.Response()
+    response.status_code = 200
+    response.raw = io.BytesIO(json.dumps(document).encode('utf-8'))
+    return RESTResponse(response)
+
+
+def _get_fetch_page(total: int, streamed: bool = False) -> Mock:
+    def fetch_page(start: int, size: int, query_id: str):
+        results = list(range(start, min(start + size, total)))
+        if streamed:
+            return SimpleNamespace(total_hits=total, results=iter(results))
+        return SearchResultTaskSummary(
+            total_hits=total,
+            results=results
+        )
+    return Mock(side_effect=fetch_page)
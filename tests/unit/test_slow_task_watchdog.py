@@ -0,0 +1,51 @@
+from conductor.client.configuration.configuration import Configuration
+from conductor.client.http.models.task import Task
+from conductor.client.telemetry.slow_task_watchdog import SlowTaskWatchdog
+from unittest.mock import Mock
+import logging
+import time
+import unittest
+
+WATCHDOG_LOGGER_NAME = Configuration.get_logging_formatted_name(
+    'conductor.client.telemetry.slow_task_watchdog'
+)
+
+
+def slow_function(watchdog: SlowTaskWatchdog) -> None:
+    time.sleep(0.05)
+    watchdog.check()
+
+
+class TestSlowTaskWatchdog(unittest.TestCase):
+    def setUp(self):
+        self.task = Task(task_id='task_id', workflow_instance_id='workflow_id')
+        self.metrics_collector = Mock()
+
+    def test_absolute_threshold(self):
+        watchdog = SlowTaskWatchdog(multiplier=None, threshold_seconds=0.01, check_interval=60)
+        with self.assertLogs(WATCHDOG_LOGGER_NAME, logging.WARNING) as logs:
+            with watchdog.watch('slow_task', self.task, self.metrics_collector):
+                slow_function(watchdog)
+                watchdog.check()
+        self.assertEqual(len(logs.output), 2)
+        self.assertIn('id: task_id, workflow_instance_id: workflow_id', logs.output[0])
+        self.assertIn('in slow_function', logs.output[0])
+        self.assertIn('Slow task completed', logs.output[1])
+        self.metrics_collector.increment_task_slow.assert_called_once_with('slow_task')
+        watchdog.stop()
+
+    def test_multiple_of_rolling_median(self):
+        watchdog = SlowTaskWatchdog(multiplier=5, check_interval=60, min_samples=3)
+        self.assertIsNone(watchdog.get_threshold('slow_task'))
+        for _ in range(3):
+            with watchdog.watch('slow_task', self.task, self.metrics_collector):
+                time.sleep(0.005)
+        threshold = watchdog.get_threshold('slow_task')
+        self.assertGreaterEqual(threshold, 0.025)
+        with self.assertLogs(WATCHDOG_LOGGER_NAME, logging.WARNING):
+            with watchdog.watch('slow_task', self.task, self.metrics_collector):
+                time.sleep(threshold + 0.01)
+                watchdog.check()
+        self.metrics_collector.increment_task_slow.assert_called_once_with('slow_task')
+        self.assertIsNone(watchdog.get_threshold('other_task'))
+        watchdog.stop()
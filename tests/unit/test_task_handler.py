@@ -1,10 +1,16 @@
 from conductor.client.automator.task_handler import TaskHandler
 from conductor.client.automator.task_runner import TaskRunner
 from conductor.client.configuration.configuration import Configuration
+from conductor.client.configuration.settings.metrics_settings import MetricsSettings
+from tests.mock_conductor_server import MockConductorServer
 from tests.unit.resources.workers import ClassWorker
 from unittest.mock import Mock
 from unittest.mock import patch
+import logging
 import multiprocessing
+import os
+import tempfile
+import time
 import unittest
 
 
@@ -33,6 +39,44 @@ class TestTaskHandler(unittest.TestCase):
                         isinstance(process, multiprocessing.Process)
                     )
 
+    def test_start_processes_with_spawn(self):
+        start_method = multiprocessing.get_start_method(allow_none=True)
+        previous_directory = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+        logging.disable(logging.CRITICAL)
+        multiprocessing.set_start_method('spawn', force=True)
+        try:
+            with MockConductorServer(token_ttl_seconds=60) as server, \
+                    tempfile.TemporaryDirectory() as directory:
+                server.enqueue_tasks('task', 1)
+                metrics_settings = MetricsSettings(directory=directory, flush_interval=0.1)
+                metrics_file_path = os.path.join(directory, metrics_settings.file_name)
+                with TaskHandler(
+                    workers=[ClassWorker('task')],
+                    configuration=server.get_configuration(),
+                    metrics_settings=metrics_settings
+                ) as task_handler:
+                    task_handler.start_processes()
+                    deadline = time.time() + 30
+                    while not _file_contains(metrics_file_path, 'task_poll_total') and time.time() < deadline:
+                        time.sleep(0.1)
+                    self.assertEqual(server.stats['completed_tasks'], 1)
+                    self.assertTrue(_file_contains(metrics_file_path, 'task_poll_total'))
+        finally:
+            multiprocessing.set_start_method(start_method, force=True)
+            logging.disable(logging.NOTSET)
+            if previous_directory is None:
+                os.environ.pop('PROMETHEUS_MULTIPROC_DIR', None)
+            else:
+                os.environ['PROMETHEUS_MULTIPROC_DIR'] = previous_directory
+
+
+def _file_contains(file_path: str, text: str) -> bool:
+    try:
+        with open(file_path, 'r') as file:
+            return text in file.read()
+    except FileNotFoundError:
+        return False
+
 
 def _get_valid_task_handler():
     return TaskHandler(
@@ -1,13 +1,19 @@
+from conductor.client.automator.task_result_cache import TaskResultCache
 from conductor.client.automator.task_runner import TaskRunner
 from conductor.client.configuration.configuration import Configuration
+from conductor.client.external_storage.external_payload_storage import Operation, PayloadType
+from conductor.client.external_storage.local_file_system_payload_storage import LocalFileSystemPayloadStorage
 from conductor.client.http.api.task_resource_api import TaskResourceApi
+from conductor.client.http.raw_json import RawJson
 from conductor.client.http.models.task import Task
 from conductor.client.http.models.task_result import TaskResult
 from conductor.client.http.models.task_result_status import TaskResultStatus
 from tests.unit.resources.workers import ClassWorker
 from tests.unit.resources.workers import FaultyExecutionWorker
-from unittest.mock import patch, ANY
+from unittest.mock import Mock, patch, ANY
+import json
 import logging
+import tempfile
 import time
 import unittest
 
@@ -147,6 +153,139 @@ class TestTaskRunner(unittest.TestCase):
             response = task_runner._TaskRunner__update_task(task_result)
             self.assertEqual(response, expected_response)
 
+    def test_run_once_records_latencies(self):
+        task = self.__get_valid_task()
+        task.queue_wait_time = 1500
+        task.scheduled_time = int(time.time() * 1000) - 2000
+        with patch.object(
+            TaskResourceApi,
+            'poll',
+            return_value=task
+        ):
+            with patch.object(
+                TaskResourceApi,
+                'update_task',
+                return_value=self.UPDATE_TASK_RESPONSE
+            ):
+                task_runner = self.__get_valid_task_runner()
+                task_runner.metrics_collector = Mock()
+                task_runner.run_once()
+        metrics_collector = task_runner.metrics_collector
+        metrics_collector.record_task_queue_wait_time.assert_called_once_with('task', 1.5)
+        metrics_collector.record_task_update_time.assert_called_once_with('task', ANY)
+        time_spent = metrics_collector.record_task_queue_to_completion_time.call_args[0][1]
+        self.assertGreaterEqual(time_spent, 2)
+
+    def test_external_payloads(self):
+        with tempfile.TemporaryDirectory() as directory:
+            storage = LocalFileSystemPayloadStorage(directory)
+            input_location = storage.get_location(Operation.WRITE, PayloadType.TASK_INPUT)
+            storage.upload(input_location.uri, json.dumps({'large': 'input'}).encode('utf-8'))
+            task = self.__get_valid_task()
+            task.external_input_payload_storage_path = input_location.path
+            with patch.object(
+                TaskResourceApi,
+                'poll',
+                return_value=task
+            ):
+                with patch.object(
+                    TaskResourceApi,
+                    'update_task',
+                    return_value=self.UPDATE_TASK_RESPONSE
+                ) as update_task:
+                    task_runner = self.__get_valid_task_runner()
+                    task_runner.configuration.external_payload_storage = storage
+                    task_runner.configuration.task_output_payload_threshold_kb = 0
+                    task_runner.metrics_collector = Mock()
+                    task_runner.run_once()
+            self.assertEqual(task.input_data, {'large': 'input'})
+            task_result = update_task.call_args.kwargs['body']
+            self.assertIsNone(task_result.output_data)
+            output_location = storage.get_location(
+                Operation.READ, PayloadType.TASK_OUTPUT, task_result.external_output_payload_storage_path
+            )
+            self.assertEqual(
+                json.loads(storage.download(output_location.uri)),
+                self.__get_valid_task_result().output_data
+            )
+        task_runner.metrics_collector.increment_external_payload_used.assert_any_call(
+            'task', 'READ', 'TASK_INPUT'
+        )
+        task_runner.metrics_collector.increment_external_payload_used.assert_any_call(
+            'task', 'WRITE', 'TASK_OUTPUT'
+        )
+        with self.assertRaises(Exception):
+            storage.get_location(Operation.READ, PayloadType.TASK_INPUT, '../outside.json')
+
+    def test_small_outputs_are_serialized_once(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with patch.object(TaskResourceApi, 'poll', return_value=self.__get_valid_task()):
+                with patch.object(
+                    TaskResourceApi,
+                    'update_task',
+                    return_value=self.UPDATE_TASK_RESPONSE
+                ) as update_task:
+                    task_runner = self.__get_valid_task_runner()
+                    task_runner.configuration.external_payload_storage = LocalFileSystemPayloadStorage(directory)
+                    task_runner.run_once()
+        task_result = update_task.call_args.kwargs['body']
+        self.assertIsInstance(task_result.output_data, RawJson)
+        self.assertEqual(task_result.output_data.load(), self.__get_valid_task_result().output_data)
+        self.assertIsNone(task_result.external_output_payload_storage_path)
+
+    def test_output_serialization_errors_do_not_escape_run_once(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with patch.object(TaskResourceApi, 'poll', return_value=self.__get_valid_task()):
+                with patch.object(TaskResourceApi, 'update_task') as update_task:
+                    task_runner = self.__get_valid_task_runner()
+                    task_runner.configuration.external_payload_storage = LocalFileSystemPayloadStorage(directory)
+                    task_runner.metrics_collector = Mock()
+                    with patch.object(
+                        task_runner.task_client.api_client,
+                        'sanitize_for_serialization',
+                        side_effect=ValueError('not serializable')
+                    ), patch.object(time, 'sleep'):
+                        task_runner.run_once()
+        update_task.assert_not_called()
+        self.assertEqual(task_runner.metrics_collector.increment_task_update_error.call_count, 4)
+
+    def test_redelivered_tasks_are_not_executed_again(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with patch.object(
+                TaskResourceApi,
+                'poll',
+                side_effect=[self.__get_valid_task(), self.__get_valid_task()]
+            ):
+                with patch.object(
+                    TaskResourceApi,
+                    'update_task',
+                    return_value=self.UPDATE_TASK_RESPONSE
+                ) as update_task:
+                    task_runner = self.__get_valid_task_runner()
+                    task_runner.configuration.task_result_cache = TaskResultCache(directory=directory)
+                    task_runner.metrics_collector = Mock()
+                    with patch.object(ClassWorker, 'execute', wraps=task_runner.worker.execute) as execute:
+                        task_runner.run_once()
+                        task_runner.run_once()
+            execute.assert_called_once()
+            self.assertEqual(update_task.call_count, 2)
+            self.assertEqual(update_task.call_args.kwargs['body'], self.__get_valid_task_result())
+            task_runner.metrics_collector.increment_cache_miss.assert_called_once_with('task_result')
+            task_runner.metrics_collector.increment_cache_hit.assert_called_once_with('task_result')
+            # Results are read back from the directory after a restart
+            restarted_cache = TaskResultCache(directory=directory)
+            self.assertEqual(restarted_cache.get(self.__get_valid_task()), self.__get_valid_task_result())
+            task = self.__get_valid_task()
+            task.retry_count = 1
+            self.assertIsNone(restarted_cache.get(task))
+
+    def test_in_progress_results_are_not_cached(self):
+        task_result_cache = TaskResultCache(max_size=1)
+        task_result = self.__get_valid_task_result()
+        task_result.status = TaskResultStatus.IN_PROGRESS
+        task_result_cache.put(self.__get_valid_task(), task_result)
+        self.assertIsNone(task_result_cache.get(self.__get_valid_task()))
+
     def test_wait_for_polling_interval_with_faulty_worker(self):
         expected_exception = Exception(
             "Failed to get polling interval"
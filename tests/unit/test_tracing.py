@@ -0,0 +1,109 @@
+from conductor.client.automator.task_runner import TaskRunner
+from conductor.client.http.models.task import Task
+from conductor.client.http.models.task_result import TaskResult
+from conductor.client.http.models.task_result_status import TaskResultStatus
+from conductor.client.telemetry.tracing import FileSpanExporter, SpanExporter, Tracer, get_trace_id
+from conductor.client.worker.worker import Worker
+from tests.mock_conductor_server import MockConductorServer
+import json
+import logging
+import os
+import tempfile
+import unittest
+
+
+class ListSpanExporter(SpanExporter):
+    def __init__(self):
+        self.spans = []
+
+    def export(self, spans):
+        self.spans.extend(spans)
+
+
+def execute(task: Task) -> TaskResult:
+    task_result = TaskResult(
+        task_id=task.task_id,
+        workflow_instance_id=task.workflow_instance_id,
+    )
+    task_result.status = TaskResultStatus.COMPLETED
+    return task_result
+
+
+class TestTracing(unittest.TestCase):
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_nested_spans(self):
+        exporter = ListSpanExporter()
+        tracer = Tracer(exporter)
+        with tracer.start_span('parent', {'key': 'value'}) as parent:
+            with self.assertRaises(ValueError):
+                with tracer.start_span('child'):
+                    raise ValueError('failure')
+        with tracer.start_span('other'):
+            pass
+        child, parent, other = exporter.spans
+        self.assertEqual(child.trace_id, parent.trace_id)
+        self.assertEqual(child.parent_span_id, parent.span_id)
+        self.assertEqual(child.error, 'ValueError: failure')
+        self.assertEqual(parent.attributes, {'key': 'value'})
+        self.assertIsNone(parent.parent_span_id)
+        self.assertNotEqual(other.trace_id, parent.trace_id)
+        self.assertGreaterEqual(parent.duration_seconds, child.duration_seconds)
+
+    def test_file_exporter(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'spans.jsonl')
+            with FileSpanExporter(file_path) as exporter:
+                tracer = Tracer(exporter)
+                with tracer.start_span('first', trace_id=get_trace_id('workflow')):
+                    pass
+                with tracer.start_span('second'):
+                    pass
+            with open(file_path, 'r') as file:
+                spans = [json.loads(line) for line in file]
+        self.assertEqual([span['name'] for span in spans], ['first', 'second'])
+        self.assertEqual(spans[0]['traceId'], get_trace_id('workflow'))
+
+    def test_file_exporter_writes_spans_off_the_calling_thread(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'spans.jsonl')
+            exporter = FileSpanExporter(file_path, flush_interval=60)
+            with Tracer(exporter).start_span('buffered'):
+                pass
+            self.assertFalse(os.path.exists(file_path))
+            exporter.flush()
+            with open(file_path, 'r') as file:
+                self.assertEqual([json.loads(line)['name'] for line in file], ['buffered'])
+            exporter.close()
+            with self.assertRaises(Exception):
+                exporter.export([])
+
+    def test_task_runner_spans(self):
+        exporter = ListSpanExporter()
+        with MockConductorServer() as server:
+            server.enqueue_tasks('traced_task', 1)
+            configuration = server.get_configuration()
+            configuration.tracer = Tracer(exporter)
+            task_runner = TaskRunner(
+                worker=Worker('traced_task', execute, poll_interval=0),
+                configuration=configuration,
+            )
+            task_runner.run_once()
+        spans = {span.name: span for span in exporter.spans}
+        self.assertEqual(
+            set(spans),
+            {'GET /tasks/poll/{tasktype}', 'poll', 'execute', 'POST /tasks', 'update', 'task'}
+        )
+        self.assertEqual(spans['GET /tasks/poll/{tasktype}'].parent_span_id, spans['poll'].span_id)
+        task_span = spans['task']
+        self.assertEqual(task_span.trace_id, get_trace_id(task_span.attributes['workflow_instance_id']))
+        self.assertEqual(spans['execute'].parent_span_id, task_span.span_id)
+        self.assertEqual(spans['update'].parent_span_id, task_span.span_id)
+        self.assertEqual(spans['POST /tasks'].parent_span_id, spans['update'].span_id)
+        self.assertEqual(spans['POST /tasks'].attributes['http.status_code'], 200)
+        self.assertEqual(spans['update'].attributes['attempt'], 0)
+        self.assertEqual(spans['poll'].attributes['task_id'], task_span.attributes['task_id'])
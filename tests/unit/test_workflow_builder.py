@@ -0,0 +1,220 @@
+from conductor.client.configuration.configuration import Configuration
+from conductor.client.http.api_client import ApiClient
+from conductor.client.http.api.workflow_resource_api import WorkflowResourceApi
+from conductor.client.http.models.start_workflow_request import StartWorkflowRequest
+from conductor.client.workflow.conductor_workflow import ConductorWorkflow
+from conductor.client.workflow.executor.workflow_executor import WorkflowExecutor
+from conductor.client.workflow.task.do_while_task import LoopTask
+from conductor.client.workflow.task.fork_task import ForkTask
+from conductor.client.workflow.task.simple_task import SimpleTask
+from conductor.client.workflow.task.switch_task import SwitchTask
+from conductor.client.workflow.task.task import TaskInterface
+from unittest.mock import Mock, patch
+import unittest
+
+
+class TestWorkflowBuilder(unittest.TestCase):
+    def test_added_task_is_shared_and_frozen(self):
+        task = _get_simple_task(0)
+        workflow = _get_workflow(immutable=True).add(task)
+        self.assertIs(workflow._tasks[0], task)
+        self.assertTrue(task.frozen)
+        with self.assertRaises(Exception):
+            task.input('key', 'value')
+        with self.assertRaises(Exception):
+            task.input_parameters['key'] = 'value'
+
+    def test_added_task_is_copied_by_default(self):
+        task = _get_simple_task(0).input('cfg', {'x': 1})
+        workflow = _get_workflow().add(task)
+        self.assertIsNot(workflow._tasks[0], task)
+        self.assertFalse(task.frozen)
+        task.input_parameters['cfg']['x'] = 5
+        task.input('key', 'value')
+        self.assertEqual(
+            workflow.to_workflow_def().tasks[0].input_parameters,
+            {'cfg': {'x': 1}}
+        )
+
+    def test_freezes_nested_tasks(self):
+        switch_task = SwitchTask('switch', '${workflow.input.case}').switch_case(
+            'a', [LoopTask('loop', 2, [_get_simple_task(0)])]
+        )
+        fork_task = ForkTask('fork', [[switch_task]])
+        _get_workflow(immutable=True).add(fork_task)
+        forked_switch_task = fork_task._forked_tasks[0][0]
+        self.assertTrue(forked_switch_task.frozen)
+        self.assertTrue(forked_switch_task._decision_cases['a'][0]._loop_over[0].frozen)
+        with self.assertRaises(Exception):
+            forked_switch_task.default_case([])
+
+    def test_frozen_inputs_are_read_only_at_every_depth(self):
+        task = _get_simple_task(0).input('cfg', {'k': [1]}).freeze()
+        with self.assertRaises(TypeError):
+            task.input_parameters['cfg']['x'] = 5
+        with self.assertRaises(AttributeError):
+            task.input_parameters['cfg']['k'].append(2)
+        task.to_workflow_task().input_parameters['cfg']['k'].append(2)
+        self.assertEqual(
+            task.to_workflow_task().input_parameters,
+            {'cfg': {'k': [1]}}
+        )
+
+    def test_frozen_task_is_shared_by_parents(self):
+        task = _get_simple_task(0).freeze()
+        mutable_task = _get_simple_task(1)
+        fork_task = ForkTask('fork', [[task], [mutable_task]])
+        self.assertIs(fork_task._forked_tasks[0][0], task)
+        self.assertIsNot(fork_task._forked_tasks[1][0], mutable_task)
+
+    def test_input_values_are_copied(self):
+        value = {'nested': 'original'}
+        task = _get_simple_task(0).input('key', value)
+        value['nested'] = 'changed'
+        self.assertEqual(
+            task.to_workflow_task().input_parameters['key']['nested'],
+            'original'
+        )
+
+    def test_built_definition_does_not_share_inputs(self):
+        workflow = _get_workflow().add(
+            _get_simple_task(0).input('key', 'value')
+        )
+        workflow.to_workflow_def().tasks[0].input_parameters['key'] = 'changed'
+        self.assertEqual(
+            workflow.to_workflow_def().tasks[0].input_parameters['key'],
+            'value'
+        )
+
+    def test_built_definitions_are_independent(self):
+        workflow = _get_workflow(immutable=True).add(
+            _get_simple_task(0).input('cfg', {'k': [1]})
+        )
+        first_def = workflow.to_workflow_def()
+        first_def.tasks[0].input_parameters['cfg']['k'].append(2)
+        first_def.tasks[0].name = 'changed'
+        second_def = workflow.to_workflow_def()
+        self.assertEqual(second_def.tasks[0].input_parameters, {'cfg': {'k': [1]}})
+        self.assertEqual(second_def.tasks[0].name, 'simple')
+
+    def test_compiled_task_does_not_share_inputs(self):
+        task = _get_simple_task(0).input('key', 'value')
+        task.to_workflow_task().input_parameters['key'] = 'changed'
+        self.assertEqual(
+            task.to_workflow_task().input_parameters['key'],
+            'value'
+        )
+
+    def test_frozen_tasks_are_compiled_once(self):
+        inner_task = _get_simple_task(0).freeze()
+        fork_task = ForkTask('fork', [[inner_task], [_get_simple_task(1)]])
+        _get_workflow(immutable=True).add(fork_task)
+        self.assertIs(
+            fork_task.to_cached_workflow_task(),
+            fork_task.to_cached_workflow_task()
+        )
+        self.assertIs(
+            inner_task.to_cached_workflow_task(),
+            inner_task.to_cached_workflow_task()
+        )
+
+    def test_parents_reuse_compiled_children(self):
+        inner_task = _get_simple_task(0)
+        switch_task = SwitchTask('switch', 'value').switch_case('case', [inner_task])
+        loop_task = LoopTask('loop', 2, [switch_task])
+        fork_task = ForkTask('fork', [[loop_task], [_get_simple_task(1)]]).freeze()
+        frozen_loop_task, = fork_task._get_child_tasks()[:1]
+        frozen_switch_task, = frozen_loop_task._get_child_tasks()
+        compiled_fork_task = fork_task.to_cached_workflow_task()
+        self.assertIs(compiled_fork_task.fork_tasks[0][0], frozen_loop_task.to_cached_workflow_task())
+        self.assertIs(
+            compiled_fork_task.fork_tasks[0][0].loop_over[0],
+            frozen_switch_task.to_cached_workflow_task()
+        )
+        self.assertIsNot(fork_task.to_workflow_task().fork_tasks[0][0], compiled_fork_task.fork_tasks[0][0])
+
+    def test_repeated_starts_compile_tasks_once(self):
+        executor = WorkflowExecutor(Configuration())
+        fork_task = ForkTask('fork', [[_get_simple_task(0)], [LoopTask('loop', 2, [_get_simple_task(1)])]])
+        workflow = ConductorWorkflow(executor=executor, name='workflow').add(fork_task).add(_get_simple_task(2))
+        compile_task = Mock(side_effect=TaskInterface.to_workflow_task)
+        with patch.object(WorkflowResourceApi, 'start_workflow', return_value='id'):
+            with patch.object(TaskInterface, 'to_workflow_task', lambda task: compile_task(task)):
+                for _ in range(3):
+                    request = StartWorkflowRequest(name='workflow')
+                    workflow.start_workflow(request)
+                    self.assertIsNone(request.workflow_def)
+        # fork, its two branches and the loop body, then the last task
+        self.assertEqual(compile_task.call_count, 5)
+
+    def test_mutable_task_is_not_cached(self):
+        task = _get_simple_task(0)
+        self.assertIsNot(
+            task.to_cached_workflow_task(),
+            task.to_cached_workflow_task()
+        )
+
+    def test_serialized_definition_is_reused_until_changed(self):
+        executor = Mock()
+        executor.workflow_client.api_client = ApiClient(Configuration())
+        workflow = ConductorWorkflow(executor=executor, name='workflow')
+        workflow.add(_get_simple_task(0))
+        first_request = StartWorkflowRequest(name='workflow')
+        second_request = StartWorkflowRequest(name='workflow')
+        workflow.start_workflow(first_request)
+        workflow.start_workflow(second_request)
+        self.assertIsNone(first_request.workflow_def)
+        first_serialized_def, second_serialized_def = [
+            call.kwargs['serialized_workflow_def'] for call in executor.start_workflow.call_args_list
+        ]
+        self.assertIs(first_serialized_def, second_serialized_def)
+        self.assertEqual(
+            first_serialized_def.load()['tasks'][0]['taskReferenceName'],
+            'simple_0'
+        )
+        workflow.add(_get_simple_task(1))
+        workflow.start_workflow(StartWorkflowRequest(name='workflow'))
+        third_serialized_def = executor.start_workflow.call_args.kwargs['serialized_workflow_def']
+        self.assertEqual(len(third_serialized_def.load()['tasks']), 2)
+        workflow.description = 'changed'
+        workflow.start_workflow(StartWorkflowRequest(name='workflow'))
+        fourth_serialized_def = executor.start_workflow.call_args.kwargs['serialized_workflow_def']
+        self.assertEqual(fourth_serialized_def.load()['description'], 'changed')
+
+    def test_start_workflow_sends_serialized_definition(self):
+        executor = WorkflowExecutor(Configuration())
+        workflow = ConductorWorkflow(executor=executor, name='workflow').add(_get_simple_task(0))
+        request = StartWorkflowRequest(name='workflow', input={'a': 1})
+        with patch.object(WorkflowResourceApi, 'start_workflow', return_value='id') as start_workflow:
+            self.assertEqual(workflow.start_workflow(request), 'id')
+        body = start_workflow.call_args.kwargs['body']
+        self.assertEqual(body['name'], 'workflow')
+        self.assertEqual(body['input'], {'a': 1})
+        self.assertEqual(body['workflowDef'].load()['tasks'][0]['taskReferenceName'], 'simple_0')
+
+    def test_loop_task_with_task_list(self):
+        loop_task = LoopTask(
+            'loop', 2, [_get_simple_task(0), _get_simple_task(1)]
+        )
+        loop_over = loop_task.to_workflow_task().loop_over
+        self.assertEqual(
+            [task.task_reference_name for task in loop_over],
+            ['simple_0', 'simple_1']
+        )
+
+    def test_fork_join_with_right_shift(self):
+        workflow = _get_workflow() >> [
+            [_get_simple_task(0), _get_simple_task(1)],
+            _get_simple_task(2),
+        ]
+        tasks = workflow.to_workflow_def().tasks
+        self.assertEqual(tasks[0].type, 'FORK_JOIN')
+        self.assertEqual(tasks[1].join_on, ['simple_1', 'simple_2'])
+
+
+def _get_workflow(immutable: bool = False) -> ConductorWorkflow:
+    return ConductorWorkflow(executor=None, name='workflow', immutable=immutable)
+
+
+def _get_simple_task(index: int) -> SimpleTask:
+    return SimpleTask('simple', f'simple_{index}')
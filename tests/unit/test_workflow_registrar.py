@@ -0,0 +1,174 @@
+from conductor.client.configuration.configuration import Configuration
+from conductor.client.http.api.metadata_resource_api import MetadataResourceApi
+from conductor.client.http.api_client import ApiClient
+from conductor.client.http.models.workflow_def import WorkflowDef
+from conductor.client.http.models.workflow_task import WorkflowTask
+from conductor.client.http.rest import ApiException
+from conductor.client.metadata.definition_hash import get_structural_hash
+from conductor.client.metadata.workflow_registrar import WorkflowRegistrar
+from conductor.client.workflow.task.timeout_policy import TimeoutPolicy
+from unittest.mock import Mock
+import logging
+import os
+import tempfile
+import unittest
+
+
+class TestWorkflowRegistrar(unittest.TestCase):
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_structural_hash_ignores_server_managed_fields_and_defaults(self):
+        local_def = _get_workflow_def('a')
+        server_def = _get_workflow_def('a')
+        server_def.create_time = 1234
+        server_def.updated_by = 'someone'
+        server_def.workflow_status_listener_enabled = False
+        server_def.timeout_policy = 'TIME_OUT_WF'
+        server_def.tasks[0].start_delay = 0
+        server_def.tasks[0].optional = False
+        server_def.tasks[0].loop_over = []
+        self.assertEqual(
+            get_structural_hash(local_def),
+            get_structural_hash(server_def)
+        )
+
+    def test_structural_hash_keeps_task_input_values(self):
+        local_def = _get_workflow_def('a')
+        server_def = _get_workflow_def('a')
+        server_def.tasks[0].input_parameters = {'flag': False}
+        self.assertNotEqual(
+            get_structural_hash(local_def),
+            get_structural_hash(server_def)
+        )
+
+    def test_structural_hash_ignores_server_filled_defaults(self):
+        local_def = WorkflowDef(
+            name='a',
+            version=1,
+            tasks=[WorkflowTask(name='simple', task_reference_name='simple_ref', input_parameters={'x': 1})],
+        )
+        server_def = ApiClient(Configuration()).deserialize_data({
+            'createTime': 1700000000000,
+            'name': 'a',
+            'version': 1,
+            'tasks': [{
+                'name': 'simple',
+                'taskReferenceName': 'simple_ref',
+                'inputParameters': {'x': 1},
+                'type': 'SIMPLE',
+                'decisionCases': {},
+                'defaultCase': [],
+                'forkTasks': [],
+                'startDelay': 0,
+                'joinOn': [],
+                'optional': False,
+                'defaultExclusiveJoinTask': [],
+                'asyncComplete': False,
+                'loopOver': [],
+                'workflowTaskType': 'SIMPLE',
+            }],
+            'inputParameters': [],
+            'outputParameters': {},
+            'schemaVersion': 2,
+            'restartable': True,
+            'workflowStatusListenerEnabled': False,
+            'timeoutPolicy': 'ALERT_ONLY',
+            'timeoutSeconds': 0,
+            'variables': {},
+            'inputTemplate': {},
+        }, WorkflowDef)
+        self.assertEqual(
+            get_structural_hash(local_def),
+            get_structural_hash(server_def)
+        )
+        server_def.restartable = False
+        self.assertNotEqual(
+            get_structural_hash(local_def),
+            get_structural_hash(server_def)
+        )
+
+    def test_register_only_uploads_changes(self):
+        changed_def = _get_workflow_def('changed')
+        changed_def.description = 'new description'
+        metadata_client = Mock(spec=MetadataResourceApi)
+        metadata_client.get.side_effect = lambda name, **kwargs: {
+            'unchanged': _get_workflow_def('unchanged'),
+            'changed': _get_workflow_def('changed'),
+        }.get(name) or _raise_not_found()
+        summary = WorkflowRegistrar(metadata_client).register([
+            _get_workflow_def('unchanged'),
+            changed_def,
+            _get_workflow_def('new'),
+        ])
+        self.assertEqual(summary.unchanged, ['unchanged:1'])
+        self.assertEqual(summary.updated, ['changed:1'])
+        self.assertEqual(summary.created, ['new:1'])
+        self.assertEqual(summary.failed, {})
+        metadata_client.update1.assert_called_once_with(body=[changed_def])
+        self.assertEqual(metadata_client.create.call_count, 1)
+
+    def test_register_reports_failures(self):
+        metadata_client = Mock(spec=MetadataResourceApi)
+        metadata_client.get.side_effect = ApiException(status=500)
+        summary = WorkflowRegistrar(metadata_client).register([
+            _get_workflow_def('a'),
+        ])
+        self.assertEqual(list(summary.failed.keys()), ['a:1'])
+
+    def test_register_without_overwrite_rejects_changes(self):
+        changed_def = _get_workflow_def('a')
+        changed_def.description = 'new description'
+        metadata_client = Mock(spec=MetadataResourceApi)
+        metadata_client.get.return_value = _get_workflow_def('a')
+        registrar = WorkflowRegistrar(metadata_client)
+        summary = registrar.register([changed_def], overwrite=False)
+        self.assertEqual(list(summary.failed.keys()), ['a:1'])
+        with self.assertRaises(Exception):
+            registrar.register_workflow(changed_def, overwrite=False)
+        metadata_client.update1.assert_not_called()
+        self.assertIsNone(registrar.register_workflow(_get_workflow_def('a'), overwrite=False))
+
+    def test_register_workflow_raises_failures(self):
+        metadata_client = Mock(spec=MetadataResourceApi)
+        metadata_client.get.side_effect = ApiException(status=500)
+        with self.assertRaises(ApiException):
+            WorkflowRegistrar(metadata_client).register_workflow(_get_workflow_def('a'))
+
+    def test_state_file_skips_server_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            state_file = os.path.join(directory, 'state.json')
+            metadata_client = Mock(spec=MetadataResourceApi)
+            metadata_client.get.side_effect = ApiException(status=404)
+            WorkflowRegistrar(metadata_client, state_file=state_file).register([
+                _get_workflow_def('a'),
+            ])
+            metadata_client.reset_mock()
+            summary = WorkflowRegistrar(metadata_client, state_file=state_file).register([
+                _get_workflow_def('a'),
+            ])
+            self.assertEqual(summary.unchanged, ['a:1'])
+            metadata_client.get.assert_not_called()
+
+
+def _get_workflow_def(name: str) -> WorkflowDef:
+    return WorkflowDef(
+        name=name,
+        version=1,
+        timeout_policy=TimeoutPolicy.TIME_OUT_WORKFLOW,
+        tasks=[
+            WorkflowTask(
+                name='simple',
+                task_reference_name='simple_ref',
+                type='SIMPLE',
+                input_parameters={},
+            )
+        ],
+    )
+
+
+def _raise_not_found():
+    raise ApiException(status=404)
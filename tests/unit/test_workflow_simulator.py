@@ -0,0 +1,131 @@
+from conductor.client.http.models.task import Task
+from conductor.client.http.models.task_result import TaskResult
+from conductor.client.http.models.task_result_status import TaskResultStatus
+from conductor.client.simulator.script_evaluator import evaluate_condition
+from conductor.client.simulator.workflow_simulator import WorkflowSimulator
+from conductor.client.worker.worker import Worker
+from conductor.client.workflow.conductor_workflow import ConductorWorkflow
+from conductor.client.workflow.task.do_while_task import DoWhileTask, LoopTask
+from conductor.client.workflow.task.set_variable_task import SetVariableTask
+from conductor.client.workflow.task.simple_task import SimpleTask
+from conductor.client.workflow.task.switch_task import SwitchTask
+from conductor.client.workflow.task.terminate_task import TerminateTask, WorkflowStatus
+from conductor.client.workflow.task.wait_task import WaitForDurationTask
+import unittest
+
+
+def add_one(task: Task) -> TaskResult:
+    task_result = TaskResult(
+        task_id=task.task_id,
+        workflow_instance_id=task.workflow_instance_id,
+    )
+    task_result.status = TaskResultStatus.COMPLETED
+    task_result.output_data = {'value': (task.input_data['value'] or 0) + 1}
+    return task_result
+
+
+class TestWorkflowSimulator(unittest.TestCase):
+    def setUp(self):
+        self.simulator = WorkflowSimulator(
+            workers=[Worker('add_one', add_one)]
+        )
+
+    def test_sequence_resolves_references(self):
+        first_task = _get_add_one_task('first', '${workflow.input.value}')
+        second_task = _get_add_one_task('second', first_task.output_ref('value'))
+        workflow = _get_workflow() >> first_task >> second_task
+        workflow.output_parameters({
+            'result': second_task.output_ref('value'),
+            'message': 'result is ${second.output.value}',
+        })
+        result = self.simulator.execute(workflow, {'value': 1})
+        self.assertEqual(result.status, 'COMPLETED')
+        self.assertEqual(result.output, {'result': 3, 'message': 'result is 3'})
+        self.assertEqual(
+            [task.reference_task_name for task in result.tasks], ['first', 'second']
+        )
+
+    def test_fork_join(self):
+        workflow = _get_workflow() >> [
+            [_get_add_one_task('a', 1)],
+            [_get_add_one_task('b', 10)],
+        ]
+        result = self.simulator.execute(workflow)
+        self.assertEqual(result.status, 'COMPLETED')
+        self.assertEqual(result.tasks[-1].output_data, {
+            'a': {'value': 2},
+            'b': {'value': 11},
+        })
+
+    def test_switch_and_variables(self):
+        switch_task = SwitchTask('switch', '${workflow.input.case}').switch_case(
+            'left', [SetVariableTask('set_left').input('side', 'left')]
+        ).default_case([SetVariableTask('set_other').input('side', 'other')])
+        workflow = _get_workflow() >> switch_task >> WaitForDurationTask('wait', 60)
+        workflow.output_parameters({'side': '${workflow.variables.side}'})
+        self.assertEqual(self.simulator.execute(workflow, {'case': 'left'}).output, {'side': 'left'})
+        self.assertEqual(self.simulator.execute(workflow, {'case': 'right'}).output, {'side': 'other'})
+
+    def test_loop(self):
+        loop_task = LoopTask('loop', 3, [_get_add_one_task('increment', 1)])
+        result = self.simulator.execute(_get_workflow() >> loop_task)
+        self.assertEqual(result.status, 'COMPLETED')
+        self.assertEqual(
+            [task.reference_task_name for task in result.tasks],
+            ['loop', 'increment__1', 'increment__2', 'increment__3']
+        )
+        condition_loop = DoWhileTask(
+            'condition_loop', 'if ($.increment.value < 4) { true; } else { false; }',
+            [_get_add_one_task('increment', '${increment.output.value}')]
+        )
+        workflow = _get_workflow() >> condition_loop
+        workflow.output_parameters({'value': '${increment.output.value}'})
+        self.assertEqual(self.simulator.execute(workflow).output, {'value': 4})
+
+    def test_failures_retries_and_termination(self):
+        attempts = []
+
+        def flaky(task: Task) -> TaskResult:
+            attempts.append(task.retry_count)
+            raise Exception('failure')
+
+        self.simulator.register_worker(Worker('flaky', flaky))
+        flaky_task = SimpleTask('flaky', 'flaky')
+        workflow = _get_workflow() >> flaky_task
+        workflow_def = workflow.to_workflow_def()
+        workflow_def.tasks[0].retry_count = 2
+        result = self.simulator.execute(workflow_def)
+        self.assertEqual(result.status, 'FAILED')
+        self.assertEqual(attempts, [0, 1, 2])
+        self.assertEqual(result.failed_reference_task_names, ['flaky'])
+        workflow = _get_workflow() >> TerminateTask(
+            'terminate', WorkflowStatus.COMPLETED, 'done'
+        ) >> _get_add_one_task('never', 0)
+        result = self.simulator.execute(workflow)
+        self.assertEqual(result.status, 'COMPLETED')
+        self.assertEqual(len(result.tasks), 1)
+
+    def test_benchmark(self):
+        workflow = _get_workflow() >> _get_add_one_task('first', '${workflow.input.value}')
+        report = self.simulator.benchmark(
+            workflow, [{'value': index} for index in range(20)], max_workers=4
+        )
+        self.assertEqual(report.completed, 20)
+        self.assertEqual(report.failed, 0)
+        self.assertGreater(report.throughput, 0)
+
+    def test_evaluate_condition(self):
+        context = {'loop': {'iteration': 2}, 'task': {'items': [1, 2], 'done': False}}
+        self.assertTrue(evaluate_condition('if ( $.loop.iteration < $.3 ) { true; } else { false; }', context))
+        self.assertFalse(evaluate_condition('$.loop.iteration >= 3 || $.task.done', context))
+        self.assertTrue(evaluate_condition("!$.task.done && $.task['items'][1] == 2", context))
+        with self.assertRaises(Exception):
+            evaluate_condition('$.loop.iteration.toString()', context)
+
+
+def _get_workflow() -> ConductorWorkflow:
+    return ConductorWorkflow(executor=None, name='workflow')
+
+
+def _get_add_one_task(task_reference_name: str, value) -> SimpleTask:
+    return SimpleTask('add_one', task_reference_name).input('value', value)
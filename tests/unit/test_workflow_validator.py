@@ -0,0 +1,219 @@
+from conductor.client.http.models.workflow_def import WorkflowDef
+from conductor.client.http.models.workflow_task import WorkflowTask
+from conductor.client.workflow.conductor_workflow import ConductorWorkflow
+from conductor.client.workflow.task.do_while_task import LoopTask
+from conductor.client.workflow.task.fork_task import ForkTask
+from conductor.client.workflow.task.join_task import JoinTask
+from conductor.client.workflow.task.simple_task import SimpleTask
+from conductor.client.workflow.task.switch_task import SwitchTask
+from conductor.client.workflow.task.terminate_task import TerminateTask, WorkflowStatus
+from conductor.client.workflow.workflow_validator import ValidationIssue, ValidationSeverity, \
+    WorkflowValidationException, validate_workflow
+import sys
+import time
+import unittest
+
+
+class TestWorkflowValidator(unittest.TestCase):
+    def test_valid_workflow_built_with_sdk(self):
+        first_task = _get_simple_task(0)
+        loop_task = LoopTask('loop', 2, [
+            _get_simple_task(2).input('value', '${simple_3.output.value}'),
+            _get_simple_task(3),
+        ])
+        workflow = _get_workflow() >> first_task >> [
+            [_get_simple_task(1).input('value', first_task.output_ref('value'))],
+            [loop_task],
+        ]
+        workflow.add(
+            SwitchTask('switch', '${simple_1.output.value}').switch_case(
+                'a', [_get_simple_task(4)]
+            ).default_case([_get_simple_task(5)])
+        )
+        workflow.output_parameters({'result': '${simple_5.output.result}'})
+        result = validate_workflow(workflow)
+        self.assertEqual(result.issues, [])
+        self.assertTrue(result.is_valid)
+
+    def test_duplicate_reference_names(self):
+        workflow = _get_workflow() >> _get_simple_task(0) >> _get_simple_task(0)
+        result = validate_workflow(workflow)
+        self.assertEqual(result.errors, [
+            _get_error('simple_0', 'duplicate task_reference_name')
+        ])
+
+    def test_unknown_and_forward_references(self):
+        workflow = _get_workflow() >> _get_simple_task(0).input(
+            'value', 'prefix ${unknown.output.value} ${simple_1.output.value}'
+        ) >> _get_simple_task(1)
+        result = validate_workflow(workflow)
+        self.assertEqual(result.errors, [
+            _get_error('simple_0', 'expression references unknown task unknown')
+        ])
+        self.assertEqual(len(result.warnings), 1)
+        with self.assertRaises(WorkflowValidationException):
+            result.raise_for_errors()
+
+    def test_references_across_fork_branches(self):
+        workflow = _get_workflow() >> [
+            [_get_simple_task(0)],
+            [_get_simple_task(1).input('value', '${simple_0.output}')],
+        ] >> _get_simple_task(2).input('value', '${simple_0.output}')
+        result = validate_workflow(workflow)
+        self.assertEqual(result.errors, [])
+        self.assertEqual(
+            [issue.task_reference_name for issue in result.warnings],
+            ['simple_1']
+        )
+
+    def test_fork_join_mismatches(self):
+        fork_task = ForkTask('fork', [[_get_simple_task(0)], [_get_simple_task(1)]])
+        workflow = _get_workflow() >> _get_simple_task(2) >> fork_task >> JoinTask(
+            'join', join_on=['simple_0', 'simple_2']
+        ) >> JoinTask('orphan_join')
+        result = validate_workflow(workflow)
+        self.assertEqual(result.errors, [
+            _get_error('join', 'join_on references task simple_2 outside of fork fork'),
+            _get_error('orphan_join', 'join task must follow a fork task'),
+        ])
+        result = validate_workflow(_get_workflow() >> ForkTask('fork', [[_get_simple_task(0)]]))
+        self.assertEqual(result.errors, [
+            _get_error('fork', 'fork task must be followed by a JOIN task')
+        ])
+
+    def test_switch_structure(self):
+        switch_task = WorkflowTask(
+            name='switch',
+            task_reference_name='switch',
+            type='SWITCH',
+            input_parameters={},
+            evaluator_type='value-param',
+            expression='missing',
+        )
+        result = validate_workflow(WorkflowDef(name='workflow', tasks=[switch_task]))
+        self.assertEqual(result.issues, [
+            _get_error('switch', 'switch expression missing is not an input parameter'),
+            ValidationIssue(ValidationSeverity.WARNING, 'switch', 'switch task has no cases'),
+        ])
+
+    def test_unreachable_tasks(self):
+        switch_task = SwitchTask('switch', '${workflow.input.case}').switch_case(
+            'a', [_get_terminate_task(0)]
+        ).default_case([_get_terminate_task(1)])
+        workflow = _get_workflow() >> switch_task >> _get_simple_task(0)
+        result = validate_workflow(workflow)
+        self.assertEqual(result.warnings, [
+            ValidationIssue(
+                ValidationSeverity.WARNING, 'simple_0', 'task is unreachable, the workflow always terminates before it'
+            )
+        ])
+        partial_switch = SwitchTask('switch', '${workflow.input.case}').switch_case(
+            'a', [_get_terminate_task(0)]
+        )
+        workflow = _get_workflow() >> partial_switch >> _get_simple_task(0)
+        self.assertEqual(validate_workflow(workflow).issues, [])
+
+    def test_linear_time_on_large_definitions(self):
+        workflow_def = _get_large_workflow_def(1000)
+        start_time = time.perf_counter()
+        self.assertTrue(validate_workflow(workflow_def).is_valid)
+        small_duration = time.perf_counter() - start_time
+        workflow_def = _get_large_workflow_def(20000)
+        start_time = time.perf_counter()
+        self.assertTrue(validate_workflow(workflow_def).is_valid)
+        large_duration = time.perf_counter() - start_time
+        self.assertLess(large_duration, small_duration * 100)
+
+    def test_linear_time_on_deeply_nested_definitions(self):
+        workflow_def = _get_nested_workflow_def(250)
+        start_time = time.perf_counter()
+        self.assertTrue(validate_workflow(workflow_def).is_valid)
+        small_duration = time.perf_counter() - start_time
+        workflow_def = _get_nested_workflow_def(5000)
+        start_time = time.perf_counter()
+        self.assertTrue(validate_workflow(workflow_def).is_valid)
+        large_duration = time.perf_counter() - start_time
+        self.assertLess(large_duration, small_duration * 100)
+
+    def test_nesting_deeper_than_the_recursion_limit(self):
+        workflow_def = _get_nested_workflow_def(sys.getrecursionlimit() * 2)
+        result = validate_workflow(workflow_def)
+        self.assertTrue(result.is_valid)
+        self.assertEqual(result.warnings, [])
+
+    def test_references_across_nested_switch_cases(self):
+        workflow_def = _get_nested_workflow_def(3)
+        inner_switch = workflow_def.tasks[0].decision_cases['nested'][1]
+        inner_switch.default_case[0].input_parameters['value'] = '${simple_1.output.value}'
+        result = validate_workflow(workflow_def)
+        self.assertEqual(result.warnings, [
+            ValidationIssue(
+                ValidationSeverity.WARNING, 'default_1',
+                'expression references task simple_1 which is not executed before it'
+            ),
+        ])
+
+
+def _get_error(task_reference_name: str, message: str) -> ValidationIssue:
+    return ValidationIssue(ValidationSeverity.ERROR, task_reference_name, message)
+
+
+def _get_large_workflow_def(task_count: int) -> WorkflowDef:
+    tasks = []
+    for index in range(task_count):
+        input_parameters = {}
+        if index > 0:
+            input_parameters['value'] = f'${{simple_{index - 1}.output.value}}'
+        tasks.append(WorkflowTask(
+            name='simple',
+            task_reference_name=f'simple_{index}',
+            type='SIMPLE',
+            input_parameters=input_parameters,
+        ))
+    return WorkflowDef(name='workflow', tasks=tasks)
+
+
+def _get_nested_workflow_def(depth: int) -> WorkflowDef:
+    """Switches nested `depth` times, each case referencing the tasks of the enclosing ones"""
+    tasks = []
+    outer_tasks = tasks
+    for index in range(depth):
+        input_parameters = {}
+        if index > 0:
+            input_parameters['value'] = f'${{simple_{index - 1}.output.value}}'
+        simple_task = WorkflowTask(
+            name='simple', task_reference_name=f'simple_{index}', type='SIMPLE', input_parameters=input_parameters,
+        )
+        default_task = WorkflowTask(
+            name='simple', task_reference_name=f'default_{index}', type='SIMPLE',
+            input_parameters={'value': f'${{simple_{index - 1}.output.value}}'} if index > 0 else {},
+        )
+        nested_tasks = [simple_task]
+        tasks.append(WorkflowTask(
+            name='switch',
+            task_reference_name=f'switch_{index}',
+            type='SWITCH',
+            evaluator_type='value-param',
+            expression='case',
+            input_parameters={'case': '${workflow.input.case}'},
+            decision_cases={'nested': nested_tasks},
+            default_case=[default_task],
+        ))
+        tasks = nested_tasks
+    outer_tasks.append(WorkflowTask(
+        name='simple', task_reference_name='last', type='SIMPLE',
+        input_parameters={'value': f'${{simple_{depth - 1}.output.value}}'},
+    ))
+    return WorkflowDef(name='workflow', tasks=outer_tasks)
+
+
+def _get_workflow() -> ConductorWorkflow:
+    return ConductorWorkflow(executor=None, name='workflow')
+
+
+def _get_simple_task(index: int) -> SimpleTask:
+    return SimpleTask('simple', f'simple_{index}')
+
+
+def _get_terminate_task(index: int) -> TerminateTask:
+    return TerminateTask(f'terminate_{index}', WorkflowStatus.COMPLETED, 'done')